@@ -1,33 +1,156 @@
 # backend/app/api/routes.py
+import asyncio
+import base64
 import hashlib
 import json
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy import select
+from arq.connections import ArqRedis
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.orm import Session, load_only
 
-from backend.app.core.queue import enqueue_run
-from backend.app.models.schemas import ArtifactMeta, RunRequest, RunResponse, RunStatusResponse
-from backend.app.storage.artifacts import list_artifacts_for_run
-from backend.app.storage.db import ensure_dirs, get_session
-from backend.app.storage.models import Run, RunStatus
+from backend.app.core.batch import batch_top_k
+from backend.app.core.dedupe import RECENT_RUNS
+from backend.app.core.embeddings import ENCODER, get_vector_store
+from backend.app.core.events import TERMINAL, StatusBroker
+from backend.app.core.feature_cache import get_feature_cache
+from backend.app.core.fuzzy import fuzzy_settings
+from backend.app.core.graph import _document_features, skip_nodes
+from backend.app.core.jd_index import get_job_index
+from backend.app.core.metrics import CONTENT_TYPE, render, set_profiling, store_profiling
+from backend.app.core.queue import (
+    JOB_TIMEOUT_MAX_S,
+    ORPHAN_GRACE_S,
+    _run_job_async,
+    create_compute_pool,
+    create_redis_pool,
+    enqueue_batch_run,
+    enqueue_run,
+    enqueue_runs_bulk,
+    orphaned_after,
+    priority_of,
+    queue_stats,
+    route_queue,
+)
+from backend.app.core.run_manager import RunManager
+from backend.app.core.uploads import RunUpload, UploadTooLarge
+from backend.app.models.schemas import (
+    ArtifactMeta,
+    BatchRunRequest,
+    BulkRunRequest,
+    BulkRunResponse,
+    JobSearchHit,
+    JobSearchRequest,
+    JobSearchResponse,
+    ProfilingConfig,
+    QueueStats,
+    RunListQuery,
+    RunListResponse,
+    RunRequest,
+    RunResponse,
+    RunStatusResponse,
+    RunSummary,
+)
+from backend.app.storage.artifacts import (
+    artifact_file,
+    get_artifact_by_name,
+    iter_decoded,
+    list_artifacts_for_run,
+)
+from backend.app.storage.db import ensure_dirs, get_session, run_db
+from backend.app.storage.models import (
+    Artifact,
+    Run,
+    RunKind,
+    RunStatus,
+    encode_document_file,
+)
 
 router = APIRouter()
+log = logging.getLogger(__name__)
 
 MAX_LEN = 2_000_000  # ~2MB chars
+MAX_UPLOAD_BYTES = 2 * 4 * MAX_LEN + 64 * 1024  # both documents at 4 UTF-8 bytes/char + form
+MAX_BATCH_DOCS = 1_000  # per side of a batch
+MAX_BULK_RUNS = 1_000
+ARTIFACT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MAX_WAIT_S = 60.0  # cap for ?wait= long-polls
+SSE_KEEPALIVE_S = 15.0
+FALLBACK_POLL_S = 1.0  # DB re-check interval while the status broker is unavailable
+REUSABLE_STATUSES = (RunStatus.queued, RunStatus.running, RunStatus.succeeded)
+# in-flight runs older than this are presumed lost (worker crash, lost ARQ job, API
+# restart during an inline run) and failed instead of reused: a running job has hit
+# its own timeout long before, and ARQ drops jobs not started within a day
+STALE_RUNNING_S = JOB_TIMEOUT_MAX_S + 300
+STALE_QUEUED_S = float(os.environ.get("RUN_STALE_QUEUED_S", "86400"))
+# inline (?mode=sync) execution inside the API process
+SYNC_MAX_CHARS = int(os.environ.get("SYNC_MAX_CHARS", "100000"))  # resume + JD
+SYNC_AUTO_MAX_CHARS = int(os.environ.get("SYNC_AUTO_MAX_CHARS", "0"))  # inline w/o ?mode; 0=off
+SYNC_MAX_INFLIGHT = int(os.environ.get("SYNC_MAX_INFLIGHT", "4"))
+SYNC_PROCESSES = int(os.environ.get("SYNC_PROCESSES", "1"))
+SYNC_WAIT_S = float(os.environ.get("SYNC_WAIT_S", "10"))
 
+_create_lock = threading.Lock()
 
-@router.post("/runs", response_model=RunResponse, status_code=202)
-async def create_run(req: RunRequest) -> RunResponse:
-    """Queue a new run. FastAPI will validate the body into RunRequest automatically."""
 
-    if len(req.resume_text) > MAX_LEN or len(req.jd_text) > MAX_LEN:
-        raise HTTPException(status_code=413, detail="payload too large")
+def get_redis(request: Request) -> ArqRedis:
+    """The app-wide pool opened by the lifespan (created lazily if it did not run)."""
+    redis = getattr(request.app.state, "redis", None)
+    if redis is None:
+        redis = request.app.state.redis = create_redis_pool()
+    return redis
 
-    ensure_dirs()
 
+RedisDep = Annotated[ArqRedis, Depends(get_redis)]
+
+
+def create_broker(redis: ArqRedis) -> StatusBroker:
+    broker = StatusBroker(redis)
+    broker.add_listener(RECENT_RUNS.on_status)
+    return broker
+
+
+def get_broker(request: Request, redis: RedisDep) -> StatusBroker:
+    """The app-wide status broker (created lazily if the lifespan did not run)."""
+    broker = getattr(request.app.state, "broker", None)
+    if broker is None:
+        broker = request.app.state.broker = create_broker(redis)
+    return broker
+
+
+BrokerDep = Annotated[StatusBroker, Depends(get_broker)]
+
+
+def create_inline_ctx(processes: int = SYNC_PROCESSES) -> dict[str, Any]:
+    """Compute pool and admission limit for runs executed inside the API."""
+    return {
+        "compute_pool": create_compute_pool(processes),
+        "admission": asyncio.Semaphore(SYNC_MAX_INFLIGHT),
+        "tasks": set(),
+    }
+
+
+def get_inline_ctx(request: Request) -> dict[str, Any]:
+    ctx = getattr(request.app.state, "inline", None)
+    if ctx is None:
+        ctx = request.app.state.inline = create_inline_ctx()
+    return ctx
+
+
+InlineDep = Annotated[dict[str, Any], Depends(get_inline_ctx)]
+
+
+def _run_hash(req: RunRequest) -> str:
     # Simple idempotency hash
-    h = hashlib.sha256(
+    return hashlib.sha256(
         (
             req.resume_text.strip()
             + "\n---\n"
@@ -36,82 +159,706 @@ async def create_run(req: RunRequest) -> RunResponse:
         ).encode("utf-8")
     ).hexdigest()
 
-    with get_session() as s:
-        existing = (
-            s.execute(
-                select(Run)
-                .where(Run.payload_hash == h, Run.status == RunStatus.succeeded)
-                .order_by(Run.finished_at.desc())  # take newest
-            )
-            .scalars()
-            .first()
-        )
-        if existing:
-            return RunResponse(run_id=existing.id, status=existing.status.value)
-
-        run = Run(
-            payload_hash=h,
-            status=RunStatus.queued,
-            resume_text=req.resume_text,
-            jd_text=req.jd_text,
-            params=req.params or {},
-        )
+
+def _is_stale(status: RunStatus, created_at: datetime, started_at: datetime | None) -> bool:
+    if status == RunStatus.running:
+        since, limit = started_at or created_at, STALE_RUNNING_S
+    elif status == RunStatus.queued:
+        since, limit = created_at, STALE_QUEUED_S
+    else:
+        return False
+    return (datetime.now(UTC) - since.replace(tzinfo=UTC)).total_seconds() > limit
+
+
+def _reusable(s: Session, rows: Sequence[Row]) -> list[Row]:
+    """`rows` (id, status, created_at, started_at) minus stale in-flight runs, which are failed."""
+    stale = {r.id for r in rows if _is_stale(r.status, r.created_at, r.started_at)}
+    for run in s.scalars(select(Run).where(Run.id.in_(stale))):
+        RunManager(s, run).fail("abandoned: no worker finished it in time")
+    return [r for r in rows if r.id not in stale]
+
+
+def _reuse_or_create(run: Run) -> tuple[RunResponse, bool]:
+    """Single-flight: the newest succeeded run with the same payload hash, else the
+    queued / running one, else persist `run` (queued).
+
+    Returns (response, created).
+    """
+    ensure_dirs()
+    # the lock makes check-then-insert atomic within this process
+    with _create_lock, get_session() as s:
+        found = s.execute(
+            select(Run.id, Run.status, Run.created_at, Run.started_at)
+            .where(Run.payload_hash == run.payload_hash, Run.status.in_(REUSABLE_STATUSES))
+            .order_by(Run.finished_at.desc())  # newest succeeded first, in-flight last
+        ).all()
+        found = _reusable(s, found)
+        if found:
+            best = next((r for r in found if r.status == RunStatus.succeeded), found[0])
+            return RunResponse(run_id=best.id, status=best.status.value), False
+
         s.add(run)
         s.commit()
         s.refresh(run)
+        return RunResponse(run_id=run.id, status=str(RunStatus.queued.value)), True
+
+
+def _validate_params(params: dict[str, Any] | None) -> str | None:
+    """422 for params the worker would otherwise only reject when the run starts.
+
+    Returns the requested queue priority (None: route by size).
+    """
+    try:
+        fuzzy_settings(params)
+        skip_nodes(params)
+        batch_top_k(params)
+        return priority_of(params)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _cached_run(broker: StatusBroker, payload_hash: str) -> RunResponse | None:
+    # only trusted while the broker is receiving status events (failures evict)
+    hit = RECENT_RUNS.get(payload_hash) if broker.healthy else None
+    return RunResponse(run_id=hit[0], status=hit[1]) if hit else None
+
+
+async def _submit(run: Run, broker: StatusBroker) -> tuple[RunResponse, bool]:
+    """_reuse_or_create, answered from RECENT_RUNS for hot duplicates."""
+    await broker.start()
+    cached = _cached_run(broker, run.payload_hash)
+    if cached is not None:
+        return cached, False
+    resp, created = await run_db(_reuse_or_create, run)
+    RECENT_RUNS.put(run.payload_hash, resp.run_id, resp.status)
+    return resp, created
+
+
+async def _run_inline(
+    ctx: dict[str, Any], redis: ArqRedis, run_id: str, chars: int, priority: str | None
+) -> RunStatusResponse | None:
+    """Execute a queued run in the API's compute pool.
+
+    Returns None without starting it when SYNC_MAX_INFLIGHT runs are already in
+    progress. Waits at most SYNC_WAIT_S; a slower run finishes in the background
+    and its current (non-terminal) status is returned. Its regular job is
+    enqueued too, as a takeover job deferred until the run would count as
+    orphaned: if this process dies mid-run a worker takes it over, otherwise
+    the job finds it finished (or failed) and does nothing.
+    """
+    admission: asyncio.Semaphore = ctx["admission"]
+    if admission.locked():
+        return None
+    await admission.acquire()  # does not suspend: a slot is free
+    try:
+        defer = orphaned_after(chars) + ORPHAN_GRACE_S  # past the worker's takeover threshold
+        await enqueue_run(
+            redis, run_id=run_id, chars=chars, priority=priority, defer_by=defer, takeover=True
+        )
+    except Exception:
+        # inline runs do not need Redis; a lost run is failed by _reusable eventually
+        log.warning("could not enqueue the fallback job of inline run %s", run_id, exc_info=True)
+
+    async def _execute() -> None:
+        try:
+            await _run_job_async(ctx, run_id)
+        finally:
+            admission.release()
+
+    task = asyncio.create_task(_execute())
+    ctx["tasks"].add(task)
+    task.add_done_callback(ctx["tasks"].discard)
+    try:
+        await asyncio.wait_for(asyncio.shield(task), SYNC_WAIT_S)
+    except TimeoutError:
+        pass
+    return await run_db(_get_run, run_id, True)
+
+
+@router.post("/runs", response_model=RunResponse | RunStatusResponse, status_code=202)
+async def create_run(
+    req: RunRequest,
+    response: Response,
+    redis: RedisDep,
+    broker: BrokerDep,
+    inline: InlineDep,
+    mode: Literal["async", "sync"] | None = None,
+) -> RunResponse | RunStatusResponse:
+    """Queue a new run. FastAPI will validate the body into RunRequest automatically.
+
+    With `?mode=sync` (or, without a mode, payloads up to SYNC_AUTO_MAX_CHARS) a
+    payload of at most SYNC_MAX_CHARS runs inside the API and the finished run
+    is returned with its scorecard (200). When the inline slots are all busy
+    the run is queued as usual (202).
+    """
+
+    if len(req.resume_text) > MAX_LEN or len(req.jd_text) > MAX_LEN:
+        raise HTTPException(status_code=413, detail="payload too large")
+    run = Run(
+        payload_hash=_run_hash(req),
+        status=RunStatus.queued,
+        resume_text=req.resume_text,
+        jd_text=req.jd_text,
+        params=req.params or {},
+    )
+    chars = len(req.resume_text) + len(req.jd_text)
+    return await _dispatch(run, chars, mode, response, redis, broker, inline)
+
+
+async def _dispatch(
+    run: Run,
+    chars: int,
+    mode: Literal["async", "sync"] | None,
+    response: Response,
+    redis: ArqRedis,
+    broker: StatusBroker,
+    inline: dict[str, Any],
+) -> RunResponse | RunStatusResponse:
+    # create_run / upload_run from here on: reuse, run inline, or enqueue
+    priority = _validate_params(run.params)
+    sync = chars <= SYNC_MAX_CHARS and (
+        mode == "sync" or (mode is None and chars <= SYNC_AUTO_MAX_CHARS)
+    )
+    resp, created = await _submit(run, broker)
+
+    if sync and not created and resp.status == RunStatus.succeeded.value:
+        response.status_code = 200
+        return await run_db(_get_run, resp.run_id, True)
+    if sync and created:
+        done = await _run_inline(inline, redis, resp.run_id, chars, priority)
+        if done is not None:
+            if done.status in TERMINAL:
+                response.status_code = 200
+            return done
 
     # enqueue the job
-    await enqueue_run(run_id=run.id)
+    if created:
+        await enqueue_run(redis, run_id=resp.run_id, chars=chars, priority=priority)
 
-    return RunResponse(run_id=run.id, status=str(RunStatus.queued.value))
+    return resp
 
 
-@router.get("/runs/{run_id}", response_model=RunStatusResponse)
-async def get_run(run_id: str) -> RunStatusResponse:
+@router.post("/runs/upload", response_model=RunResponse | RunStatusResponse, status_code=202)
+async def upload_run(
+    request: Request,
+    response: Response,
+    redis: RedisDep,
+    broker: BrokerDep,
+    inline: InlineDep,
+    mode: Literal["async", "sync"] | None = None,
+) -> RunResponse | RunStatusResponse:
+    """Queue a run from a multipart/form-data upload (fields `resume`, `jd`, `params`).
+
+    The body is parsed as it streams in: documents are spooled to disk and
+    hashed incrementally, so a duplicate of a JSON-submitted run is recognized,
+    then compressed from the spool into `documents` without being held in
+    memory as text. Otherwise behaves like POST /runs.
+    """
+    if int(request.headers.get("content-length") or 0) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="payload too large")
+    try:
+        upload = RunUpload(request.headers.get("content-type", ""), MAX_LEN)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e)) from e
+    try:
+        async for chunk in request.stream():
+            await asyncio.to_thread(upload.write, chunk)
+        payload_hash = await asyncio.to_thread(upload.finish)
+        docs = {
+            name: await asyncio.to_thread(encode_document_file, doc.path)
+            for name, doc in upload.docs.items()
+        }
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    finally:
+        upload.discard()
+
+    run = Run(payload_hash=payload_hash, status=RunStatus.queued, params=upload.params)
+    for name, row in docs.items():
+        run.attach_document(name, row)
+    chars = sum(doc.chars for doc in upload.docs.values())
+    return await _dispatch(run, chars, mode, response, redis, broker, inline)
+
+
+def _create_bulk(
+    runs: list[RunRequest], hashes: list[str]
+) -> tuple[dict[str, RunResponse], dict[str, str]]:
+    """Returns ({hash: reused run}, {hash: new queued run id})."""
+    ensure_dirs()
+    with _create_lock, get_session() as s:
+        reused: dict[str, RunResponse] = {}
+        found = s.execute(
+            select(Run.id, Run.status, Run.created_at, Run.started_at, Run.payload_hash)
+            .where(Run.payload_hash.in_(set(hashes)), Run.status.in_(REUSABLE_STATUSES))
+            .order_by(Run.finished_at)  # in-flight first; newest succeeded wins below
+        ).all()
+        for row in _reusable(s, found):
+            reused[row.payload_hash] = RunResponse(run_id=row.id, status=row.status.value)
+        created: dict[str, Run] = {}
+        for r, h in zip(runs, hashes, strict=True):
+            # duplicates within the request share one run
+            if h not in reused and h not in created:
+                created[h] = Run(
+                    payload_hash=h,
+                    status=RunStatus.queued,
+                    resume_text=r.resume_text,
+                    jd_text=r.jd_text,
+                    params=r.params or {},
+                )
+                s.add(created[h])
+        s.commit()
+        return reused, {h: run.id for h, run in created.items()}
+
+
+@router.post("/runs/bulk", response_model=BulkRunResponse, status_code=202)
+async def create_runs_bulk(
+    req: BulkRunRequest, redis: RedisDep, broker: BrokerDep
+) -> BulkRunResponse:
+    """Queue many independent runs; new ones are enqueued in a single Redis round trip."""
+
+    if len(req.runs) > MAX_BULK_RUNS:
+        raise HTTPException(status_code=413, detail="too many runs")
+    if any(len(r.resume_text) > MAX_LEN or len(r.jd_text) > MAX_LEN for r in req.runs):
+        raise HTTPException(status_code=413, detail="payload too large")
+
+    priorities = [_validate_params(r.params) for r in req.runs]
+    hashes = [_run_hash(r) for r in req.runs]
+    await broker.start()
+    reused: dict[str, RunResponse] = {}
+    for h in hashes:
+        cached = _cached_run(broker, h)
+        if cached is not None:
+            reused[h] = cached
+    queued: dict[str, str] = {}
+    missing = [(r, h) for r, h in zip(req.runs, hashes, strict=True) if h not in reused]
+    if missing:
+        found, queued = await run_db(_create_bulk, [r for r, _ in missing], [h for _, h in missing])
+        reused.update(found)
+        for h, resp in found.items():
+            RECENT_RUNS.put(h, resp.run_id, resp.status)
+        for h, run_id in queued.items():
+            RECENT_RUNS.put(h, run_id, RunStatus.queued.value)
+
+    queues = {
+        h: route_queue(len(r.resume_text) + len(r.jd_text), p)
+        for r, h, p in zip(req.runs, hashes, priorities, strict=True)
+    }
+    await enqueue_runs_bulk(
+        redis, list(queued.values()), {run_id: queues[h] for h, run_id in queued.items()}
+    )
+
+    return BulkRunResponse(
+        runs=[
+            (
+                reused[h]
+                if h in reused
+                else RunResponse(run_id=queued[h], status=RunStatus.queued.value)
+            )
+            for h in hashes
+        ]
+    )
+
+
+@router.post("/runs/batch", response_model=RunResponse, status_code=202)
+async def create_batch_run(req: BatchRunRequest, redis: RedisDep, broker: BrokerDep) -> RunResponse:
+    """Queue one job scoring every resume against every JD."""
+
+    if len(req.resume_texts) > MAX_BATCH_DOCS or len(req.jd_texts) > MAX_BATCH_DOCS:
+        raise HTTPException(status_code=413, detail="too many documents")
+    texts = req.resume_texts + req.jd_texts
+    if any(len(t) > MAX_LEN for t in texts):
+        raise HTTPException(status_code=413, detail="payload too large")
+    if any(not t.strip() for t in texts):
+        raise HTTPException(status_code=422, detail="empty document")
+    priority = _validate_params(req.params)
+
+    h = hashlib.sha256(
+        json.dumps(
+            {
+                "kind": RunKind.batch.value,
+                "resumes": [t.strip() for t in req.resume_texts],
+                "jds": [t.strip() for t in req.jd_texts],
+                "params": req.params or {},
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    run = Run(
+        kind=RunKind.batch,
+        payload_hash=h,
+        status=RunStatus.queued,
+        resume_text=json.dumps(req.resume_texts, ensure_ascii=False),
+        jd_text=json.dumps(req.jd_texts, ensure_ascii=False),
+        params=req.params or {},
+    )
+    resp, created = await _submit(run, broker)
+
+    if created:
+        chars = sum(len(t) for t in texts)
+        await enqueue_batch_run(redis, run_id=resp.run_id, chars=chars, priority=priority)
+
+    return resp
+
+
+# what GET /runs returns: plain columns, never the documents behind a run
+LIST_COLUMNS = (
+    Run.id,
+    Run.kind,
+    Run.status,
+    Run.payload_hash,
+    Run.error,
+    Run.created_at,
+    Run.started_at,
+    Run.finished_at,
+)
+
+
+def _encode_cursor(created_at: datetime, run_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), run_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, run_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(run_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="invalid cursor") from e
+
+
+def _as_stored(dt: datetime) -> datetime:
+    # created_at is stored as naive UTC
+    return dt.astimezone(UTC).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _as_utc(dt: datetime | None) -> datetime | None:
+    return dt.replace(tzinfo=UTC) if dt is not None and dt.tzinfo is None else dt
+
+
+def _list_runs(q: RunListQuery) -> RunListResponse:
+    stmt = select(*LIST_COLUMNS)
+    if q.status is not None:
+        stmt = stmt.where(Run.status == RunStatus(q.status))
+    if q.payload_hash is not None:
+        stmt = stmt.where(Run.payload_hash == q.payload_hash)
+    if q.created_after is not None:
+        stmt = stmt.where(Run.created_at >= _as_stored(q.created_after))
+    after = _decode_cursor(q.cursor) if q.cursor is not None else None
+    before = _as_stored(q.created_before) if q.created_before is not None else None
+    if before is not None and (after is None or after[0] >= before):
+        stmt = stmt.where(Run.created_at < before)
+    if after is not None:
+        # keyset: continue strictly after the last row of the previous page, so
+        # page N costs one index seek whatever N is (OFFSET would walk N pages).
+        # A cursor below created_before replaces it: SQLite seeks on one bound.
+        stmt = stmt.where(tuple_(Run.created_at, Run.id) < after)
+    # ix_runs_created_id / ix_runs_status_created_id hand rows over in this order
+    stmt = stmt.order_by(Run.created_at.desc(), Run.id.desc()).limit(q.limit + 1)
+    ensure_dirs()
     with get_session() as s:
-        run = s.get(Run, run_id)
+        rows = s.execute(stmt).all()
+    page = rows[: q.limit]
+    return RunListResponse(
+        runs=[
+            RunSummary(
+                run_id=r.id,
+                kind=r.kind.value,
+                status=r.status.value,
+                payload_hash=r.payload_hash,
+                error=r.error,
+                created_at=r.created_at.replace(tzinfo=UTC),
+                started_at=_as_utc(r.started_at),
+                finished_at=_as_utc(r.finished_at),
+            )
+            for r in page
+        ],
+        next_cursor=(
+            _encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > q.limit else None
+        ),
+    )
+
+
+@router.get("/runs", response_model=RunListResponse)
+async def list_runs(q: Annotated[RunListQuery, Query()]) -> RunListResponse:
+    """Runs newest first, filtered; pass `next_cursor` back as `cursor` for the next page."""
+    return await run_db(_list_runs, q)
+
+
+def _artifact_meta(a: Artifact) -> ArtifactMeta:
+    return ArtifactMeta(
+        name=a.name,
+        kind=a.kind,
+        mime=a.mime,
+        size_bytes=a.size_bytes,
+        stored_bytes=a.stored_bytes if a.stored_bytes is not None else a.size_bytes,
+        codec=a.codec,
+    )
+
+
+def _get_run(run_id: str, with_scorecard: bool = False) -> RunStatusResponse:
+    with get_session() as s:
+        # status reads skip the (possibly multi-MB) resume / JD columns
+        run = s.get(Run, run_id, options=[load_only(Run.id, Run.status, Run.error)])
         if not run:
             raise HTTPException(status_code=404, detail="run not found")
 
-        artifacts = []
+        arts = []
         if run.status == RunStatus.succeeded:
-            artifacts = [
-                ArtifactMeta(name=a.name, kind=a.kind, mime=a.mime, size_bytes=a.size_bytes)
-                for a in list_artifacts_for_run(s, run_id)
-            ]
+            arts = list_artifacts_for_run(s, run_id)
+
+        scorecard = None
+        if with_scorecard:
+            a = next((a for a in arts if a.name == "scorecard.json"), None)
+            if a is not None:
+                scorecard = json.loads(b"".join(iter_decoded(artifact_file(a), a.codec)))
 
         return RunStatusResponse(
-            run_id=run.id, status=str(run.status.value), error=run.error, artifacts=artifacts
+            run_id=run.id,
+            status=str(run.status.value),
+            error=run.error,
+            artifacts=[_artifact_meta(a) for a in arts],
+            scorecard=scorecard,
         )
 
 
-@router.get("/artifacts/{run_id}")
-async def list_artifacts(run_id: str):
+def _run_status(run_id: str) -> str:
+    with get_session() as s:
+        status = s.execute(select(Run.status).where(Run.id == run_id)).scalar()
+        if status is None:
+            raise HTTPException(status_code=404, detail="run not found")
+        return str(status.value)
+
+
+async def _next_status(
+    broker: StatusBroker, events: asyncio.Queue, run_id: str, current: str
+) -> str:
+    """Wait until the run leaves `current` and return its new status.
+
+    Published events are trusted as-is; the DB is only consulted while the broker
+    is down or after it resubscribed (events may have been missed in between).
+    """
+    epoch = broker.epoch
+    while True:
+        try:
+            event = await asyncio.wait_for(events.get(), timeout=FALLBACK_POLL_S)
+            status = event["status"]
+        except TimeoutError:
+            if broker.healthy and broker.epoch == epoch:
+                continue
+            epoch = broker.epoch
+            status = await run_db(_run_status, run_id)
+        if status != current:
+            return status
+
+
+@router.get("/runs/{run_id}", response_model=RunStatusResponse)
+async def get_run(
+    run_id: str,
+    broker: BrokerDep,
+    wait: Annotated[float, Query(ge=0, le=MAX_WAIT_S)] = 0,
+) -> RunStatusResponse:
+    """Run status; with `?wait=N`, hold the request up to N seconds for a status change."""
+    if wait <= 0:
+        return await run_db(_get_run, run_id)
+    # subscribe before reading so a change in between is not lost
+    async with broker.subscribe(run_id) as events:
+        resp = await run_db(_get_run, run_id)
+        if resp.status in TERMINAL:
+            return resp
+        try:
+            await asyncio.wait_for(_next_status(broker, events, run_id, resp.status), wait)
+        except TimeoutError:
+            return resp
+    return await run_db(_get_run, run_id)
+
+
+def _sse(resp: RunStatusResponse) -> str:
+    return f"event: status\ndata: {resp.model_dump_json()}\n\n"
+
+
+@router.get("/runs/{run_id}/events")
+async def run_events(run_id: str, broker: BrokerDep) -> StreamingResponse:
+    """Server-Sent Events: the current status, then one event per change until terminal."""
+    stack = AsyncExitStack()
+    events = await stack.enter_async_context(broker.subscribe(run_id))
+    try:
+        first = await run_db(_get_run, run_id)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def stream() -> AsyncIterator[str]:
+        async with stack:
+            yield _sse(first)
+            status = first.status
+            while status not in TERMINAL:
+                try:
+                    status = await asyncio.wait_for(
+                        _next_status(broker, events, run_id, status), SSE_KEEPALIVE_S
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if status in TERMINAL:
+                    # artifacts are only listed once, with the final event
+                    yield _sse(await run_db(_get_run, run_id))
+                else:
+                    yield _sse(RunStatusResponse(run_id=run_id, status=status))
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _list_artifacts(run_id: str) -> dict:
     with get_session() as s:
         run = s.get(Run, run_id)
         if not run:
             raise HTTPException(status_code=404, detail="run not found")
         arts = list_artifacts_for_run(s, run_id)
-        files = [
-            {"name": a.name, "kind": a.kind, "mime": a.mime, "size_bytes": a.size_bytes}
-            for a in arts
-        ]
+        files = [_artifact_meta(a).model_dump() for a in arts]
         return {"run_id": run_id, "files": files}
 
 
-@router.get("/artifacts/{run_id}/{name}")
-async def get_artifact(run_id: str, name: str):
+@router.get("/artifacts/{run_id}")
+async def list_artifacts(run_id: str):
+    return await run_db(_list_artifacts, run_id)
+
+
+def _find_artifact(run_id: str, name: str) -> Artifact:
     with get_session() as s:
-        run = s.get(Run, run_id)
-        if not run:
+        a = get_artifact_by_name(s, run_id, name)
+        if a is not None:
+            return a
+        if not s.get(Run, run_id):
             raise HTTPException(status_code=404, detail="run not found")
-        arts = list_artifacts_for_run(s, run_id)
-        for a in arts:
-            if a.name == name:
-                # Serve with content-disposition for nice filename in downloads
-                return FileResponse(
-                    a.path,
-                    media_type=a.mime,
-                    filename=a.name,
-                )
     raise HTTPException(status_code=404, detail="artifact not found")
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """RFC 9110 Accept-Encoding: gzip (or *) with a non-zero q-value."""
+    q = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        weight = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k == "q":
+                try:
+                    weight = float(v)
+                except ValueError:
+                    weight = 0.0
+        q[token.strip().lower()] = weight
+    gz = q.get("gzip", q.get("x-gzip", q.get("*", 0.0)))
+    return gz > 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    if if_none_match.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in if_none_match.split(","))
+
+
+@router.get("/artifacts/{run_id}/{name}")
+async def get_artifact(run_id: str, name: str, request: Request):
+    """Download an artifact.
+
+    Artifacts never change once their run succeeded, so responses are
+    immutable and validated by a strong ETag (the content sha256, suffixed per
+    content-coding). Range requests are served by FileResponse, over the
+    stored bytes when they are sent gzip-encoded.
+    """
+    a = await run_db(_find_artifact, run_id, name)
+    gzip_ok = a.codec == "gzip" and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = f'"{a.sha256}-gzip"' if gzip_ok else f'"{a.sha256}"'
+    headers = {"ETag": etag, "Cache-Control": ARTIFACT_CACHE_CONTROL}
+    if a.codec != "identity":
+        headers["Vary"] = "Accept-Encoding"
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    path = artifact_file(a)
+    if a.codec == "identity" or gzip_ok:
+        if gzip_ok:
+            # the stored gzip stream is the response body as-is
+            headers["Content-Encoding"] = a.codec
+        # Serve with content-disposition for nice filename in downloads
+        return FileResponse(path, media_type=a.mime, filename=name, headers=headers)
+    headers["Content-Length"] = str(a.size_bytes)
+    headers["Content-Disposition"] = f'attachment; filename="{name}"'
+    headers["Accept-Ranges"] = "none"  # decoded on the fly; ranges need gzip
+    return StreamingResponse(iter_decoded(path, a.codec), media_type=a.mime, headers=headers)
+
+
+def _search_jobs(req: JobSearchRequest) -> JobSearchResponse:
+    if len(req.resume_text) > MAX_LEN:
+        raise HTTPException(status_code=413, detail="payload too large")
+    stats = {"hits": 0, "misses": 0, "evictions": 0}
+    text, skills = _document_features(req.resume_text, get_feature_cache(), stats)
+    if req.rank == "semantic":
+        store = get_vector_store()
+        hits = store.search(ENCODER.encode(text), k=req.k)
+        return JobSearchResponse(
+            indexed_jds=store.live(),
+            results=[JobSearchHit(run_id=h["id"], score=h["score"]) for h in hits],
+        )
+    ensure_dirs()
+    with get_session() as s:
+        index = get_job_index(s)
+        hits = index.search(skills, k=req.k, rank=req.rank, s=s)
+    return JobSearchResponse(indexed_jds=len(index), results=[JobSearchHit(**h) for h in hits])
+
+
+@router.get("/search/jobs", response_model=JobSearchResponse)
+async def search_jobs(req: Annotated[JobSearchRequest, Query()]) -> JobSearchResponse:
+    """Best-fitting indexed JDs for a resume (query-string variant)."""
+    return await run_db(_search_jobs, req)
+
+
+@router.post("/search/jobs", response_model=JobSearchResponse)
+async def search_jobs_post(req: JobSearchRequest) -> JobSearchResponse:
+    """Best-fitting indexed JDs for a resume too large for a query string."""
+    return await run_db(_search_jobs, req)
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus text exposition of this process' histograms."""
+    return Response(render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/queues", response_model=list[QueueStats])
+async def get_queues(redis: RedisDep) -> list[QueueStats]:
+    """Backlog per worker queue; wait-time histograms are on the worker's /metrics."""
+    try:
+        stats = await queue_stats(redis)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"queue unavailable: {e}") from e
+    return [
+        QueueStats(queue=name, depth=depth, oldest_wait_s=oldest)
+        for name, (depth, oldest) in stats.items()
+    ]
+
+
+@router.put("/metrics/profiling", response_model=ProfilingConfig)
+async def update_profiling(cfg: ProfilingConfig, redis: RedisDep) -> ProfilingConfig:
+    """Flip the instrumentation at runtime; workers pick it up within a few seconds."""
+    current = set_profiling(enabled=cfg.enabled, tracemalloc=cfg.tracemalloc)
+    try:
+        await store_profiling(redis)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"applied locally, not to workers: {e}") from e
+    return ProfilingConfig(enabled=current.enabled, tracemalloc=current.tracemalloc)
+
+
+@router.get("/metrics/profiling", response_model=ProfilingConfig)
+async def get_profiling() -> ProfilingConfig:
+    current = set_profiling()
+    return ProfilingConfig(enabled=current.enabled, tracemalloc=current.tracemalloc)
@@ -0,0 +1,115 @@
+# backend/app/cli.py
+"""Operational commands.
+
+python -m backend.app.cli sweep [--dry-run] [--policy succeeded=30,failed=14] [--max-batches N]
+python -m backend.app.cli score pairs.jsonl --out scores.jsonl [--processes N] [--restart]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from backend.app.core.offline import SCORE_CHUNK, ScoreStats, score_file
+from backend.app.core.queue import create_compute_pool
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.retention import (
+    RETENTION_BATCH,
+    RETENTION_PAUSE_S,
+    RETENTION_POLICY,
+    RETENTION_VACUUM_PAGES,
+    parse_policy,
+    pending,
+    sweep,
+)
+
+
+def _sweep(args: argparse.Namespace) -> int:
+    policy = parse_policy(args.policy)
+    ensure_dirs()
+    with get_session() as s:
+        if args.dry_run:
+            out = {"would_delete": pending(s, policy)}
+        else:
+            stats = sweep(
+                s,
+                policy,
+                batch=args.batch,
+                max_batches=args.max_batches,
+                pause_s=args.pause,
+                vacuum_pages=args.vacuum_pages,
+            )
+            out = stats.as_dict()
+    print(json.dumps(out))
+    return 0
+
+
+def _progress(stats: ScoreStats) -> None:
+    done = stats.resumed_at + stats.scored + stats.failed
+    print(
+        f"{done} pairs done ({stats.failed} failed), {stats.pairs_per_s:.1f} pairs/s",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _score(args: argparse.Namespace) -> int:
+    pool = create_compute_pool(args.processes, feature_cache=False)
+    try:
+        stats = score_file(
+            args.input,
+            args.out,
+            pool,
+            max(1, args.processes),
+            chunk=args.chunk,
+            skip=tuple(filter(None, args.skip_nodes.split(","))),
+            feature_cache=args.feature_cache,
+            restart=args.restart,
+            progress=_progress,
+            progress_every_s=args.progress_every,
+        )
+    finally:
+        pool.shutdown(cancel_futures=True)
+    print(json.dumps(stats.as_dict()))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m backend.app.cli")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sw = sub.add_parser("sweep", help="delete runs past their retention, in batches")
+    sw.add_argument("--policy", default=RETENTION_POLICY, help="<status>=<days>,...")
+    sw.add_argument("--batch", type=int, default=RETENTION_BATCH, help="runs per transaction")
+    sw.add_argument("--max-batches", type=int, default=None)
+    sw.add_argument(
+        "--pause", type=float, default=RETENTION_PAUSE_S, help="seconds between batches"
+    )
+    sw.add_argument("--vacuum-pages", type=int, default=RETENTION_VACUUM_PAGES)
+    sw.add_argument("--dry-run", action="store_true", help="only count what would be deleted")
+    sw.set_defaults(func=_sweep)
+
+    sc = sub.add_parser(
+        "score", help="score resume/JD pairs from a JSONL/CSV file, without the API or queue"
+    )
+    sc.add_argument("input", type=Path, help="JSONL or CSV of resume_text/jd_text or *_path")
+    sc.add_argument("--out", type=Path, required=True, help="scorecards, one JSON line per pair")
+    sc.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    sc.add_argument("--chunk", type=int, default=SCORE_CHUNK, help="pairs per task")
+    sc.add_argument("--skip-nodes", default="", help="graph nodes to leave out, comma-separated")
+    sc.add_argument(
+        "--feature-cache", type=Path, default=None, help="SQLite file to cache features in"
+    )
+    sc.add_argument("--restart", action="store_true", help="ignore the checkpoint, start over")
+    sc.add_argument("--progress-every", type=float, default=10.0, help="seconds")
+    sc.set_defaults(func=_score)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# backend/app/core/batch.py
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+
+from backend.app.core.embeddings import ENCODER
+from backend.app.core.feature_cache import FeatureCache
+from backend.app.core.graph import _document_features
+
+ROW_BLOCK = 32  # resumes scored per block, bounds the (block x nnz) scratch matrix
+
+
+def batch_top_k(params: Mapping[str, Any] | None) -> int | None:
+    """params["top_k"], a positive int or absent (ValueError otherwise)."""
+    top_k = (params or {}).get("top_k")
+    if top_k is not None and (type(top_k) is not int or top_k < 1):
+        raise ValueError("top_k must be a positive integer")
+    return top_k
+
+
+def _distinct_docs(
+    texts: list[str], cache: FeatureCache | None, stats: dict[str, int]
+) -> tuple[np.ndarray, list[list[str]], np.ndarray]:
+    """Featurize each distinct text once.
+
+    Returns (text -> doc index, skills per doc, doc x dim embedding matrix).
+    """
+    seen: dict[str, int] = {}
+    skills: list[list[str]] = []
+    vectors: list[np.ndarray] = []
+    index = np.empty(len(texts), dtype=np.int64)
+    for i, t in enumerate(texts):
+        d = seen.get(t)
+        if d is None:
+            d = seen[t] = len(skills)
+            text, terms = _document_features(t, cache, stats)
+            skills.append(terms)
+            vectors.append(ENCODER.encode(text))
+        index[i] = d
+    return index, skills, np.vstack(vectors) if vectors else np.zeros((0, ENCODER.dim))
+
+
+def _csr(docs: list[list[str]], vocab: dict[str, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Intern terms into `vocab` and return (indices, indptr) of the doc x term matrix."""
+    indptr = np.zeros(len(docs) + 1, dtype=np.int64)
+    flat: list[int] = []
+    for i, terms in enumerate(docs):
+        flat.extend(vocab.setdefault(t, len(vocab)) for t in terms)
+        indptr[i + 1] = len(flat)
+    return np.asarray(flat, dtype=np.int64), indptr
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    # np.round is not correctly rounded like round(); apply round() per distinct value
+    # so batch scores are bit-identical to node_score_rule_based.
+    uniq, inv = np.unique(values, return_inverse=True)
+    return np.array([round(float(v), 1) for v in uniq])[inv].reshape(values.shape)
+
+
+def overlap_counts(
+    r_indices: np.ndarray,
+    r_indptr: np.ndarray,
+    j_indices: np.ndarray,
+    j_indptr: np.ndarray,
+    vocab_size: int,
+) -> np.ndarray:
+    """|resume_i & jd_j| for every pair, from two CSR term sets over one vocabulary."""
+    n_r, n_j = len(r_indptr) - 1, len(j_indptr) - 1
+    out = np.zeros((n_r, n_j), dtype=np.int32)
+    if n_j == 0 or len(j_indices) == 0:
+        return out
+    for lo in range(0, n_r, ROW_BLOCK):
+        hi = min(n_r, lo + ROW_BLOCK)
+        mask = np.zeros((hi - lo, vocab_size), dtype=bool)
+        rows = np.repeat(np.arange(hi - lo), np.diff(r_indptr[lo : hi + 1]))
+        mask[rows, r_indices[r_indptr[lo] : r_indptr[hi]]] = True
+        # gather each JD's terms from the resume bitmaps and sum them per JD segment
+        hits = np.zeros((hi - lo, len(j_indices) + 1), dtype=np.int32)
+        np.cumsum(mask[:, j_indices], axis=1, out=hits[:, 1:])
+        out[lo:hi] = hits[:, j_indptr[1:]] - hits[:, j_indptr[:-1]]
+    return out
+
+
+def score_batch(
+    resume_texts: list[str],
+    jd_texts: list[str],
+    top_k: int | None = None,
+    cache: FeatureCache | None = None,
+) -> dict[str, Any]:
+    """Score every resume against every JD; same dimensions as node_score_rule_based."""
+    stats = {"hits": 0, "misses": 0, "evictions": 0}
+    r_index, r_skills, r_vecs = _distinct_docs(resume_texts, cache, stats)
+    j_index, j_skills, j_vecs = _distinct_docs(jd_texts, cache, stats)
+
+    vocab: dict[str, int] = {}
+    r_indices, r_indptr = _csr(r_skills, vocab)
+    j_indices, j_indptr = _csr(j_skills, vocab)
+    overlap = overlap_counts(r_indices, r_indptr, j_indices, j_indptr, len(vocab))
+
+    # expand distinct-doc results back to the submitted N x M grid
+    ov = overlap[np.ix_(r_index, j_index)].astype(np.float64)
+    jd_count = np.diff(j_indptr)[j_index].astype(np.float64)
+    resume_count = np.diff(r_indptr)[r_index].astype(np.float64)
+
+    cov = np.where(jd_count > 0, _round1(100.0 * ov / np.maximum(jd_count, 1.0)), 0.0)
+    density = np.minimum(100.0, _round1(resume_count / 3))[:, None]
+    density = np.broadcast_to(density, cov.shape)
+    hygiene = 80.0  # placeholder constant, as in node_score_rule_based
+    overall = _round1(0.6 * cov + 0.25 * density + 0.15 * hygiene)
+    # cosine similarity of every distinct pair in one matmul
+    semantic = _round1(100.0 * np.maximum(0.0, r_vecs @ j_vecs.T))[np.ix_(r_index, j_index)]
+
+    # rank by overall desc, then resume/jd order for stable ties
+    n_r, n_j = cov.shape
+    order = np.lexsort(
+        (np.tile(np.arange(n_j), n_r), np.repeat(np.arange(n_r), n_j), -overall.ravel())
+    )
+    if top_k is not None:
+        order = order[:top_k]
+
+    r_sets = [set(s) for s in r_skills]
+    j_sets = [set(s) for s in j_skills]
+    results = []
+    for rank, flat in enumerate(order.tolist(), start=1):
+        i, j = divmod(flat, n_j)
+        results.append(
+            {
+                "rank": rank,
+                "resume_index": i,
+                "jd_index": j,
+                "overall_score": float(overall[i, j]),
+                "dimensions": {
+                    "skills_match": float(cov[i, j]),
+                    "keyword_density": float(density[i, j]),
+                    "ats_hygiene": hygiene,
+                    "semantic_match": float(semantic[i, j]),
+                },
+                "coverage_terms_overlap": sorted(r_sets[r_index[i]] & j_sets[j_index[j]])[:25],
+            }
+        )
+
+    return {
+        "resumes": n_r,
+        "jds": n_j,
+        "distinct_resumes": len(r_skills),
+        "distinct_jds": len(j_skills),
+        "vocabulary_size": len(vocab),
+        "feature_cache": stats,
+        "results": results,
+    }
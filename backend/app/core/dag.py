@@ -0,0 +1,282 @@
+# backend/app/core/dag.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+TraceFn = Callable[[dict[str, Any]], list[dict[str, Any]]]
+PROFILE_KEY = "__profile__"
+
+
+@dataclass(frozen=True)
+class Node:
+    """One step of a graph: `fn(*inputs)` (values in declared order) returns a dict
+    with every name in `outputs`.
+
+    `trace(values)` builds the node's trace entries from the final values; entries
+    are emitted in declaration order, whatever order the nodes finished in.
+    A skipped node provides `defaults` for its outputs; without defaults,
+    everything downstream of it is skipped as well.
+    """
+
+    name: str
+    fn: Callable[..., dict[str, Any]]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    trace: TraceFn | None = None
+    memoize: bool = False
+    defaults: Mapping[str, Any] | None = None
+    version: str = "1"  # bump when `fn` changes meaning, to invalidate memoized outputs
+
+
+def _feed(h: Any, value: Any) -> None:
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        tag = b"s"
+    elif isinstance(value, bytes):
+        data, tag = value, b"b"
+    elif isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value).tobytes()
+        tag = f"a{value.dtype.str}{value.shape}".encode()
+    else:
+        data = json.dumps(value, sort_keys=True, default=repr).encode("utf-8")
+        tag = b"j"
+    h.update(tag + b":%d:" % len(data))
+    h.update(data)
+
+
+def input_digest(node: Node, values: Mapping[str, Any]) -> str:
+    """Content address of one node invocation: name, version and input values."""
+    h = hashlib.sha256(f"{node.name}\0{node.version}".encode())
+    for name in node.inputs:
+        _feed(h, values[name])
+    return h.hexdigest()
+
+
+class Memo:
+    """Bounded, thread-safe LRU of node outputs keyed by `input_digest`."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            out = self._entries.get(key)
+            if out is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return out
+
+    def put(self, key: str, outputs: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = outputs
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _call(node: Node, args: dict[str, Any], profile: bool = False) -> dict[str, Any]:
+    if profile:
+        return _profiled_call(node, args)
+    out = node.fn(*(args[i] for i in node.inputs))
+    missing = [o for o in node.outputs if o not in out]
+    if missing:
+        raise KeyError(f"node {node.name!r} did not produce {missing}")
+    return {o: out[o] for o in node.outputs}
+
+
+def _profiled_call(node: Node, args: dict[str, Any]) -> dict[str, Any]:
+    # the profile rides along under a reserved key, so it survives a process executor
+    memory = tracemalloc.is_tracing()
+    if memory:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    wall, cpu = time.perf_counter(), time.thread_time()
+    out = _call(node, args)
+    prof = {
+        "node": "profile",
+        "target": node.name,
+        "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+        "cpu_ms": round((time.thread_time() - cpu) * 1000, 3),
+        "peak_bytes": tracemalloc.get_traced_memory()[1] - base if memory else None,
+    }
+    out[PROFILE_KEY] = prof
+    return out
+
+
+class Graph:
+    """A DAG of nodes wired by value names.
+
+    Names no node produces are the graph's inputs. Independent nodes run
+    concurrently when an executor is given (threads, or processes if every
+    `fn` is picklable), otherwise one at a time in dependency order.
+    """
+
+    def __init__(self, nodes: Iterable[Node]):
+        self.nodes = list(nodes)
+        producer: dict[str, Node] = {}
+        for n in self.nodes:
+            for o in n.outputs:
+                if o in producer:
+                    raise ValueError(f"{o!r} is produced by {producer[o].name!r} and {n.name!r}")
+                producer[o] = n
+        if len({n.name for n in self.nodes}) != len(self.nodes):
+            raise ValueError("duplicate node names")
+        self.producer = producer
+        self.inputs = sorted({i for n in self.nodes for i in n.inputs} - producer.keys())
+        self.order = self._toposort()
+
+    def _toposort(self) -> list[Node]:
+        order: list[Node] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(n: Node) -> None:
+            if state.get(n.name) == 2:
+                return
+            if state.get(n.name) == 1:
+                raise ValueError(f"cycle through node {n.name!r}")
+            state[n.name] = 1
+            for i in n.inputs:
+                if i in self.producer:
+                    visit(self.producer[i])
+            state[n.name] = 2
+            order.append(n)
+
+        for n in self.nodes:
+            visit(n)
+        return order
+
+    def plan(self, skip: Collection[str] = ()) -> tuple[list[Node], dict[str, Any]]:
+        """(nodes to run in dependency order, default values of skipped nodes)."""
+        unknown = set(skip) - {n.name for n in self.nodes}
+        if unknown:
+            raise ValueError(f"unknown nodes {sorted(unknown)}")
+        missing: set[str] = set()
+        defaults: dict[str, Any] = {}
+        run: list[Node] = []
+        for n in self.order:
+            if n.name in skip and n.defaults is not None:
+                defaults.update({o: n.defaults[o] for o in n.outputs})
+            elif n.name in skip or missing.intersection(n.inputs):
+                missing.update(n.outputs)
+            else:
+                run.append(n)
+        return run, defaults
+
+    def run(
+        self,
+        inputs: Mapping[str, Any],
+        skip: Collection[str] = (),
+        memo: Memo | None = None,
+        executor: Executor | None = None,
+        profile: bool = False,
+        trace_memory: bool = False,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Execute the graph; returns (all values, trace entries).
+
+        With `profile`, every executed node adds a {"node": "profile", "target": ...}
+        entry (wall and CPU ms) after the regular trace; `trace_memory` adds the
+        node's tracemalloc peak (approximate when nodes overlap in threads).
+        """
+        absent = [i for i in self.inputs if i not in inputs]
+        if absent:
+            raise ValueError(f"missing graph inputs {absent}")
+        started = profile and trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            return self._run(inputs, skip, memo, executor, profile)
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    def _run(
+        self,
+        inputs: Mapping[str, Any],
+        skip: Collection[str],
+        memo: Memo | None,
+        executor: Executor | None,
+        profile: bool,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        nodes, values = self.plan(skip)
+        values.update(inputs)
+        ran: set[str] = set()
+        profiles: dict[str, dict[str, Any]] = {}
+
+        def lookup(n: Node) -> tuple[dict[str, Any], str | None, dict[str, Any] | None]:
+            # (args, memo key, memoized outputs)
+            args = {i: values[i] for i in n.inputs}
+            if memo is None or not n.memoize:
+                return args, None, None
+            key = input_digest(n, args)
+            return args, key, memo.get(key)
+
+        def done(n: Node, out: dict[str, Any], key: str | None) -> None:
+            if PROFILE_KEY in out:
+                out = dict(out)
+                profiles[n.name] = out.pop(PROFILE_KEY)
+            if key is not None:
+                memo.put(key, out)  # type: ignore[union-attr]
+            values.update(out)
+            ran.add(n.name)
+
+        if executor is None:
+            for n in nodes:
+                args, key, hit = lookup(n)
+                if hit is not None:
+                    done(n, hit, None)
+                else:
+                    done(n, _call(n, args, profile), key)
+        else:
+            waiting = list(nodes)
+            running: dict[Future, tuple[Node, str | None]] = {}
+            while waiting or running:
+                ready = [n for n in waiting if all(i in values for i in n.inputs)]
+                for n in ready:
+                    waiting.remove(n)
+                    args, key, hit = lookup(n)
+                    if hit is not None:
+                        done(n, hit, None)
+                    else:
+                        running[executor.submit(_call, n, args, profile)] = (n, key)
+                if ready and not running:
+                    continue  # memo hits may have unblocked more nodes
+                if not running:
+                    raise RuntimeError(f"graph stalled before {[n.name for n in waiting]}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    n, key = running.pop(fut)
+                    try:
+                        out = fut.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    done(n, out, key)
+
+        trace: list[dict[str, Any]] = []
+        for n in self.nodes:
+            if n.name in ran and n.trace is not None:
+                trace.extend(n.trace(values))
+        trace.extend(profiles[n.name] for n in self.nodes if n.name in profiles)
+        return values, trace
@@ -0,0 +1,84 @@
+# backend/app/core/dedupe.py
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEDUPE_TTL_S = float(os.environ.get("RUN_DEDUPE_TTL_S", "300"))
+DEDUPE_MAX_ENTRIES = int(os.environ.get("RUN_DEDUPE_MAX_ENTRIES", "10000"))
+
+REUSABLE = ("queued", "running", "succeeded")
+
+
+class RecentRuns:
+    """payload hash -> the run serving it, so duplicate submissions skip SQLite.
+
+    Holds queued, running and succeeded runs. Entries expire after `ttl` (runs
+    can be deleted by other processes), the oldest are evicted beyond
+    `max_entries`, and a run is dropped as soon as a failure is reported for it.
+    Callers must only trust the map while status events are being received.
+    """
+
+    def __init__(self, max_entries: int = DEDUPE_MAX_ENTRIES, ttl: float = DEDUPE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, str, float]] = OrderedDict()
+        self._hash_of: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, payload_hash: str) -> tuple[str, str] | None:
+        """(run_id, status) of a reusable run, or None."""
+        with self._lock:
+            entry = self._entries.get(payload_hash)
+            if entry is None:
+                return None
+            run_id, status, expires = entry
+            if expires < time.monotonic():
+                self._drop(payload_hash)
+                return None
+            return run_id, status
+
+    def put(self, payload_hash: str, run_id: str, status: str) -> None:
+        if status not in REUSABLE:
+            return
+        with self._lock:
+            if payload_hash in self._entries:
+                self._drop(payload_hash)
+            self._entries[payload_hash] = (run_id, status, time.monotonic() + self.ttl)
+            self._hash_of[run_id] = payload_hash
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, payload_hash: str) -> None:
+        run_id, _, _ = self._entries.pop(payload_hash)
+        self._hash_of.pop(run_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hash_of.clear()
+
+    def on_status(self, event: dict[str, Any] | None) -> None:
+        """StatusBroker listener: track status changes, forget failed runs."""
+        if event is None:
+            self.clear()  # (re)subscribed: failures may have been missed
+            return
+        with self._lock:
+            h = self._hash_of.get(event.get("run_id", ""))
+            if h is None:
+                return
+            run_id, _, expires = self._entries[h]
+            if event.get("status") in REUSABLE:
+                self._entries[h] = (run_id, event["status"], expires)
+            else:
+                self._drop(h)
+
+
+RECENT_RUNS = RecentRuns()
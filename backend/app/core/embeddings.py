@@ -0,0 +1,326 @@
+# backend/app/core/embeddings.py
+
+from __future__ import annotations
+
+import fcntl
+import glob
+import itertools
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+import numpy as np
+
+from backend.app.core.textstream import windows
+
+DATA_DIR = os.environ.get("DATA_DIR", "./data")
+EMBEDDING_DIM = int(os.environ.get("EMBEDDING_DIM", "256"))
+IVF_MIN_ROWS = int(os.environ.get("VECTOR_IVF_MIN_ROWS", "20000"))
+IVF_NPROBE = int(os.environ.get("VECTOR_IVF_NPROBE", "8"))
+
+ID_BYTES = 64  # fixed-width id records so the id map is mmapped too
+BLOCK_ROWS = 65536  # rows scored per matmul when scanning the store
+
+_NGRAMS = (3, 4)
+_PRIME = np.uint64(1_000_003)
+
+
+class HashingEncoder:
+    """Character n-gram feature hashing: no vocabulary, no network, no GPU.
+
+    Each n-gram is hashed (deterministically, unlike hash()) to a bucket and a
+    sign; counts are log-scaled and the vector is L2-normalized, so the dot
+    product of two encodings is their cosine similarity.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, ngrams: tuple[int, ...] = _NGRAMS):
+        self.dim = dim
+        self.ngrams = ngrams
+
+    def encode(self, text: str) -> np.ndarray:
+        return self.encode_chunks(windows(text))
+
+    def encode_chunks(self, chunks: Iterable[str]) -> np.ndarray:
+        """`encode` of the concatenated chunks, holding one chunk's n-grams at a time.
+
+        Chunks must not split a word (see textstream.windows): lowercasing is
+        context-sensitive within one.
+        """
+        keep = max(self.ngrams) - 1
+        tail = np.zeros(0, dtype=np.uint64)  # last `keep` codes of the previous chunk
+        vec = np.zeros(self.dim, dtype=np.float64)
+        for chunk in itertools.chain((" ",), chunks, (" ",)):
+            new = np.frombuffer(chunk.lower().encode("utf-32-le"), dtype=np.uint32)
+            codes = np.concatenate((tail, new.astype(np.uint64)))
+            for n in self.ngrams:
+                # only n-grams ending in the new codes; earlier ones were counted already
+                first = max(0, len(tail) - n + 1)
+                count = len(codes) - n + 1 - first
+                if count <= 0:
+                    continue
+                h = np.zeros(count, dtype=np.uint64)
+                for i in range(n):  # polynomial rolling hash, wraps mod 2**64
+                    h = h * _PRIME + codes[first + i : first + i + count]
+                h ^= h >> np.uint64(29)
+                buckets = (h % np.uint64(self.dim)).astype(np.int64)
+                signs = np.where((h >> np.uint64(63)) == 0, 1.0, -1.0)
+                vec += np.bincount(buckets, weights=signs, minlength=self.dim)
+            tail = codes[max(0, len(codes) - keep) :]
+        vec = np.sign(vec) * np.log1p(np.abs(vec))
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.dot(a, b))
+
+
+class VectorStore:
+    """Append-only float32 vectors in a memory-mapped file, plus a fixed-width id map.
+
+    Opening a store only stats and maps files, so load time does not grow with
+    the number of vectors. Search is brute force until an IVF index has been
+    built; rows appended after the last build are always scanned exhaustively.
+    Each build writes its own `ivf.<version>.*.npy` files and then publishes
+    them together by replacing the `ivf.current` pointer. Ids removed with
+    their runs are listed in a `dead` file and skipped by search.
+    """
+
+    def __init__(self, prefix: str, dim: int = EMBEDDING_DIM):
+        self.prefix = prefix
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._mapped_rows = -1
+        self._vectors: np.ndarray | None = None
+        self._ids: np.ndarray | None = None
+        self._ivf: dict[str, np.ndarray] | None = None
+        self._ivf_version: str | None = None
+        self._dead_size = 0
+        self._dead = np.zeros(0, dtype=f"S{ID_BYTES}")
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+
+    def _path(self, suffix: str) -> str:
+        return f"{self.prefix}.{suffix}"
+
+    @contextmanager
+    def _file_lock(self, name: str = "lock", blocking: bool = True):
+        """Exclusive lock across worker processes; yields False if not blocking and taken.
+
+        "lock" serializes appends so vectors and ids stay aligned, "ivf.lock" IVF builds.
+        """
+        with open(self._path(name), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self._path("ids")) // ID_BYTES
+        except FileNotFoundError:
+            return 0
+
+    def _map(self) -> tuple[np.ndarray, np.ndarray]:
+        rows = len(self)
+        with self._lock:
+            if rows != self._mapped_rows:
+                if rows == 0:
+                    self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+                    self._ids = np.zeros(0, dtype=f"S{ID_BYTES}")
+                else:
+                    self._vectors = np.memmap(
+                        self._path("f32"), dtype=np.float32, mode="r", shape=(rows, self.dim)
+                    )
+                    self._ids = np.memmap(
+                        self._path("ids"), dtype=f"S{ID_BYTES}", mode="r", shape=(rows,)
+                    )
+                self._mapped_rows = rows
+            assert self._vectors is not None and self._ids is not None
+            return self._vectors, self._ids
+
+    def add(self, item_id: str, vec: np.ndarray) -> None:
+        raw = item_id.encode("ascii")
+        if len(raw) > ID_BYTES or len(vec) != self.dim:
+            raise ValueError("invalid vector or id")
+        with self._file_lock():
+            self._append(raw, vec)
+
+    def _append(self, raw: bytes, vec: np.ndarray) -> None:
+        # caller holds the lock
+        rows = len(self)
+        with open(self._path("f32"), "ab") as f:
+            f.truncate(rows * self.dim * 4)  # drop a torn write from a crashed writer
+            f.write(np.asarray(vec, dtype=np.float32).tobytes())
+        # the id record is written last: a row exists once its id does
+        with open(self._path("ids"), "ab") as f:
+            f.write(raw.ljust(ID_BYTES, b"\0"))
+
+    def retire(self, item_ids: Iterable[str], moves: Mapping[str, str] | None = None) -> int:
+        """Hide `item_ids` from search; returns the rows hidden.
+
+        The vector of an id in `moves` is first added again under the id it maps to.
+        Ids already hidden are skipped, so a retried call does not add them twice.
+        """
+        wanted = np.array([i.encode("ascii") for i in item_ids], dtype=f"S{ID_BYTES}")
+        to = {k.encode("ascii"): v.encode("ascii") for k, v in (moves or {}).items()}
+        with self._file_lock():
+            vectors, ids = self._map()
+            rows = np.flatnonzero(np.isin(ids, wanted))  # one pass over the id map
+            rows = rows[~np.isin(ids[rows], self._dead_ids())]
+            for row in rows.tolist():
+                if ids[row] in to:
+                    self._append(to[ids[row]], np.array(vectors[row]))
+            with open(self._path("dead"), "ab") as f:
+                f.write(np.asarray(ids[rows], dtype=f"S{ID_BYTES}").tobytes())
+        return len(rows)
+
+    def _dead_ids(self) -> np.ndarray:
+        try:
+            size = os.path.getsize(self._path("dead"))
+        except FileNotFoundError:
+            size = 0
+        with self._lock:
+            if size != self._dead_size:
+                with open(self._path("dead"), "rb") as f:
+                    raw = f.read(size - size % ID_BYTES)
+                self._dead = np.unique(np.frombuffer(raw, dtype=f"S{ID_BYTES}"))
+                self._dead_size = size
+            return self._dead
+
+    def live(self) -> int:
+        """Rows search can return."""
+        return len(self) - len(self._dead_ids())
+
+    def _load_ivf(self) -> dict[str, np.ndarray] | None:
+        try:
+            with open(self._path("ivf.current")) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if version != self._ivf_version:
+            try:
+                ivf = {
+                    k: np.load(self._path(f"ivf.{version}.{k}.npy"), mmap_mode="r")
+                    for k in ("centroids", "offsets", "rows")
+                }
+            except FileNotFoundError:
+                # superseded and cleaned up since the pointer was read; keep what we have
+                return self._ivf
+            self._ivf, self._ivf_version = ivf, version
+        return self._ivf
+
+    def build_ivf(self, nlist: int | None = None, iters: int = 8, seed: int = 0) -> None:
+        """Train spherical k-means centroids and write inverted lists of row ids."""
+        with self._file_lock("ivf.lock"):
+            self._build_ivf(nlist, iters, seed)
+
+    def _build_ivf(self, nlist: int | None = None, iters: int = 8, seed: int = 0) -> None:
+        # caller holds ivf.lock
+        vectors, _ = self._map()
+        n = len(vectors)
+        if n == 0:
+            return
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, size=min(n, nlist * 64), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    m = members.sum(axis=0)
+                    centroids[c] = m / (np.linalg.norm(m) or 1.0)
+
+        assign = np.empty(n, dtype=np.int64)
+        for lo in range(0, n, BLOCK_ROWS):
+            assign[lo : lo + BLOCK_ROWS] = np.argmax(
+                vectors[lo : lo + BLOCK_ROWS] @ centroids.T, axis=1
+            )
+        rows = np.argsort(assign, kind="stable")
+        offsets = np.searchsorted(assign[rows], np.arange(nlist + 1))
+        # nothing refers to this version's files until the pointer below names them
+        version = f"{n}-{uuid.uuid4().hex[:12]}"
+        for key, arr in (("centroids", centroids), ("offsets", offsets), ("rows", rows)):
+            np.save(self._path(f"ivf.{version}.{key}.npy"), arr)
+        tmp = self._path(f"ivf.current.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            f.write(version)
+        os.replace(tmp, self._path("ivf.current"))
+        # readers that mapped an older version keep their mapping after the unlink
+        for path in glob.glob(glob.escape(self.prefix) + ".ivf.*.npy"):
+            if not path.startswith(self._path(f"ivf.{version}.")):
+                os.unlink(path)
+
+    def search(
+        self, query: np.ndarray, k: int = 10, nprobe: int = IVF_NPROBE
+    ) -> list[dict[str, Any]]:
+        vectors, ids = self._map()
+        n = len(vectors)
+        if n == 0 or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        ivf = self._load_ivf()
+        if ivf is not None:
+            covered = len(ivf["rows"])
+            near = np.argsort(-(ivf["centroids"] @ q))[:nprobe]
+            parts = [ivf["rows"][ivf["offsets"][c] : ivf["offsets"][c + 1]] for c in near]
+            parts.append(np.arange(covered, n))  # appended since the last build
+            cand = np.sort(np.concatenate(parts)).astype(np.int64)
+            cand = cand[cand < n]
+            scores = vectors[cand] @ q
+        else:
+            cand = np.arange(n)
+            scores = np.concatenate(
+                [vectors[lo : lo + BLOCK_ROWS] @ q for lo in range(0, n, BLOCK_ROWS)]
+            )
+        dead = self._dead_ids()
+        if len(dead):
+            scores = np.where(np.isin(ids[cand], dead), -np.inf, scores)
+        top = np.argsort(-scores, kind="stable")[:k]
+        top = top[np.isfinite(scores[top])]
+        return [
+            {"id": ids[cand[i]].rstrip(b"\0").decode("ascii"), "score": round(float(scores[i]), 4)}
+            for i in top.tolist()
+        ]
+
+    def maybe_build_ivf(self) -> bool:
+        """(Re)build the IVF index once the un-indexed tail is as large as the indexed part.
+
+        Returns False without waiting when another process is building.
+        """
+        if not self._needs_ivf():
+            return False
+        with self._file_lock("ivf.lock", blocking=False) as locked:
+            # another process may have just published a build
+            if not locked or not self._needs_ivf():
+                return False
+            self._build_ivf()
+            return True
+
+    def _needs_ivf(self) -> bool:
+        n = len(self)
+        ivf = self._load_ivf()
+        covered = len(ivf["rows"]) if ivf is not None else 0
+        return n >= IVF_MIN_ROWS and n - covered >= max(covered, IVF_MIN_ROWS)
+
+
+ENCODER = HashingEncoder()
+
+_store: VectorStore | None = None
+
+
+def get_vector_store() -> VectorStore:
+    """JD embeddings under DATA_DIR/vectors, keyed by the run that first carried the JD."""
+    global _store
+    if _store is None:
+        _store = VectorStore(os.path.join(DATA_DIR, "vectors", "jd"))
+    return _store
@@ -0,0 +1,133 @@
+# backend/app/core/events.py
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+log = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "run-status:"
+TERMINAL = ("succeeded", "failed")
+RECONNECT_S = 1.0
+
+
+def channel(run_id: str) -> str:
+    return CHANNEL_PREFIX + run_id
+
+
+class StatusPublisher:
+    """Sync publisher for RunManager status changes (called from worker threads)."""
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @classmethod
+    def from_url(cls, url: str) -> StatusPublisher:
+        return cls(Redis.from_url(url))
+
+    def __call__(self, run_id: str, status: str, error: str | None) -> None:
+        msg = json.dumps({"run_id": run_id, "status": status, "error": error})
+        try:
+            self.redis.publish(channel(run_id), msg)
+        except Exception:
+            # best effort: waiters fall back to reading the DB when the broker is down
+            log.warning("could not publish status of run %s", run_id, exc_info=True)
+
+
+class StatusBroker:
+    """One pattern subscription per API process, fanned out to local waiters.
+
+    Waiters are in-memory queues keyed by run id, so a client waiting on a run
+    holds no DB connection and costs no queries until its run changes state.
+    """
+
+    def __init__(self, redis: AsyncRedis):
+        self.redis = redis
+        self.healthy = False
+        self.epoch = 0  # bumped on every (re)subscribe; events may be missed across a bump
+        self._waiters: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._listeners: list[Callable[[dict[str, Any] | None], None]] = []
+        self._task: asyncio.Task | None = None
+
+    def add_listener(self, fn: Callable[[dict[str, Any] | None], None]) -> None:
+        """Call `fn(event)` for every status event of any run.
+
+        `fn(None)` is called on every (re)subscribe: events may have been missed.
+        """
+        self._listeners.append(fn)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            # don't hold requests hostage to an unreachable Redis
+            await asyncio.wait_for(ready.wait(), timeout=RECONNECT_S)
+        except TimeoutError:
+            pass
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, ready: asyncio.Event) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                self.healthy = True
+                self.epoch += 1
+                for fn in self._listeners:
+                    fn(None)
+                ready.set()
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30)
+                    if msg is not None and msg["type"] == "pmessage":
+                        self._dispatch(msg["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.warning("status subscription lost; reconnecting", exc_info=True)
+                await asyncio.sleep(RECONNECT_S)
+            finally:
+                self.healthy = False
+                await pubsub.aclose()
+
+    def _dispatch(self, data: bytes | str) -> None:
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        for fn in self._listeners:
+            fn(event)
+        for q in self._waiters.get(event.get("run_id", ""), ()):
+            q.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, run_id: str) -> AsyncIterator[asyncio.Queue[dict[str, Any]]]:
+        """Queue of status events for `run_id`; subscribe *before* reading the current status."""
+        await self.start()
+        q: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._waiters.setdefault(run_id, set()).add(q)
+        try:
+            yield q
+        finally:
+            waiters = self._waiters.get(run_id)
+            if waiters is not None:
+                waiters.discard(q)
+                if not waiters:
+                    del self._waiters[run_id]
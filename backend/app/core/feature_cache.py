@@ -0,0 +1,182 @@
+# backend/app/core/feature_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+DATA_DIR = os.environ.get("DATA_DIR", "./data")
+MEMORY_BYTES = int(os.environ.get("FEATURE_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+DISK_BYTES = int(os.environ.get("FEATURE_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+EVICT_BATCH = 64
+TOUCH_BATCH = 64  # disk hits whose recency is written back in one transaction
+TOUCH_FLUSH_S = 5.0
+
+# features_size holds SUM(features.size), kept by triggers so that every
+# process sharing the file sees the same total without scanning the table
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS features ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+    "size INTEGER NOT NULL, accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_features_accessed ON features (accessed, size)",
+    "CREATE TABLE IF NOT EXISTS features_size ("
+    "id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO features_size SELECT 0, COALESCE(SUM(size), 0) FROM features",
+    "CREATE TRIGGER IF NOT EXISTS features_size_ins AFTER INSERT ON features BEGIN "
+    "UPDATE features_size SET total = total + new.size; END",
+    "CREATE TRIGGER IF NOT EXISTS features_size_del AFTER DELETE ON features BEGIN "
+    "UPDATE features_size SET total = total - old.size; END",
+    "CREATE TRIGGER IF NOT EXISTS features_size_upd AFTER UPDATE OF size ON features BEGIN "
+    "UPDATE features_size SET total = total + new.size - old.size; END",
+)
+
+
+def features_key(raw_text: str, lexicon_version: str) -> str:
+    """Content address of a document's features: sha256(lexicon version + raw text)."""
+    h = hashlib.sha256(lexicon_version.encode("utf-8"))
+    h.update(b"\0")
+    h.update(raw_text.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _size_of(value: dict[str, Any]) -> int:
+    return len(value.get("text", "")) + sum(len(s) for s in value.get("skills", ()))
+
+
+class FeatureCache:
+    """Normalized text + extracted skills per document, shared across runs.
+
+    A bounded in-process LRU sits in front of an optional SQLite file. Both
+    tiers are bounded in bytes and evict least-recently-used entries. Disk
+    hits refresh their recency in batches (TOUCH_BATCH, TOUCH_FLUSH_S, or the
+    next put), so reads do not take the write lock.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        memory_bytes: int = MEMORY_BYTES,
+        disk_bytes: int = DISK_BYTES,
+    ):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._lru: OrderedDict[str, tuple[dict[str, Any], int]] = OrderedDict()
+        self._lru_size = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}  # disk hits not yet written back
+        self._touched_at = time.monotonic()
+        self._db: sqlite3.Connection | None = None
+        if path and disk_bytes > 0:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("BEGIN IMMEDIATE")  # one process seeds features_size
+            for stmt in _SCHEMA:
+                self._db.execute(stmt)
+            self._db.commit()
+
+    def _remember(self, key: str, value: dict[str, Any], size: int) -> int:
+        evicted = 0
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._lru_size -= old[1]
+        self._lru[key] = (value, size)
+        self._lru_size += size
+        while self._lru_size > self.memory_bytes and len(self._lru) > 1:
+            _, (_, sz) = self._lru.popitem(last=False)
+            self._lru_size -= sz
+            evicted += 1
+        return evicted
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None:
+                self._lru.move_to_end(key)
+                return hit[0]
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if (
+                len(self._touched) >= TOUCH_BATCH
+                or time.monotonic() - self._touched_at >= TOUCH_FLUSH_S
+            ):
+                self._flush_touched()
+                self._db.commit()
+            value = json.loads(zlib.decompress(row[0]))
+            self._remember(key, value, _size_of(value))
+            return value
+
+    def put(self, key: str, value: dict[str, Any]) -> int:
+        """Store `value` in both tiers; returns the number of entries evicted."""
+        size = _size_of(value)
+        with self._lock:
+            evicted = self._remember(key, value, size)
+            if self._db is None:
+                return evicted
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            self._flush_touched()  # eviction below goes by recency
+            # an upsert, not INSERT OR REPLACE: REPLACE's delete skips the size trigger
+            self._db.execute(
+                "INSERT INTO features (key, value, size, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, accessed = excluded.accessed",
+                (key, blob, len(blob), time.time()),
+            )
+            (total,) = self._db.execute("SELECT total FROM features_size").fetchone()
+            while total > self.disk_bytes:
+                victims = self._db.execute(
+                    "SELECT key, size FROM features WHERE key != ? ORDER BY accessed LIMIT ?",
+                    (key, EVICT_BATCH),
+                ).fetchall()
+                if not victims:
+                    break
+                for k, sz in victims:
+                    self._db.execute("DELETE FROM features WHERE key = ?", (k,))
+                    total -= sz
+                    evicted += 1
+                    if total <= self.disk_bytes:
+                        break
+            self._db.commit()
+            return evicted
+
+    def _flush_touched(self) -> None:
+        # caller holds the lock and commits
+        assert self._db is not None
+        if self._touched:
+            self._db.executemany(
+                "UPDATE features SET accessed = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touched_at = time.monotonic()
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._flush_touched()
+                self._db.commit()
+            self._db.close()
+            self._db = None
+
+
+_default: FeatureCache | None = None
+
+
+def get_feature_cache() -> FeatureCache:
+    """Process-wide cache under DATA_DIR (memory-only when FEATURE_CACHE_DISK_BYTES=0)."""
+    global _default
+    if _default is None:
+        _default = FeatureCache(os.path.join(DATA_DIR, "feature_cache.sqlite3"))
+    return _default
@@ -0,0 +1,206 @@
+# backend/app/core/fuzzy.py
+"""Approximate skill matching: resume terms that miss the JD only by a typo,
+spacing/punctuation or a numeronym ("k8s").
+
+A FuzzyIndex is built over a vocabulary (a JD's skills plus their aliases)
+and resolves one term at a time, in order:
+
+- squashed: equal once everything but [a-z0-9+#] is dropped ("node.js", "power bi");
+- numeronym: first letter, letter count, last letter ("k8s", "i18n"), if unambiguous;
+- spelling: bounded edit distance, `max_edits` and a minimum similarity
+  1 - distance / longer length.
+
+Spelling candidates come from a partition index (Pass-Join): every term is
+cut into SEGMENTS even pieces, and a term within k <= SEGMENTS - 1 edits of
+the query has at least one piece intact in the query, shifted by at most k.
+A lookup probes each piece of each length within k of the query's at those
+shifts, at most (2k + 1)^2 * SEGMENTS dict lookups, and verifies the
+terms found with a bit-parallel Levenshtein.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from collections.abc import Collection, Mapping
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+SEGMENTS = 3  # pieces per indexed term; bounds max_edits at SEGMENTS - 1
+FUZZY_MIN_CHARS = 4  # shorter terms ("go", "sql") only ever match exactly
+FUZZY_MAX_EDITS = int(os.environ.get("FUZZY_MAX_EDITS", "2"))
+FUZZY_MIN_SIMILARITY = float(os.environ.get("FUZZY_MIN_SIMILARITY", "0.85"))
+
+_SQUASH = re.compile(r"[^a-z0-9+#]+")
+_NUMERONYM = re.compile(r"([a-z])(\d{1,2})([a-z])")
+
+
+class FuzzySettings(NamedTuple):
+    max_edits: int = FUZZY_MAX_EDITS
+    min_similarity: float = FUZZY_MIN_SIMILARITY
+
+
+DEFAULT_FUZZY = FuzzySettings()
+
+
+class FuzzyHit(NamedTuple):
+    term: str  # canonical vocabulary term
+    similarity: float
+    via: str  # "squashed" | "numeronym" | "spelling"
+
+
+def fuzzy_settings(params: Mapping[str, Any] | None) -> FuzzySettings:
+    """FuzzySettings from params["fuzzy_max_edits"] / ["fuzzy_min_similarity"] (ValueError if bad)."""
+    params = params or {}
+    try:
+        max_edits = int(params.get("fuzzy_max_edits", FUZZY_MAX_EDITS))
+        min_similarity = float(params.get("fuzzy_min_similarity", FUZZY_MIN_SIMILARITY))
+    except (TypeError, ValueError):
+        raise ValueError("fuzzy_max_edits must be an int, fuzzy_min_similarity a number") from None
+    if not 0 <= max_edits < SEGMENTS:
+        raise ValueError(f"fuzzy_max_edits must be between 0 and {SEGMENTS - 1}")
+    if not 0.5 <= min_similarity <= 1:
+        raise ValueError("fuzzy_min_similarity must be between 0.5 and 1")
+    return FuzzySettings(max_edits, min_similarity)
+
+
+def squash(term: str) -> str:
+    return _SQUASH.sub("", term.lower())
+
+
+@lru_cache(maxsize=256)
+def _pieces(length: int) -> tuple[tuple[int, int], ...]:
+    """(start, size) of each of the SEGMENTS pieces of a term of `length`; the later ones longer."""
+    base, extra = divmod(length, SEGMENTS)
+    out, start = [], 0
+    for i in range(SEGMENTS):
+        size = base + (i >= SEGMENTS - extra)
+        out.append((start, size))
+        start += size
+    return tuple(out)
+
+
+def _numeronym(s: str) -> str | None:
+    return f"{s[0]}{len(s) - 2}{s[-1]}" if len(s) >= 4 and s.isalpha() else None
+
+
+def _peq(s: str) -> dict[str, int]:
+    """Bit mask of the positions of each character of s (for _distance)."""
+    peq: dict[str, int] = {}
+    for i, c in enumerate(s):
+        peq[c] = peq.get(c, 0) | 1 << i
+    return peq
+
+
+def _distance(peq: dict[str, int], m: int, t: str) -> int:
+    """Levenshtein distance of the m-char string behind `peq` and t (Myers' bit-vector algorithm)."""
+    mask, top = (1 << m) - 1, 1 << (m - 1)
+    pv, mv, d = mask, 0, m
+    for c in t:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & top:
+            d += 1
+        elif mh & top:
+            d -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return d
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance of a and b, or bound + 1 if it exceeds `bound`."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    if not a:
+        return len(b)
+    return min(_distance(_peq(a), len(a), b), bound + 1)
+
+
+class FuzzyIndex:
+    """Partition index over `vocabulary` ({surface form: canonical term})."""
+
+    def __init__(self, vocabulary: Mapping[str, str] | Collection[str]):
+        vocab = vocabulary if isinstance(vocabulary, Mapping) else {t: t for t in vocabulary}
+        self.terms: list[str] = []  # squashed surface forms
+        self.canonical: list[str] = []
+        self._squashed: dict[str, int] = {}
+        self._numeronyms: dict[str, list[int]] = defaultdict(list)
+        self._pieces: dict[tuple[int, int, str], list[int]] = defaultdict(list)
+        for surface, canon in vocab.items():
+            s = squash(surface)
+            if not s or s in self._squashed:
+                continue
+            i = self._squashed[s] = len(self.terms)
+            self.terms.append(s)
+            self.canonical.append(canon)
+            if (key := _numeronym(s)) is not None:
+                self._numeronyms[key].append(i)
+            if len(s) >= SEGMENTS:
+                for j, (p, size) in enumerate(_pieces(len(s))):
+                    self._pieces[len(s), j, s[p : p + size]].append(i)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def lookup(
+        self,
+        term: str,
+        settings: FuzzySettings = DEFAULT_FUZZY,
+        exclude: Collection[str] = (),
+    ) -> FuzzyHit | None:
+        """Best match for `term` among canonical terms not in `exclude`."""
+        s = squash(term)
+        i = self._squashed.get(s)
+        if i is not None:
+            return (
+                None
+                if self.canonical[i] in exclude
+                else FuzzyHit(self.canonical[i], 1.0, "squashed")
+            )
+        if _NUMERONYM.fullmatch(s):
+            found = {self.canonical[i] for i in self._numeronyms.get(s, ())} - set(exclude)
+            if len(found) == 1:
+                return FuzzyHit(found.pop(), 1.0, "numeronym")
+        return self._spelling(s, settings, exclude)
+
+    def _spelling(
+        self, s: str, settings: FuzzySettings, exclude: Collection[str]
+    ) -> FuzzyHit | None:
+        n = len(s)
+        if n < FUZZY_MIN_CHARS:
+            return None
+        # the similarity floor caps the edits: d <= (1 - min_similarity) * (n + d)
+        cap = (1 - settings.min_similarity) * n / settings.min_similarity
+        k = min(settings.max_edits, SEGMENTS - 1, int(cap + 1e-9))  # 1 - 0.8 is not quite 0.2
+        if k <= 0:
+            return None
+        found: set[int] = set()
+        for length in range(max(SEGMENTS, n - k), n + k + 1):
+            shift = n - length
+            for j, (p, size) in enumerate(_pieces(length)):
+                # piece j can only be the intact one at these offsets (multi-match-aware)
+                rest = SEGMENTS - 1 - j
+                lo = max(0, p - min(j, k), p + shift - rest)
+                hi = min(n - size, p + min(j, k), p + shift + rest)
+                for q in range(lo, hi + 1):
+                    found.update(self._pieces.get((length, j, s[q : q + size]), ()))
+        best: FuzzyHit | None = None
+        peq = _peq(s)
+        for i in sorted(found):
+            if self.canonical[i] in exclude:
+                continue
+            t = self.terms[i]
+            d = _distance(peq, n, t)
+            if d > k:
+                continue
+            sim = round(1 - d / max(n, len(t)), 3)
+            if sim >= settings.min_similarity and (best is None or sim > best.similarity):
+                best = FuzzyHit(self.canonical[i], sim, "spelling")
+        return best
@@ -3,10 +3,29 @@
 from __future__ import annotations
 
 import json
-import re
+import os
+from collections.abc import Collection, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from typing import Any
 
+import numpy as np
+
+from backend.app.core.dag import Graph, Memo, Node
+from backend.app.core.embeddings import ENCODER, cosine
+from backend.app.core.feature_cache import FeatureCache, features_key
+from backend.app.core.fuzzy import DEFAULT_FUZZY, FuzzyIndex, FuzzySettings
+from backend.app.core.lexicon import (
+    SKILL_REGEX,  # noqa: F401  (re-exported)
+    Lexicon,
+    load_lexicon,
+)
+from backend.app.core.textstream import normalize, windows
+
+# threads for independent graph nodes; 0 runs them one after another
+GRAPH_THREADS = int(os.environ.get("GRAPH_THREADS", "0"))
+
 
 @dataclass
 class GraphState:
@@ -15,12 +34,12 @@ class GraphState:
     skills_resume: list[str] = field(default_factory=list)
     skills_jd: list[str] = field(default_factory=list)
     coverage: float = 0.0
+    semantic_match: float | None = None
+    jd_embedding: np.ndarray | None = None
     scorecard: dict[str, Any] = field(default_factory=dict)
     logs: list[dict[str, Any]] = field(default_factory=list)
 
 
-SKILL_REGEX = re.compile(r"\b([A-Za-z][A-Za-z0-9\+\#\.]{1,30})\b")
-
 COMMON_STOP = {
     "and",
     "or",
@@ -67,29 +86,62 @@ ALIAS = {
     "dl": "deep learning",
     "llm": "large language model",
     "ai": "ai",
+    "machine learning": "machinelearning",
+    "large language models": "large language model",
+}
+
+# multi-word skills matched as a single term
+SKILL_PHRASES = {
+    "deep learning",
+    "large language model",
+    "natural language processing",
+    "computer vision",
+    "data science",
+    "data engineering",
+    "power bi",
+    "google cloud",
+    "rest api",
+    "unit testing",
 }
 
 
+def _default_lexicon() -> Lexicon:
+    path = os.environ.get("SKILL_LEXICON_PATH")
+    if path:
+        return load_lexicon(path)
+    return Lexicon(skills=SKILL_PHRASES, alias=ALIAS, stopwords=COMMON_STOP)
+
+
+# compiled once at import
+LEXICON = _default_lexicon()
+
+
 def _norm_text(t: str) -> str:
-    t = t.replace("\r\n", "\n")
-    t = re.sub(r"[\x00-\x08\x0B-\x1F\x7F]", " ", t)
-    return re.sub(r"\s+", " ", t).strip()
+    # control characters and whitespace runs -> one space, stripped; one pass per window
+    return "".join(normalize(windows(t)))
 
 
 def _extract_skills(text: str) -> list[str]:
-    raw = [m.group(1).lower() for m in SKILL_REGEX.finditer(text)]
-    mapped = [ALIAS.get(x, x) for x in raw]
-    dedup = []
-    for x in mapped:
-        if x in COMMON_STOP:
-            continue
-        if x.isdigit():
-            continue
-        if len(x) < 2:
-            continue
-        if x not in dedup:
-            dedup.append(x)
-    return dedup[:128]  # cap for deterministic behavior
+    return LEXICON.extract(text)
+
+
+def _document_features(
+    raw_text: str, cache: FeatureCache | None, stats: dict[str, int]
+) -> tuple[str, list[str]]:
+    """(normalized text, skills) for one document, served from `cache` when possible."""
+    if cache is None:
+        text = _norm_text(raw_text)
+        return text, _extract_skills(text)
+    key = features_key(raw_text, LEXICON.version)
+    feats = cache.get(key)
+    if feats is not None:
+        stats["hits"] += 1
+        return feats["text"], feats["skills"]
+    stats["misses"] += 1
+    text = _norm_text(raw_text)
+    skills = _extract_skills(text)
+    stats["evictions"] += cache.put(key, {"text": text, "skills": skills})
+    return text, skills
 
 
 def _coverage(a: list[str], b: list[str]) -> float:
@@ -98,66 +150,246 @@ def _coverage(a: list[str], b: list[str]) -> float:
     return round(100.0 * len(set(a) & set(b)) / len(set(b)), 1)
 
 
-def node_normalize(state: GraphState) -> GraphState:
-    state.resume_text = _norm_text(state.resume_text)
-    state.jd_text = _norm_text(state.jd_text)
-    state.logs.append({"node": "normalize_text", "ok": True})
-    return state
+# --- nodes: fn(*inputs) -> {output: value}; see core.dag
 
 
-def node_extract_skills(state: GraphState) -> GraphState:
-    state.skills_resume = _extract_skills(state.resume_text)
-    state.skills_jd = _extract_skills(state.jd_text)
-    state.logs.append(
+def _doc_features(raw: str, cache: FeatureCache | None, prefix: str) -> dict[str, Any]:
+    # normalize + extract one document; with a cache both come from it when possible
+    stats = {"hits": 0, "misses": 0, "evictions": 0}
+    text, skills = _document_features(raw, cache, stats)
+    return {f"{prefix}_text": text, f"skills_{prefix}": skills, f"{prefix}_cache": stats}
+
+
+def _trace_features(v: dict[str, Any], cached: bool) -> list[dict[str, Any]]:
+    # emitted once both documents are done, in the shape of the old two nodes
+    entries = [
+        {"node": "normalize_text", "ok": True},
         {
             "node": "extract_skills_rule_based",
-            "resume_count": len(state.skills_resume),
-            "jd_count": len(state.skills_jd),
-        }
-    )
-    return state
+            "resume_count": len(v["skills_resume"]),
+            "jd_count": len(v["skills_jd"]),
+        },
+    ]
+    if cached:
+        stats = {k: v["resume_cache"][k] + v["jd_cache"][k] for k in v["resume_cache"]}
+        entries.append({"node": "feature_cache", **stats})
+    return entries
+
 
+def node_semantic_match(resume_text: str, jd_text: str) -> dict[str, Any]:
+    resume_vec = ENCODER.encode(resume_text)
+    jd_vec = ENCODER.encode(jd_text)
+    similarity = round(100.0 * max(0.0, cosine(resume_vec, jd_vec)), 1)
+    return {"semantic_match": similarity, "jd_embedding": jd_vec}
 
-def node_score_rule_based(state: GraphState) -> GraphState:
-    cov = _coverage(state.skills_resume, state.skills_jd)
+
+def node_fuzzy_index(skills_jd: list[str]) -> dict[str, Any]:
+    # the JD's skills and every alias spelling of them; memoized, so built once per JD
+    jd = set(skills_jd)
+    vocab = {t: t for t in skills_jd}
+    vocab.update({a: c for a, c in LEXICON.alias.items() if c in jd and a not in vocab})
+    return {"jd_fuzzy_index": FuzzyIndex(vocab)}
+
+
+def node_fuzzy_match(
+    skills_resume: list[str],
+    skills_jd: list[str],
+    jd_fuzzy_index: FuzzyIndex,
+    fuzzy: FuzzySettings,
+) -> dict[str, Any]:
+    """Resume terms that match a JD skill missed by the exact overlap, best hit per JD skill."""
+    jd = set(skills_jd)
+    matched = jd.intersection(skills_resume)
+    if matched == jd:
+        return {"fuzzy_matches": []}
+    leftover = [t for t in skills_resume if t not in jd]
+    # adjacent first appearances, for a split spelling ("scikit learn" vs "scikitlearn")
+    candidates = leftover + [f"{a} {b}" for a, b in zip(leftover, leftover[1:], strict=False)]
+    best: dict[str, dict[str, Any]] = {}
+    for term in candidates:
+        hit = jd_fuzzy_index.lookup(term, fuzzy, exclude=matched)
+        if hit is None or (" " in term and hit.via != "squashed"):
+            continue
+        if hit.term not in best or hit.similarity > best[hit.term]["similarity"]:
+            best[hit.term] = {
+                "resume": term,
+                "jd": hit.term,
+                "similarity": hit.similarity,
+                "via": hit.via,
+            }
+    return {"fuzzy_matches": [best[t] for t in sorted(best)]}
+
+
+def node_score_rule_based(
+    skills_resume: list[str],
+    skills_jd: list[str],
+    semantic_match: float | None,
+    fuzzy_matches: list[dict[str, Any]],
+) -> dict[str, Any]:
+    cov = _coverage(skills_resume, skills_jd)
     # very simple dimensions
     dims = {
         "skills_match": cov,
-        "keyword_density": min(100.0, round(len(state.skills_resume) / 3, 1)),
+        "keyword_density": min(100.0, round(len(skills_resume) / 3, 1)),
         "ats_hygiene": 80.0,  # placeholder constant
     }
+    if semantic_match is not None:
+        dims["semantic_match"] = semantic_match  # reported, not (yet) weighted
     overall = round(
         0.6 * dims["skills_match"] + 0.25 * dims["keyword_density"] + 0.15 * dims["ats_hygiene"], 1
     )
-    state.coverage = cov
-    state.scorecard = {
+    scorecard = {
         "overall_score": overall,
         "dimensions": dims,
-        "coverage_terms_overlap": sorted(list(set(state.skills_resume) & set(state.skills_jd)))[
-            :25
-        ],
+        "coverage_terms_overlap": sorted(list(set(skills_resume) & set(skills_jd)))[:25],
+        # near misses, reported apart from (and not weighted into) skills_match
+        "fuzzy_matches": fuzzy_matches[:25],
+        "fuzzy_skills_match": (
+            round(cov + 100.0 * len(fuzzy_matches) / len(set(skills_jd)), 1) if skills_jd else 0.0
+        ),
     }
-    state.logs.append({"node": "score_rule_based", "coverage": cov, "overall": overall})
-    return state
+    return {"coverage": cov, "scorecard": scorecard}
 
 
-def node_build_scorecard(state: GraphState) -> GraphState:
+def node_build_scorecard(scorecard: dict[str, Any]) -> dict[str, Any]:
     # no-op here, but good place to format artifacts later
-    state.logs.append({"node": "build_scorecard", "ok": True})
-    return state
+    return {}
+
+
+@lru_cache(maxsize=8)
+def match_graph(cache: FeatureCache | None = None) -> Graph:
+    """resume and JD features run independently; scoring joins them (built once per cache)."""
+    return Graph(
+        [
+            Node(
+                "resume_features",
+                partial(_doc_features, cache=cache, prefix="resume"),
+                inputs=("resume_raw",),
+                outputs=("resume_text", "skills_resume", "resume_cache"),
+            ),
+            Node(
+                "jd_features",
+                partial(_doc_features, cache=cache, prefix="jd"),
+                inputs=("jd_raw",),
+                outputs=("jd_text", "skills_jd", "jd_cache"),
+                trace=partial(_trace_features, cached=cache is not None),
+            ),
+            Node(
+                "semantic_match",
+                node_semantic_match,
+                inputs=("resume_text", "jd_text"),
+                outputs=("semantic_match", "jd_embedding"),
+                trace=lambda v: [{"node": "semantic_match", "similarity": v["semantic_match"]}],
+                memoize=True,
+                defaults={"semantic_match": None, "jd_embedding": None},
+            ),
+            Node(
+                "jd_fuzzy_index",
+                node_fuzzy_index,
+                inputs=("skills_jd",),
+                outputs=("jd_fuzzy_index",),
+                memoize=True,
+                version=f"1-{LEXICON.version}",  # the index includes alias spellings
+            ),
+            Node(
+                "fuzzy_match",
+                node_fuzzy_match,
+                inputs=("skills_resume", "skills_jd", "jd_fuzzy_index", "fuzzy"),
+                outputs=("fuzzy_matches",),
+                trace=lambda v: [{"node": "fuzzy_match", "hits": len(v["fuzzy_matches"])}],
+                defaults={"fuzzy_matches": []},
+            ),
+            Node(
+                "score_rule_based",
+                node_score_rule_based,
+                inputs=("skills_resume", "skills_jd", "semantic_match", "fuzzy_matches"),
+                outputs=("coverage", "scorecard"),
+                trace=lambda v: [
+                    {
+                        "node": "score_rule_based",
+                        "coverage": v["coverage"],
+                        "overall": v["scorecard"]["overall_score"],
+                    }
+                ],
+            ),
+            Node(
+                "build_scorecard",
+                node_build_scorecard,
+                inputs=("scorecard",),
+                trace=lambda v: [{"node": "build_scorecard", "ok": True}],
+            ),
+        ]
+    )
+
 
+def skip_nodes(params: Mapping[str, Any] | None) -> tuple[str, ...]:
+    """params["skip_nodes"]: a list of optional nodes (ones with defaults); ValueError otherwise."""
+    skip = (params or {}).get("skip_nodes") or []
+    optional = sorted(n.name for n in match_graph().nodes if n.defaults is not None)
+    if not isinstance(skip, list) or not all(isinstance(n, str) for n in skip):
+        raise ValueError("skip_nodes must be a list of node names")
+    bad = sorted(set(skip) - set(optional))
+    if bad:
+        raise ValueError(f"skip_nodes can only name {optional}, not {bad}")
+    return tuple(skip)
 
-def run_minimal_graph(resume_text: str, jd_text: str) -> GraphState:
-    state = GraphState(resume_text=resume_text, jd_text=jd_text)
-    for step in (node_normalize, node_extract_skills, node_score_rule_based, node_build_scorecard):
-        state = step(state)
-    return state
+
+# per-process memo of node outputs (memoized nodes only), shared by every run
+GRAPH_MEMO = Memo(int(os.environ.get("GRAPH_MEMO_ENTRIES", "256")))
+
+_graph_pool: ThreadPoolExecutor | None = None
+
+
+def _graph_executor() -> ThreadPoolExecutor | None:
+    global _graph_pool
+    if GRAPH_THREADS <= 0:
+        return None
+    if _graph_pool is None:
+        _graph_pool = ThreadPoolExecutor(GRAPH_THREADS, thread_name_prefix="graph")
+    return _graph_pool
+
+
+def run_minimal_graph(
+    resume_text: str,
+    jd_text: str,
+    cache: FeatureCache | None = None,
+    skip: Collection[str] = (),
+    memo: Memo | None = None,
+    profile: bool = False,
+    trace_memory: bool = False,
+    fuzzy: FuzzySettings | None = None,
+) -> GraphState:
+    """Run the match graph; `skip` names nodes to leave out (e.g. "semantic_match").
+
+    `profile` / `trace_memory` append per-node timing (and memory) entries to the trace;
+    `fuzzy` sets the near-miss thresholds (see core.fuzzy).
+    """
+    values, trace = match_graph(cache).run(
+        {"resume_raw": resume_text, "jd_raw": jd_text, "fuzzy": fuzzy or DEFAULT_FUZZY},
+        skip=skip,
+        memo=memo,
+        executor=_graph_executor(),
+        profile=profile,
+        trace_memory=trace_memory,
+    )
+    return GraphState(
+        resume_text=values.get("resume_text", resume_text),
+        jd_text=values.get("jd_text", jd_text),
+        skills_resume=values.get("skills_resume", []),
+        skills_jd=values.get("skills_jd", []),
+        coverage=values.get("coverage", 0.0),
+        semantic_match=values.get("semantic_match"),
+        jd_embedding=values.get("jd_embedding"),
+        scorecard=values.get("scorecard", {}),
+        logs=trace,
+    )
 
 
 def scorecard_markdown(state: GraphState) -> str:
     sc = state.scorecard
     dims = sc.get("dimensions", {})
     overlap = sc.get("coverage_terms_overlap", [])
+    near = [f"{m['resume']} → {m['jd']}" for m in sc.get("fuzzy_matches", [])]
     md = [
         "# Scorecard",
         f"**Overall**: {sc.get('overall_score', 0)}/100",
@@ -166,9 +398,13 @@ def scorecard_markdown(state: GraphState) -> str:
         f"- Skills Match: {dims.get('skills_match', 0)}",
         f"- Keyword Density: {dims.get('keyword_density', 0)}",
         f"- ATS Hygiene: {dims.get('ats_hygiene', 0)}",
+        f"- Semantic Match: {dims.get('semantic_match', 0)}",
         "",
         "## Overlap Terms",
         (", ".join(overlap) if overlap else "_none_"),
+        "",
+        "## Near Matches",
+        (", ".join(near) if near else "_none_"),
     ]
     return "\n".join(md)
 
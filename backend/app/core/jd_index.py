@@ -0,0 +1,225 @@
+# backend/app/core/jd_index.py
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.app.storage.models import JobIndexDoc, JobIndexPosting
+
+K1, B = 1.2, 0.75
+RANKINGS = ("bm25", "coverage")
+
+
+class InvertedIndex:
+    """skill -> posting list of indexed JDs, with top-k BM25 / coverage retrieval.
+
+    Documents are addressed by dense positions; `run_ids[pos]` is the run that
+    carries the JD (the first one, until retention deletes it). Skills are
+    deduplicated, so term frequency is binary.
+    """
+
+    def __init__(self):
+        self.run_ids: list[str] = []
+        self.doc_ids: list[int] = []
+        self.last_doc_id = 0
+        self._lens: list[int] = []
+        self._lens_arr: np.ndarray | None = None
+        self._postings: dict[str, list[int]] = {}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._min_len: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.run_ids)
+
+    def add(self, doc_id: int, run_id: str, terms: list[str]) -> None:
+        pos = len(self.run_ids)
+        n = len(terms)
+        self.run_ids.append(run_id)
+        self.doc_ids.append(doc_id)
+        self._lens.append(n)
+        self._lens_arr = None
+        self.last_doc_id = max(self.last_doc_id, doc_id)
+        for t in set(terms):
+            self._postings.setdefault(t, []).append(pos)
+            self._arrays.pop(t, None)
+            if n < self._min_len.get(t, n + 1):
+                self._min_len[t] = n
+
+    def _posting(self, term: str) -> np.ndarray:
+        arr = self._arrays.get(term)
+        if arr is None:
+            arr = self._arrays[term] = np.asarray(self._postings[term], dtype=np.int64)
+        return arr
+
+    def _lengths(self) -> np.ndarray:
+        if self._lens_arr is None:
+            self._lens_arr = np.asarray(self._lens, dtype=np.float64)
+        return self._lens_arr
+
+    def search(
+        self, terms: list[str], k: int = 10, rank: str = "bm25", s: Session | None = None
+    ) -> list[dict[str, Any]]:
+        """Top-k JDs for a set of (resume) skills.
+
+        Terms are visited in decreasing order of their best possible contribution.
+        Once the k-th best score beats everything the remaining terms could add,
+        no unseen JD can enter the top-k; later terms then only update the
+        surviving candidates (MaxScore-style early termination).
+
+        With `s`, the hits are checked against the database: if retention deleted
+        or moved one of them, the index is reloaded and the search repeated.
+        """
+        if rank not in RANKINGS:
+            raise ValueError(f"unknown ranking {rank!r}")
+        while True:
+            hits, doc_ids = self._search(terms, k, rank)
+            if s is None:
+                return hits
+            found = s.execute(
+                select(JobIndexDoc.id, JobIndexDoc.run_id).where(JobIndexDoc.id.in_(doc_ids))
+            ).all()
+            if dict(found) == {d: h["run_id"] for d, h in zip(doc_ids, hits, strict=True)}:
+                return hits
+            self.reload(s)
+
+    def _search(
+        self, terms: list[str], k: int, rank: str
+    ) -> tuple[list[dict[str, Any]], list[int]]:
+        # (hits, their doc ids); a reload swaps in new lists, so these stay consistent
+        with self._lock:
+            run_ids, doc_ids = self.run_ids, self.doc_ids
+            n = len(run_ids)
+            query = [t for t in dict.fromkeys(terms) if t in self._postings]
+            if n == 0 or k <= 0 or not query:
+                return [], []
+            lens = self._lengths()
+            postings = {t: self._posting(t) for t in query}
+
+        if rank == "bm25":
+            avgdl = float(lens.mean()) or 1.0
+            docw = (K1 + 1) / (1 + K1 * (1 - B + B * lens / avgdl))
+            weight = {
+                t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()
+            }
+            bound = {
+                t: weight[t] * (K1 + 1) / (1 + K1 * (1 - B + B * self._min_len[t] / avgdl))
+                for t in query
+            }
+        else:
+            # share of the JD's skills covered by the resume
+            docw = 1.0 / np.maximum(lens, 1.0)
+            weight = dict.fromkeys(query, 1.0)
+            bound = {t: 1.0 / max(self._min_len[t], 1) for t in query}
+
+        order = sorted(query, key=lambda t: -bound[t])
+        total = remaining = sum(bound.values())
+        scores = np.zeros(n, dtype=np.float64)
+        hits = np.zeros(n, dtype=np.int32)
+        candidates: np.ndarray | None = None
+        # theta can't exceed the bound accumulated so far, and each O(n) check that
+        # fails defers the next one until the remaining bound has halved
+        check_below = total / 2
+        for t in order:
+            p = postings[t]
+            remaining -= bound[t]
+            if candidates is not None:
+                p = p[candidates[p]]
+            scores[p] += weight[t] * docw[p]
+            hits[p] += 1
+            if candidates is not None or remaining > check_below or n <= k:
+                continue
+            theta = np.partition(scores, n - k)[n - k]
+            if theta > remaining:
+                # anything that cannot reach theta even with every remaining term is out
+                candidates = scores + remaining + 1e-9 >= theta
+            else:
+                check_below = remaining / 2
+
+        pool = np.flatnonzero(hits) if candidates is None else np.flatnonzero(candidates)
+        if rank == "coverage":
+            scores[pool] = hits[pool] / np.maximum(lens[pool], 1.0)  # exact, no summed 1/len
+        top = pool[np.lexsort((pool, -scores[pool]))][:k]
+        top_pos = top.tolist()
+        return [
+            {
+                "run_id": run_ids[i],
+                "score": round(float(scores[i]), 4),
+                "matched_terms": int(hits[i]),
+                "jd_terms": int(lens[i]),
+            }
+            for i in top_pos
+        ], [doc_ids[i] for i in top_pos]
+
+    def reload(self, s: Session) -> None:
+        """Rebuild from the database (after JDs were deleted or moved to another run)."""
+        fresh = InvertedIndex()
+        fresh.refresh(s)
+        with self._lock:
+            for name, value in vars(fresh).items():
+                if name != "_lock":
+                    setattr(self, name, value)
+
+    def refresh(self, s: Session) -> None:
+        """Load JDs indexed (by any process) since the last refresh."""
+        latest = s.execute(select(func.max(JobIndexDoc.id))).scalar() or 0
+        if latest <= self.last_doc_id:
+            return
+        with self._lock:
+            since = self.last_doc_id
+            docs = s.execute(
+                select(JobIndexDoc.id, JobIndexDoc.run_id)
+                .where(JobIndexDoc.id > since)
+                .order_by(JobIndexDoc.id)
+            ).all()
+            terms: dict[int, list[str]] = {d.id: [] for d in docs}
+            for term, doc_id in s.execute(
+                select(JobIndexPosting.term, JobIndexPosting.doc_id).where(
+                    JobIndexPosting.doc_id > since
+                )
+            ):
+                if doc_id in terms:
+                    terms[doc_id].append(term)
+            for d in docs:
+                self.add(d.id, d.run_id, terms[d.id])
+
+
+def index_job_description(s: Session, run_id: str, jd_text: str, skills: list[str]) -> bool:
+    """Add a run's JD to the persistent index (once per distinct normalized JD).
+
+    Rows are added to the caller's transaction; they become visible with its commit.
+    Returns False when the JD was already indexed.
+    """
+    jd_hash = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    terms = list(dict.fromkeys(skills))
+    doc_id = s.execute(
+        sqlite_insert(JobIndexDoc)
+        .values(jd_hash=jd_hash, run_id=run_id, n_terms=len(terms))
+        .on_conflict_do_nothing(index_elements=["jd_hash"])
+        .returning(JobIndexDoc.id)
+    ).scalar()
+    if doc_id is None:
+        return False  # already indexed (possibly by another worker)
+    if terms:
+        s.execute(sqlite_insert(JobIndexPosting), [{"term": t, "doc_id": doc_id} for t in terms])
+    return True
+
+
+_index: InvertedIndex | None = None
+
+
+def get_job_index(s: Session) -> InvertedIndex:
+    """Process-wide index, incrementally refreshed from the database."""
+    global _index
+    if _index is None:
+        _index = InvertedIndex()
+    _index.refresh(s)
+    return _index
@@ -0,0 +1,133 @@
+# backend/app/core/lexicon.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from backend.app.core.textstream import WINDOW_CHARS, windows
+
+SKILL_REGEX = re.compile(r"\b([A-Za-z][A-Za-z0-9\+\#\.]{1,30})\b")
+
+MAX_SKILLS = 128  # cap for deterministic behavior
+
+# Trie nodes are plain dicts keyed by lowercased token; the terminal value of a
+# node lives under this key. An empty terminal means "known token, drop it".
+_END = None
+
+
+class Lexicon:
+    """Skill/alias/stopword table compiled into a token-level trie.
+
+    Every token is a skill candidate (as with the original regex extractor);
+    the trie only adds multi-word phrases, aliases and stopwords on top, so a
+    text is scanned once and each hit is deduplicated with a dict lookup.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str] = (),
+        alias: Mapping[str, str] | None = None,
+        stopwords: Iterable[str] = (),
+    ):
+        self.skills = sorted({s.lower() for s in skills})
+        self.alias = {k.lower(): v.lower() for k, v in (alias or {}).items()}
+        self.stopwords = sorted({w.lower() for w in stopwords})
+        self._stop = set(self.stopwords)
+        self._root: dict[Any, Any] = {}
+        self.max_phrase_tokens = 1
+
+        for w in self.stopwords:
+            self._insert(w, "")
+        for s in self.skills:
+            self._insert(s, self._canonical(s))
+        for k, v in self.alias.items():
+            self._insert(k, self._canonical(v))
+
+        payload = json.dumps(self.to_table(), sort_keys=True).encode("utf-8")
+        self.version = hashlib.sha256(payload).hexdigest()[:12]
+
+    def _canonical(self, term: str) -> str:
+        if term in self._stop or term.isdigit() or len(term) < 2:
+            return ""
+        return term
+
+    def _insert(self, key: str, canonical: str) -> None:
+        tokens = [t.lower() for t in SKILL_REGEX.findall(key)]
+        if not tokens:
+            return  # can never be produced by the tokenizer
+        node = self._root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node[_END] = canonical
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def to_table(self) -> dict[str, Any]:
+        return {"skills": self.skills, "alias": self.alias, "stopwords": self.stopwords}
+
+    @classmethod
+    def from_table(cls, table: Mapping[str, Any]) -> Lexicon:
+        return cls(
+            skills=table.get("skills", ()),
+            alias=table.get("alias", {}),
+            stopwords=table.get("stopwords", ()),
+        )
+
+    def extract(self, text: str, limit: int = MAX_SKILLS) -> list[str]:
+        """Return up to `limit` distinct skills in order of first appearance."""
+        return self.extract_chunks((text,), limit)
+
+    def extract_chunks(self, chunks: Iterable[str], limit: int = MAX_SKILLS) -> list[str]:
+        """`extract` over a document given as consecutive chunks, cut anywhere."""
+        # pieces end before whitespace, so each tokenizes exactly like the whole text
+        token_windows = (
+            list(map(str.lower, SKILL_REGEX.findall(piece)))
+            for piece in windows(chunks, WINDOW_CHARS)
+        )
+        root = self._root
+        keep = self.max_phrase_tokens - 1
+        found: dict[str, None] = {}
+        toks: list[str] = []
+        last = False
+        while not last:
+            nxt = next(token_windows, None)
+            if nxt is None:
+                last = True
+            else:
+                toks.extend(nxt)
+            n = len(toks)
+            # hold back a possible phrase prefix until the next window arrives
+            stop = n if last else n - keep
+            i = 0
+            while i < stop:
+                tok = toks[i]
+                node = root.get(tok)
+                if node is None:
+                    canon = tok
+                    i += 1
+                else:
+                    canon, span = node.get(_END, tok), 1
+                    j = i + 1
+                    while j < n:
+                        node = node.get(toks[j])
+                        if node is None:
+                            break
+                        j += 1
+                        if _END in node:
+                            canon, span = node[_END], j - i
+                    i += span
+                if canon and canon not in found:
+                    found[canon] = None
+                    if len(found) >= limit:
+                        return list(found)
+            del toks[:i]
+        return list(found)
+
+
+def load_lexicon(path: str) -> Lexicon:
+    """Load a lexicon table ({"skills": [...], "alias": {...}, "stopwords": [...]})."""
+    with open(path, encoding="utf-8") as f:
+        return Lexicon.from_table(json.load(f))
@@ -0,0 +1,213 @@
+# backend/app/core/metrics.py
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROFILING_KEY = "jobmatch:profiling"  # Redis copy of the runtime switches, read by workers
+PROFILING_REFRESH_S = 5.0
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+BYTES_BUCKETS = tuple(float(2**k) for k in range(10, 31, 2))  # 1 KiB .. 1 GiB
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Profiling:
+    """Runtime switches for the instrumentation (see PUT /metrics/profiling)."""
+
+    # node/HTTP/DB timing; off by default: timed traces differ per run, so never dedupe
+    enabled: bool = _env_flag("PROFILING_ENABLED", "0")
+    tracemalloc: bool = _env_flag("PROFILING_TRACEMALLOC", "0")  # per-node peak memory
+
+
+PROFILING = Profiling()
+
+
+def set_profiling(enabled: bool | None = None, tracemalloc: bool | None = None) -> Profiling:
+    if enabled is not None:
+        PROFILING.enabled = enabled
+    if tracemalloc is not None:
+        PROFILING.tracemalloc = tracemalloc
+    return PROFILING
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels; safe to observe from threads."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            s[i] += 1
+            s[-1] += value
+
+    def count(self, *labels: str) -> int:
+        s = self._series.get(labels)
+        return int(sum(s[:-1])) if s else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, s in series:
+            base = ",".join(
+                f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, labels, strict=True)
+            )
+            sep = "," if base else ""
+            acc = 0.0
+            for le, c in zip((*self.buckets, "+Inf"), s[:-1], strict=True):
+                acc += c
+                yield f'{self.name}_bucket{{{base}{sep}le="{le}"}} {acc:g}'
+            braces = f"{{{base}}}" if base else ""
+            yield f"{self.name}_sum{braces} {s[-1]:.6g}"
+            yield f"{self.name}_count{braces} {acc:g}"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+NODE_SECONDS = Histogram("jobmatch_graph_node_seconds", "Graph node wall time", ("node",))
+NODE_CPU_SECONDS = Histogram("jobmatch_graph_node_cpu_seconds", "Graph node CPU time", ("node",))
+NODE_PEAK_BYTES = Histogram(
+    "jobmatch_graph_node_peak_bytes",
+    "Graph node tracemalloc peak",
+    ("node",),
+    buckets=BYTES_BUCKETS,
+)
+HTTP_SECONDS = Histogram(
+    "jobmatch_http_request_seconds", "HTTP request latency", ("method", "route", "status")
+)
+DB_SECONDS = Histogram("jobmatch_db_query_seconds", "SQLite statement time", ("statement",))
+JOB_SECONDS = Histogram(
+    "jobmatch_job_seconds",
+    "Run execution time, start to finish",
+    ("kind", "status"),
+    buckets=LATENCY_BUCKETS + (30.0, 120.0, 600.0),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "jobmatch_queue_wait_seconds",
+    "Enqueue to compute slot, per queue",
+    ("queue",),
+    buckets=LATENCY_BUCKETS + (30.0, 120.0, 600.0),
+)
+
+REGISTRY = (
+    NODE_SECONDS,
+    NODE_CPU_SECONDS,
+    NODE_PEAK_BYTES,
+    HTTP_SECONDS,
+    DB_SECONDS,
+    JOB_SECONDS,
+    QUEUE_WAIT_SECONDS,
+)
+
+
+def render() -> str:
+    return "\n".join(line for h in REGISTRY for line in h.render()) + "\n"
+
+
+def observe_trace(logs: Iterable[dict[str, Any]]) -> None:
+    """Feed the profile entries of a graph trace into the node histograms.
+
+    Nodes may run in another process; their timings travel back in the trace.
+    """
+    for e in logs:
+        if e.get("node") != "profile":
+            continue
+        NODE_SECONDS.observe(e["wall_ms"] / 1000, e["target"])
+        NODE_CPU_SECONDS.observe(e["cpu_ms"] / 1000, e["target"])
+        if e.get("peak_bytes") is not None:
+            NODE_PEAK_BYTES.observe(e["peak_bytes"], e["target"])
+
+
+def statement_kind(sql: str) -> str:
+    # first keyword only: bounded label cardinality
+    head = sql.lstrip().split(None, 1)
+    return head[0].upper() if head else "?"
+
+
+# monotonic time of this process' last read of PROFILING_KEY; module state, because
+# ARQ hands every job its own copy of ctx
+_profiling_read_at: float | None = None
+
+
+async def load_profiling(redis: Any) -> Profiling:
+    """Worker side: the switches as last stored in Redis, re-read every PROFILING_REFRESH_S."""
+    global _profiling_read_at
+    now = time.monotonic()
+    if _profiling_read_at is None or now - _profiling_read_at >= PROFILING_REFRESH_S:
+        _profiling_read_at = now
+        try:
+            raw = await redis.get(PROFILING_KEY)
+            if raw:
+                set_profiling(**{k: bool(v) for k, v in json.loads(raw).items()})
+        except Exception:
+            log.warning("could not read profiling switches", exc_info=True)
+    return PROFILING
+
+
+async def store_profiling(redis: Any) -> None:
+    await redis.set(PROFILING_KEY, json.dumps(asdict(PROFILING)))
+
+
+async def serve_metrics(host: str, port: int) -> asyncio.AbstractServer:
+    """Minimal HTTP endpoint for processes without a web app (the ARQ worker)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # skip headers
+            path = request.split()[1] if len(request.split()) > 1 else b""
+            if path.split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,214 @@
+# backend/app/core/offline.py
+"""Offline bulk scoring: resume/JD pairs from a file straight through the match graph.
+
+No API, queue or database. Input is JSONL or CSV (by suffix), read one
+record at a time; each record carries `resume_text` / `jd_text` inline or
+`resume_path` / `jd_path` (a manifest; relative paths are resolved against
+the input file's directory and read by the compute process), plus an
+optional `id`. Records are scored in chunks on a process pool with at most
+a few chunks in flight, and one JSON line per record is appended to the
+output in input order: {"offset", "id", "scorecard"} or {"offset", "id", "error"}
+(a JSONL line that is not a JSON object is such an error, not the end of the run).
+
+No database either: the feature cache is memory-only unless `feature_cache`
+names a SQLite file for its disk tier; the service's cache under DATA_DIR is
+never opened.
+
+After every chunk a checkpoint (<output>.offset) records how many records
+are done and how long the output was at that point. A rerun with the same
+arguments truncates anything written after the checkpoint and resumes at
+that offset, so every record is written exactly once.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from backend.app.core.feature_cache import FeatureCache
+from backend.app.core.graph import skip_nodes
+from backend.app.core.run_manager import compute_match
+
+SCORE_CHUNK = int(os.environ.get("SCORE_CHUNK", "32"))  # records per task
+SCORE_INFLIGHT = 2  # chunks queued per process: keeps the pool busy, memory bounded
+CSV_FIELD_LIMIT = 16 * 1024 * 1024  # a 2M-char document is larger than csv's default
+
+
+@dataclass
+class ScoreStats:
+    resumed_at: int = 0  # records done by earlier runs
+    scored: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def pairs_per_s(self) -> float:
+        return (self.scored + self.failed) / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        out = {**asdict(self), "seconds": round(self.seconds, 2)}
+        return {**out, "pairs_per_s": round(self.pairs_per_s, 1)}
+
+
+def checkpoint_path(out: Path) -> Path:
+    return out.with_name(out.name + ".offset")
+
+
+# a record, or the error of an input line that is not one (reported in its place)
+Record = dict[str, Any] | ValueError
+
+
+def _records(src: Path) -> Iterator[Record]:
+    if src.suffix.lower() == ".csv":
+        csv.field_size_limit(CSV_FIELD_LIMIT)
+        with src.open(newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+        return
+    with src.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield e
+                continue
+            yield record if isinstance(record, dict) else ValueError("not a JSON object")
+
+
+def iter_pairs(src: Path, start: int = 0) -> Iterator[tuple[int, Record]]:
+    """(offset, record) from `start` on; manifest paths made absolute."""
+    base = src.resolve().parent
+    for offset, record in enumerate(_records(src)):
+        if offset < start:
+            continue
+        if isinstance(record, dict):
+            for key in ("resume_path", "jd_path"):
+                if record.get(key):
+                    record[key] = str(base / record[key])
+        yield offset, record
+
+
+def _text(record: dict[str, Any], name: str) -> str:
+    if record.get(f"{name}_text"):
+        return record[f"{name}_text"]
+    if record.get(f"{name}_path"):
+        return Path(record[f"{name}_path"]).read_text(encoding="utf-8")
+    raise ValueError(f"missing {name}_text / {name}_path")
+
+
+_caches: dict[str | None, FeatureCache] = {}  # per compute process, by disk path
+
+
+def _feature_cache(path: str | None) -> FeatureCache:
+    cache = _caches.get(path)
+    if cache is None:
+        cache = _caches[path] = FeatureCache(path)
+    return cache
+
+
+def _score_chunk(
+    chunk: list[tuple[int, Record]], skip: tuple[str, ...], cache_path: str | None
+) -> tuple[list[str], int]:
+    """(output lines, failures); runs in a compute process, so the parent only writes."""
+    params = {"skip_nodes": list(skip)}
+    cache = _feature_cache(cache_path)
+    lines = []
+    failed = 0
+    for offset, record in chunk:
+        out: dict[str, Any] = {"offset": offset, "id": str(offset)}
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            out["id"] = record.get("id") or out["id"]
+            resume, jd = _text(record, "resume"), _text(record, "jd")
+            state = compute_match(
+                resume, jd, params, profile=False, trace_memory=False, cache=cache
+            )
+            out["scorecard"] = state.scorecard
+        except Exception as e:
+            out["error"] = f"{type(e).__name__}: {e}"
+            failed += 1
+        lines.append(json.dumps(out, ensure_ascii=False) + "\n")
+    return lines, failed
+
+
+def _load_checkpoint(path: Path, src: Path) -> tuple[int, int]:
+    """(records done, output bytes) from an earlier run on the same input."""
+    if not path.exists():
+        return 0, 0
+    cp = json.loads(path.read_text())
+    if cp["input"] != str(src.resolve()):
+        raise ValueError(f"{path} belongs to {cp['input']}; pass --restart to start over")
+    out = path.with_name(path.name.removesuffix(".offset"))
+    if not out.exists() or out.stat().st_size < cp["output_bytes"]:
+        raise ValueError(f"{out} is shorter than its checkpoint; pass --restart to start over")
+    return cp["offset"], cp["output_bytes"]
+
+
+def _save_checkpoint(path: Path, src: Path, offset: int, output_bytes: int) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    cp = {"input": str(src.resolve()), "offset": offset, "output_bytes": output_bytes}
+    tmp.write_text(json.dumps(cp))
+    os.replace(tmp, path)  # never a half-written checkpoint
+
+
+def score_file(
+    src: Path,
+    out: Path,
+    pool: Executor,
+    processes: int,
+    chunk: int = SCORE_CHUNK,
+    skip: tuple[str, ...] = (),
+    feature_cache: Path | None = None,
+    restart: bool = False,
+    progress: Callable[[ScoreStats], None] | None = None,
+    progress_every_s: float = 10.0,
+) -> ScoreStats:
+    """Score every pair in `src` on `pool` (`processes` wide) into `out`.
+
+    `feature_cache` is a SQLite file for the feature cache (memory-only without one).
+    """
+    skip_nodes({"skip_nodes": list(skip)})  # a bad name would fail every record
+    cache_path = str(feature_cache) if feature_cache is not None else None
+    cp_path = checkpoint_path(out)
+    start, size = (0, 0) if restart else _load_checkpoint(cp_path, src)
+    stats = ScoreStats(resumed_at=start)
+    t0 = last_report = time.perf_counter()
+    pairs = iter_pairs(src, start)
+    pending: deque[Future[tuple[list[str], int]]] = deque()
+    offset = start
+    with out.open("a+b" if start else "wb") as f:
+        f.truncate(size)  # drop lines written after the last checkpoint
+        f.seek(size)
+        while True:
+            while len(pending) < processes * SCORE_INFLIGHT:
+                batch = list(islice(pairs, chunk))
+                if not batch:
+                    break
+                pending.append(pool.submit(_score_chunk, batch, skip, cache_path))
+            if not pending:
+                break
+            lines, failed = pending.popleft().result()
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            stats.scored += len(lines) - failed
+            stats.failed += failed
+            offset += len(lines)
+            _save_checkpoint(cp_path, src, offset, f.tell())
+            now = time.perf_counter()
+            stats.seconds = now - t0
+            if progress is not None and now - last_report >= progress_every_s:
+                progress(stats)
+                last_report = now
+    stats.seconds = time.perf_counter() - t0
+    return stats
@@ -1,24 +1,211 @@
 # backend/app/core/queue.py
+import asyncio
+import functools
+import logging
+import multiprocessing
 import os
+import signal
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import UTC
+from typing import Any
 
-from arq import create_pool
-from arq.connections import RedisSettings
+from arq import Worker, cron
+from arq.connections import ArqRedis, RedisSettings, create_pool
+from arq.constants import default_queue_name, job_key_prefix, result_key_prefix
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms
 
-from backend.app.core.run_manager import RunManager
+from backend.app.core.embeddings import ENCODER, get_vector_store
+from backend.app.core.events import StatusPublisher
+from backend.app.core.feature_cache import get_feature_cache
+from backend.app.core.metrics import (
+    JOB_SECONDS,
+    PROFILING,
+    QUEUE_WAIT_SECONDS,
+    load_profiling,
+    serve_metrics,
+)
+from backend.app.core.run_manager import (
+    RunManager,
+    compute_batch,
+    compute_match,
+    set_status_notifier,
+)
+from backend.app.core.scheduling import FairGate
 from backend.app.storage.db import ensure_dirs, get_session
 from backend.app.storage.models import Run, RunStatus
+from backend.app.storage.retention import sweep
+
+log = logging.getLogger(__name__)
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://host.docker.internal:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", "32"))
+WORKER_PROCESSES = int(os.environ.get("WORKER_PROCESSES", str(os.cpu_count() or 1)))
+# per-job timeout: base + per million chars of resume + JD text, capped
+JOB_TIMEOUT_BASE_S = float(os.environ.get("JOB_TIMEOUT_BASE_S", "30"))
+JOB_TIMEOUT_PER_MB_S = float(os.environ.get("JOB_TIMEOUT_PER_MB_S", "60"))
+JOB_TIMEOUT_MAX_S = float(os.environ.get("JOB_TIMEOUT_MAX_S", "1800"))
+# a running run this long past its job timeout is presumed orphaned and may be taken over
+ORPHAN_GRACE_S = float(os.environ.get("RUN_ORPHAN_GRACE_S", "120"))
+# Prometheus text endpoint of the worker process; 0 disables it
+WORKER_METRICS_HOST = os.environ.get("WORKER_METRICS_HOST", "0.0.0.0")
+WORKER_METRICS_PORT = int(os.environ.get("WORKER_METRICS_PORT", "9100"))
+# retention sweep (see storage.retention), hourly at this minute; -1 disables it
+RETENTION_SWEEP_MINUTE = int(os.environ.get("RETENTION_SWEEP_MINUTE", "17"))
+RETENTION_SWEEP_MAX_BATCHES = int(os.environ.get("RETENTION_SWEEP_MAX_BATCHES", "200"))
+# JD vector IVF rebuild check (see VectorStore.maybe_build_ivf), every N minutes; 0 disables it
+IVF_BUILD_EVERY_MIN = int(os.environ.get("VECTOR_IVF_BUILD_EVERY_MIN", "5"))
+
+
+def _per_queue(name: str, default: str) -> dict[str, float]:
+    # "interactive=6,bulk=3,oversized=1"
+    pairs = (item.split("=", 1) for item in os.environ.get(name, default).split(",") if item)
+    return {k.strip(): float(v) for k, v in pairs}
+
+
+# Runs are routed by resume + JD size, so a burst of large payloads cannot hold
+# up small interactive ones (see route_queue). Interactive keeps ARQ's default
+# queue name: jobs enqueued before the split, and `arq ...WorkerSettings`, still work.
+QUEUES = {
+    "interactive": default_queue_name,
+    "bulk": "arq:queue:bulk",
+    "oversized": "arq:queue:oversized",
+}
+PRIORITIES = ("interactive", "bulk")  # accepted in params["priority"]
+INTERACTIVE_MAX_CHARS = int(os.environ.get("QUEUE_INTERACTIVE_MAX_CHARS", "100000"))
+OVERSIZED_MIN_CHARS = int(os.environ.get("QUEUE_OVERSIZED_MIN_CHARS", "1000000"))
+# share of compute slots under contention, and jobs in flight per queue
+QUEUE_WEIGHTS = _per_queue("QUEUE_WEIGHTS", "interactive=6,bulk=3,oversized=1")
+QUEUE_MAX_JOBS = {
+    q: int(n) for q, n in _per_queue("QUEUE_MAX_JOBS", "interactive=8,bulk=4,oversized=1").items()
+}
+
+
+def create_redis_pool() -> ArqRedis:
+    """One connection pool for the lifetime of the API process.
+
+    Unlike arq's create_pool() this does not ping: connections are opened on
+    first use, so the API starts (and tests run) without Redis.
+    """
+    return ArqRedis.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
+
+
+def job_id(run_id: str) -> str:
+    # one ARQ job per run: enqueueing a run that already has a job is a no-op
+    return f"run:{run_id}"
+
+
+def priority_of(params: Mapping[str, Any] | None) -> str | None:
+    """The caller's params["priority"], validated (ValueError if unknown)."""
+    priority = (params or {}).get("priority")
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {list(PRIORITIES)}")
+    return priority
+
+
+def route_queue(chars: int, priority: str | None = None) -> str:
+    """Queue name for a run of `chars` resume + JD characters.
+
+    Oversized payloads always get their own queue; below that an explicit
+    priority wins, and otherwise size decides between interactive and bulk.
+    """
+    if chars >= OVERSIZED_MIN_CHARS:
+        return QUEUES["oversized"]
+    if priority is not None:
+        return QUEUES[priority]
+    return QUEUES["interactive" if chars <= INTERACTIVE_MAX_CHARS else "bulk"]
+
+
+async def queue_stats(redis: ArqRedis) -> dict[str, tuple[int, float | None]]:
+    """{queue: (depth, seconds the oldest job has waited)} in one round trip.
+
+    Deferred jobs (e.g. inline-run fallbacks) only count once they are due.
+    """
+    now = timestamp_ms()
+    async with redis.pipeline(transaction=False) as pipe:
+        for queue_name in QUEUES.values():
+            pipe.zcount(queue_name, "-inf", now)
+            pipe.zrange(queue_name, 0, 0, withscores=True)
+        replies = await pipe.execute()
+    out: dict[str, tuple[int, float | None]] = {}
+    for i, name in enumerate(QUEUES):
+        depth, head = replies[2 * i], replies[2 * i + 1]
+        # scores are enqueue (or defer-until) times in ms
+        out[name] = (depth, max(0.0, (now - head[0][1]) / 1000) if depth else None)
+    return out
+
+
+async def enqueue_run(
+    redis: ArqRedis,
+    run_id: str,
+    chars: int = 0,
+    priority: str | None = None,
+    defer_by: float | None = None,
+    takeover: bool = False,
+):
+    """Queue a run_match_job; `takeover` makes it the fallback of an inline run (see _start_run)."""
+    await redis.enqueue_job(
+        "run_match_job",
+        run_id=run_id,
+        takeover=takeover,
+        _job_id=job_id(run_id),
+        _queue_name=route_queue(chars, priority),
+        _defer_by=defer_by,
+    )
+
+
+async def enqueue_batch_run(
+    redis: ArqRedis, run_id: str, chars: int = 0, priority: str | None = None
+):
+    await redis.enqueue_job(
+        "run_batch_job",
+        run_id=run_id,
+        _job_id=job_id(run_id),
+        _queue_name=route_queue(chars, priority),
+    )
 
 
-async def enqueue_run(run_id: str):
-    redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
-    await redis.enqueue_job("run_match_job", run_id=run_id)
+async def enqueue_runs_bulk(
+    redis: ArqRedis, run_ids: list[str], queues: Mapping[str, str] | None = None
+) -> int:
+    """Enqueue a run_match_job per run in a single MULTI/EXEC round trip.
 
+    Writes the same keys as ArqRedis.enqueue_job (job payload + queue entry),
+    on the queue `queues[run_id]` (see route_queue; the default queue if absent).
+    Like enqueue_job, skips runs whose job is already queued or has a kept result.
+    Returns the number of jobs enqueued.
+    """
+    ids = {run_id: job_id(run_id) for run_id in run_ids}
+    if not ids:
+        return 0
+    async with redis.pipeline(transaction=False) as pipe:
+        for jid in ids.values():
+            pipe.exists(job_key_prefix + jid, result_key_prefix + jid)
+        found = await pipe.execute()
+    todo = [(run_id, jid) for (run_id, jid), n in zip(ids.items(), found, strict=True) if not n]
+    if not todo:
+        return 0
+    now = timestamp_ms()
+    async with redis.pipeline(transaction=True) as pipe:
+        for run_id, jid in todo:
+            job = serialize_job(
+                "run_match_job", (), {"run_id": run_id}, None, now, serializer=redis.job_serializer
+            )
+            pipe.set(job_key_prefix + jid, job, px=redis.expires_extra_ms, nx=True)
+            queue = (queues or {}).get(run_id, redis.default_queue_name)
+            pipe.zadd(queue, {jid: now}, nx=True)
+        await pipe.execute()
+    return len(todo)
 
-async def run_match_job(ctx, run_id: str):
+
+def _run_job(run_id: str, batch: bool = False):
     ensure_dirs()
-    # Do all heavy work here (worker process with its own loop)
+    # Everything inline in one session; the worker uses _run_job_async instead
     with get_session() as s:
         run = s.get(Run, run_id)
         if not run:
@@ -27,16 +214,307 @@ async def run_match_job(ctx, run_id: str):
             return
         mgr = RunManager(s, run)
         try:
-            mgr.execute()
+            if batch:
+                mgr.execute_batch()
+            else:
+                mgr.execute()
         except Exception as e:
-            run.status = RunStatus.failed
-            run.error = str(e)
-            s.add(run)
-            s.commit()
+            s.rollback()
+            mgr.fail(str(e))
+
+
+def _init_compute_process(feature_cache: bool = True):
+    # pay for lexicon compilation, encoder and cache setup once per process, not per job
+    from backend.app.core.graph import LEXICON
+
+    LEXICON.extract("warm up")
+    ENCODER.encode("warm up")
+    if feature_cache:
+        get_feature_cache()
+
+
+def _process_pool(processes: int, feature_cache: bool = True) -> Executor:
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),  # the worker loop has threads
+        initializer=_init_compute_process,
+        initargs=(feature_cache,),
+    )
+
+
+class ComputePool(Executor):
+    """A process pool that replaces itself once a child died (e.g. OOM-killed).
+
+    A dead child breaks a ProcessPoolExecutor for good, and ARQ hands each job
+    a shallow copy of ctx, so reassigning ctx["compute_pool"] would not reach
+    later jobs: the replacement happens inside this shared object instead. The
+    jobs that were running when the child died still fail.
+    """
+
+    def __init__(self, processes: int, factory: Callable[[int], Executor] = _process_pool):
+        self.processes = processes
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._executor = factory(processes)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            # broken before a done-callback below noticed
+            executor = self._replace(executor)
+            future = executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(functools.partial(self._check, executor))
+        return future
+
+    def _check(self, executor: Executor, future: Future) -> None:
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._replace(executor)
+
+    def _replace(self, broken: Executor) -> Executor:
+        with self._lock:
+            if self._executor is broken:  # once, however many of its jobs failed
+                self._executor = self._factory(self.processes)
+                broken.shutdown(wait=False, cancel_futures=True)
+            return self._executor
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def create_compute_pool(processes: int = WORKER_PROCESSES, feature_cache: bool = True) -> Executor:
+    """Executor for the CPU-bound graph; a single thread when `processes` <= 0.
+
+    With `feature_cache=False` the processes do not open the shared feature cache
+    up front (offline scoring brings its own).
+    """
+    if processes <= 0:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="compute")
+    return ComputePool(processes, functools.partial(_process_pool, feature_cache=feature_cache))
+
+
+def job_timeout_for(payload_chars: int) -> float:
+    return min(JOB_TIMEOUT_MAX_S, JOB_TIMEOUT_BASE_S + JOB_TIMEOUT_PER_MB_S * payload_chars / 1e6)
+
+
+def orphaned_after(chars: int) -> float:
+    """Seconds after which a run still `running` has certainly lost its executor."""
+    return job_timeout_for(chars) + ORPHAN_GRACE_S
+
+
+def _start_run(run_id: str, takeover: bool = False) -> tuple[str, str, dict] | None:
+    """Mark the run running and load its inputs; None if it is not this job's to run.
+
+    A `takeover` job (an inline run's fallback) never restarts a failed run: its
+    error came from the inline execution and stays the run's outcome.
+    """
+    ensure_dirs()
+    startable = (RunStatus.queued, RunStatus.running)
+    with get_session() as s:
+        run = s.get(Run, run_id)
+        if not run or run.status not in (startable if takeover else (*startable, RunStatus.failed)):
+            return None
+        resume_text, jd_text = run.resume_text, run.jd_text
+        if run.status == RunStatus.running:
+            # only take over a run whose own timeout would have ended it long ago, e.g.
+            # an inline run whose API process died (see routes._run_inline)
+            assert run.started_at is not None
+            age = time.time() - run.started_at.replace(tzinfo=UTC).timestamp()
+            if age < orphaned_after(len(resume_text) + len(jd_text)):
+                return None
+        RunManager(s, run).start()
+        return resume_text, jd_text, run.params or {}
+
+
+def _finish_run(run_id: str, result: Any, batch: bool) -> None:
+    with get_session() as s:
+        run = s.get(Run, run_id)
+        assert run is not None
+        mgr = RunManager(s, run)
+        try:
+            if batch:
+                mgr.finish_batch(result)
+            else:
+                mgr.finish(result)
+        except Exception as e:
+            s.rollback()
+            mgr.fail(str(e))
+
+
+def _fail_run(run_id: str, error: str) -> None:
+    with get_session() as s:
+        run = s.get(Run, run_id)
+        if run:
+            RunManager(s, run).fail(error)
+
+
+async def _run_job_async(ctx, run_id: str, batch: bool = False, takeover: bool = False):
+    """DB and artifact I/O in threads, the graph itself in the compute pool.
+
+    `ctx` is ARQ's worker context, or any dict holding a "compute_pool" (the
+    API's inline path). A timed-out computation cannot be interrupted; the run is failed and the
+    process finishes (and discards) it in the background. Under run_workers the job first
+    waits for its queue's turn at the shared FairGate.
+    """
+    gate: FairGate | None = ctx.get("gate")
+    queue = ctx.get("queue", "interactive")
+    slot: AbstractAsyncContextManager[None] = gate.slot(queue) if gate else nullcontext()
+    async with slot:
+        await _execute(ctx, run_id, batch, queue, takeover)
+
+
+async def _execute(
+    ctx, run_id: str, batch: bool, queue: str = "interactive", takeover: bool = False
+) -> None:
+    loaded = await asyncio.to_thread(_start_run, run_id, takeover)
+    if loaded is None:
+        return
+    if "score" in ctx:  # ARQ: when the job became due, its enqueue time unless deferred
+        QUEUE_WAIT_SECONDS.observe(time.time() - ctx["score"] / 1000, queue)
+    started = time.perf_counter()
+    kind = "batch" if batch else "match"
+    resume_text, jd_text, params = loaded
+    timeout = job_timeout_for(len(resume_text) + len(jd_text))
+    # the worker follows switches flipped on the API (PUT /metrics/profiling)
+    prof = await load_profiling(ctx["redis"]) if "redis" in ctx else PROFILING
+    call: Callable[[], Any]
+    if batch:
+        call = functools.partial(compute_batch, resume_text, jd_text, params)
+    else:
+        call = functools.partial(
+            compute_match, resume_text, jd_text, params, prof.enabled, prof.tracemalloc
+        )
+    loop = asyncio.get_running_loop()
+    error: str | None = None
+    try:
+        result = await asyncio.wait_for(loop.run_in_executor(ctx["compute_pool"], call), timeout)
+    except TimeoutError:
+        error = f"timed out after {timeout:.0f}s"
+    except BrokenProcessPool as e:
+        # a child died (e.g. OOM-killed); ComputePool has already replaced it
+        error = f"compute process died: {e}"
+    except Exception as e:
+        error = str(e)
+    if error is None:
+        await asyncio.to_thread(_finish_run, run_id, result, batch)
+    else:
+        await asyncio.to_thread(_fail_run, run_id, error)
+    JOB_SECONDS.observe(
+        time.perf_counter() - started, kind, "succeeded" if error is None else "failed"
+    )
+
+
+async def startup(ctx):
+    ctx["compute_pool"] = create_compute_pool()
+    # one slot per compute process, shared by the per-queue consumers of run_workers
+    ctx["gate"] = FairGate(max(1, WORKER_PROCESSES), QUEUE_WEIGHTS)
+    # status changes reach API waiters (SSE / long-poll) through Redis pub/sub
+    set_status_notifier(StatusPublisher.from_url(REDIS_URL))
+    if WORKER_METRICS_PORT > 0:
+        try:
+            ctx["metrics_server"] = await serve_metrics(WORKER_METRICS_HOST, WORKER_METRICS_PORT)
+        except OSError as e:
+            # e.g. a second worker on this host: it runs jobs without its own endpoint
+            log.warning("worker metrics endpoint disabled: %s", e)
+
+
+async def shutdown(ctx):
+    set_status_notifier(None)
+    if "metrics_server" in ctx:
+        ctx["metrics_server"].close()
+    ctx["compute_pool"].shutdown(wait=True, cancel_futures=True)
+
+
+async def run_match_job(ctx, run_id: str, takeover: bool = False):
+    await _run_job_async(ctx, run_id, takeover=takeover)
+
+
+async def run_batch_job(ctx, run_id: str):
+    # one job for the whole N x M grid instead of a queue round-trip per pair
+    await _run_job_async(ctx, run_id, batch=True)
+
+
+def _sweep() -> dict:
+    ensure_dirs()
+    with get_session() as s:
+        return sweep(s, max_batches=RETENTION_SWEEP_MAX_BATCHES).as_dict()
+
+
+async def retention_job(ctx):
+    # a bounded amount of work per tick; a backlog drains over the next ones
+    return await asyncio.to_thread(_sweep)
+
+
+async def ivf_job(ctx):
+    # k-means over the JD vectors, kept out of the jobs that append them
+    return await asyncio.to_thread(get_vector_store().maybe_build_ivf)
 
 
 class WorkerSettings:
     redis_settings = RedisSettings.from_dsn(REDIS_URL)
-    functions = [run_match_job]
+    functions = [run_match_job, run_batch_job]
+    # unique: one run per tick however many workers run
+    cron_jobs = (
+        [cron(retention_job, minute=RETENTION_SWEEP_MINUTE, unique=True)]
+        if RETENTION_SWEEP_MINUTE >= 0
+        else []
+    ) + (
+        [cron(ivf_job, minute=set(range(0, 60, IVF_BUILD_EVERY_MIN)), unique=True)]
+        if IVF_BUILD_EVERY_MIN > 0
+        else []
+    )
+    on_startup = startup
+    on_shutdown = shutdown
     max_jobs = 10
+    job_timeout = JOB_TIMEOUT_MAX_S + 60  # ours fires first and records the failure
     retry_jobs = True
+
+
+async def run_workers(queues: Mapping[str, str] = QUEUES) -> None:
+    """Consume every queue in one process: an ARQ Worker per queue (ARQ polls
+    a single queue per Worker), each capped at QUEUE_MAX_JOBS, sharing one Redis
+    pool, one compute pool and the FairGate that splits it by QUEUE_WEIGHTS.
+    """
+    redis = await create_pool(WorkerSettings.redis_settings)
+    shared: dict[str, Any] = {"redis": redis}
+    await startup(shared)
+    workers = [
+        Worker(
+            functions=WorkerSettings.functions,
+            queue_name=queue_name,
+            # cron jobs are unique per tick anyway; schedule them from one consumer
+            cron_jobs=WorkerSettings.cron_jobs if name == "interactive" else None,
+            redis_pool=redis,
+            ctx={**shared, "queue": name},
+            max_jobs=QUEUE_MAX_JOBS.get(name, WorkerSettings.max_jobs),
+            job_timeout=WorkerSettings.job_timeout,
+            retry_jobs=WorkerSettings.retry_jobs,
+            handle_signals=False,
+        )
+        for name, queue_name in queues.items()
+    ]
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    tasks = [asyncio.ensure_future(w.async_run()) for w in workers]
+    stopped = asyncio.ensure_future(stop.wait())
+    try:
+        await asyncio.wait([*tasks, stopped], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # what Worker.close does, minus closing the shared pool once per worker
+        for w in workers:
+            w.handle_sig(signal.SIGTERM)
+        stopped.cancel()
+        jobs = [t for w in workers for t in w.tasks.values()]
+        done = await asyncio.gather(*tasks, *jobs, stopped, return_exceptions=True)
+        await redis.delete(*(w.health_check_key for w in workers))
+        await shutdown(shared)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+        await redis.aclose()
+    # a consumer that crashed (e.g. lost Redis) takes the process down with it
+    for result in done[: len(tasks)]:
+        if isinstance(result, Exception):
+            raise result
@@ -3,20 +3,83 @@
 from __future__ import annotations
 
 import datetime
+import json
+from collections.abc import Callable
+from typing import Any
 
 from sqlalchemy.orm import Session
 
-from backend.app.core.graph import run_minimal_graph, scorecard_markdown, trace_jsonl
-from backend.app.storage.artifacts import write_artifact
+from backend.app.core.batch import batch_top_k, score_batch
+from backend.app.core.embeddings import get_vector_store
+from backend.app.core.feature_cache import FeatureCache, get_feature_cache
+from backend.app.core.fuzzy import fuzzy_settings
+from backend.app.core.graph import (
+    GRAPH_MEMO,
+    GraphState,
+    run_minimal_graph,
+    scorecard_markdown,
+    skip_nodes,
+    trace_jsonl,
+)
+from backend.app.core.jd_index import index_job_description
+from backend.app.core.metrics import PROFILING, observe_trace
+from backend.app.storage.artifacts import ArtifactBatch
 from backend.app.storage.models import Run, RunStatus
 
+# Called as notify(run_id, status, error) after every committed status change;
+# the worker installs a Redis publisher (events.StatusPublisher).
+StatusNotifier = Callable[[str, str, str | None], None]
+_notifier: StatusNotifier | None = None
+
+
+def set_status_notifier(fn: StatusNotifier | None) -> None:
+    global _notifier
+    _notifier = fn
+
+
+def compute_match(
+    resume_text: str,
+    jd_text: str,
+    params: dict | None = None,
+    profile: bool | None = None,
+    trace_memory: bool | None = None,
+    cache: FeatureCache | None = None,
+) -> GraphState:
+    """CPU-bound half of a match run; picklable in and out, so it can run in a worker process.
+
+    `params["skip_nodes"]` lists optional graph nodes to leave out (e.g. ["semantic_match"]);
+    `params["fuzzy_max_edits"]` / `["fuzzy_min_similarity"]` tune near-miss skill matching.
+    Profiling defaults to this process' switches; pass them when calling into another process.
+    `cache` replaces the process-wide feature cache.
+    """
+    return run_minimal_graph(
+        resume_text,
+        jd_text,
+        cache=get_feature_cache() if cache is None else cache,
+        skip=skip_nodes(params),
+        memo=GRAPH_MEMO,
+        profile=PROFILING.enabled if profile is None else profile,
+        trace_memory=PROFILING.tracemalloc if trace_memory is None else trace_memory,
+        fuzzy=fuzzy_settings(params),
+    )
+
+
+def compute_batch(resume_json: str, jd_json: str, params: dict | None = None) -> dict[str, Any]:
+    """CPU-bound half of a batch run; `params["top_k"]` keeps only the best pairs."""
+    return score_batch(
+        json.loads(resume_json),
+        json.loads(jd_json),
+        top_k=batch_top_k(params),
+        cache=get_feature_cache(),
+    )
+
 
 class RunManager:
     def __init__(self, s: Session, run: Run):
         self.s = s
         self.run = run
 
-    def _update_status(self, status: RunStatus, error: str | None = None):
+    def _update_status(self, status: RunStatus, error: str | None = None, commit: bool = True):
         self.run.status = status
         self.run.error = error
         if status == RunStatus.running:
@@ -24,31 +87,48 @@ class RunManager:
         if status in (RunStatus.succeeded, RunStatus.failed):
             self.run.finished_at = datetime.datetime.now(datetime.UTC)
         self.s.add(self.run)
-        self.s.commit()
+        if commit:
+            self.s.commit()
+            self._notify()
 
-    def execute(self):
+    def _notify(self):
+        if _notifier is not None:
+            _notifier(self.run.id, self.run.status.value, self.run.error)
+
+    def start(self):
         self._update_status(RunStatus.running)
 
-        state = run_minimal_graph(self.run.resume_text, self.run.jd_text)
-
-        write_artifact(
-            self.s, self.run.id, "scorecard.json", "scorecard", "application/json", state.scorecard
-        )
-        write_artifact(
-            self.s,
-            self.run.id,
-            "scorecard.md",
-            "scorecard",
-            "text/markdown",
-            scorecard_markdown(state),
-        )
-        write_artifact(
-            self.s,
-            self.run.id,
-            "graph_trace.jsonl",
-            "trace",
-            "application/json",
-            trace_jsonl(state),
-        )
-
-        self._update_status(RunStatus.succeeded)
+    def fail(self, error: str):
+        self._update_status(RunStatus.failed, error)
+
+    def finish(self, state: GraphState):
+        observe_trace(state.logs)
+        with ArtifactBatch(self.s, self.run.id) as batch:
+            batch.add("scorecard.json", "scorecard", "application/json", state.scorecard)
+            batch.add("scorecard.md", "scorecard", "text/markdown", scorecard_markdown(state))
+            batch.add("graph_trace.jsonl", "trace", "application/json", trace_jsonl(state))
+
+            # artifacts, index rows and the succeeded status land in one transaction
+            new_jd = index_job_description(self.s, self.run.id, state.jd_text, state.skills_jd)
+            self._update_status(RunStatus.succeeded, commit=False)
+            batch.commit()
+        self._notify()
+
+        if new_jd and state.jd_embedding is not None:
+            # the IVF index is rebuilt off the job path (queue.ivf_job)
+            get_vector_store().add(self.run.id, state.jd_embedding)
+
+    def finish_batch(self, result: dict[str, Any]):
+        with ArtifactBatch(self.s, self.run.id) as batch:
+            batch.add("batch_results.json", "batch", "application/json", result)
+            self._update_status(RunStatus.succeeded, commit=False)
+            batch.commit()
+        self._notify()
+
+    def execute(self):
+        self.start()
+        self.finish(compute_match(self.run.resume_text, self.run.jd_text, self.run.params))
+
+    def execute_batch(self):
+        self.start()
+        self.finish_batch(compute_batch(self.run.resume_text, self.run.jd_text, self.run.params))
@@ -0,0 +1,83 @@
+# backend/app/core/scheduling.py
+"""Weighted fair admission of jobs from several queues to a fixed set of slots.
+
+The worker runs one ARQ consumer per queue (each with its own concurrency
+limit) and they all share one compute pool. FairGate decides which queue's
+job gets the next free pool slot: among the queues with a job waiting, the
+one that has been served least relative to its weight (stride scheduling).
+With weights 6:3:1 and all queues backlogged, slots go to them in that ratio;
+a queue that was idle does not bank credit, it rejoins at the current virtual
+time, so a burst on one queue can never starve the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+
+
+class FairGate:
+    def __init__(self, slots: int, weights: Mapping[str, float]):
+        if slots < 1:
+            raise ValueError("slots must be >= 1")
+        if not weights or min(weights.values()) <= 0:
+            raise ValueError("weights must be positive")
+        self.slots = slots
+        self.weights = dict(weights)
+        self.busy = 0
+        self.served = {q: 0 for q in self.weights}
+        self._pass = {q: 0.0 for q in self.weights}  # virtual finish time per queue
+        self._vtime = 0.0  # virtual start time of the latest grant
+        self._waiting: dict[str, deque[asyncio.Future[None]]] = {q: deque() for q in self.weights}
+
+    def waiting(self, queue: str) -> int:
+        return sum(not f.done() for f in self._waiting[queue])
+
+    @asynccontextmanager
+    async def slot(self, queue: str) -> AsyncIterator[None]:
+        await self.acquire(queue)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, queue: str) -> None:
+        if queue not in self.weights:
+            raise KeyError(queue)
+        if self.busy < self.slots and not any(self._waiting.values()):
+            self._grant(queue)
+            return
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting[queue].append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # granted just as we were cancelled: hand it on
+            raise
+
+    def release(self) -> None:
+        self.busy -= 1
+        self._dispatch()
+
+    def _grant(self, queue: str) -> None:
+        self.busy += 1
+        self.served[queue] += 1
+        start = max(self._pass[queue], self._vtime)
+        self._pass[queue] = start + 1.0 / self.weights[queue]
+        self._vtime = start
+
+    def _dispatch(self) -> None:
+        while self.busy < self.slots:
+            for q in self._waiting.values():
+                while q and q[0].done():  # cancelled waiters
+                    q.popleft()
+            ready = [name for name, q in self._waiting.items() if q]
+            if not ready:
+                return
+            # ties go to the queue listed first (the most latency-sensitive)
+            queue = min(ready, key=lambda name: max(self._pass[name], self._vtime))
+            self._grant(queue)
+            self._waiting[queue].popleft().set_result(None)
@@ -0,0 +1,60 @@
+# backend/app/core/textstream.py
+"""Generator stages for processing a document chunk by chunk.
+
+`windows` re-cuts arbitrary chunks (file reads, upload parts, slices of a
+string) into pieces of about WINDOW_CHARS that end just before a whitespace
+character, so no word is ever split across pieces; `normalize` is the
+streaming form of graph._norm_text. Consumers keep at most one piece alive,
+so memory does not grow with the document.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+
+WINDOW_CHARS = 64 * 1024
+
+_WS = re.compile(r"\s")
+# whitespace and control characters collapse into a single space
+_WS_RUN = re.compile(r"[\s\x00-\x08\x0B-\x1F\x7F]+")
+
+
+def windows(chunks: str | Iterable[str], size: int = WINDOW_CHARS) -> Iterator[str]:
+    """Pieces of at least `size` chars (except the last) cut right before whitespace.
+
+    A piece only grows past `size` when it has no whitespace to cut at.
+    """
+    carry = ""
+    for chunk in (chunks,) if isinstance(chunks, str) else chunks:
+        buf = carry + chunk if carry else chunk
+        start = 0
+        while len(buf) - start > size:
+            m = _WS.search(buf, start + size)
+            if m is None:
+                break
+            yield buf[start : m.start()]
+            start = m.start()
+        carry = buf[start:]
+    if carry:
+        yield carry
+
+
+def normalize(chunks: Iterable[str]) -> Iterator[str]:
+    """Collapse whitespace/control runs to one space and strip both ends.
+
+    Works on any chunking; joining the output equals normalizing the joined input.
+    """
+    started = False
+    pending = False  # whitespace seen since the last emitted text
+    for chunk in chunks:
+        s = _WS_RUN.sub(" ", chunk)
+        core = s.strip(" ")
+        if not core:
+            pending = pending or bool(s)
+            continue
+        if started and (pending or s[0] == " "):
+            core = " " + core
+        yield core
+        started = True
+        pending = s[-1] == " "
@@ -0,0 +1,214 @@
+# backend/app/core/uploads.py
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from typing import Any
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+DATA_DIR = os.environ.get("DATA_DIR", "./data")
+UPLOAD_DIR = os.path.join(DATA_DIR, "uploads")
+READ_CHARS = 256 * 1024
+MAX_PARAMS_BYTES = 64 * 1024
+
+DOCUMENTS = ("resume", "jd")  # hashed in this order, as in routes._run_hash
+SEPARATOR = "\n---\n"
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class _StrippedHash:
+    """Feeds `h` with `text.strip()` of a document that arrives in pieces."""
+
+    def __init__(self, h: Any):
+        self.h = h
+        self.started = False
+        self.pending = ""  # trailing whitespace, hashed only if more text follows
+
+    def feed(self, text: str) -> None:
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return
+            self.started = True
+        body = self.pending + text
+        core = body.rstrip()
+        self.pending = body[len(core) :]
+        self.h.update(core.encode("utf-8"))
+
+
+class SpooledDocument:
+    """One uploaded text field: the raw bytes go to a temp file as they arrive,
+    decoded (strict UTF-8) only to count characters and, when it is this
+    document's turn, to feed the payload hash."""
+
+    def __init__(self, name: str, max_chars: int):
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=f"{name}-", suffix=".part")
+        self.name = name
+        self.max_chars = max_chars
+        self.chars = 0
+        self.done = False
+        self.hash: _StrippedHash | None = None
+        self._file = os.fdopen(fd, "wb")
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def write(self, data: bytes, final: bool = False) -> None:
+        self._file.write(data)
+        text = self._decoder.decode(data, final)
+        self.chars += len(text)
+        if self.chars > self.max_chars:
+            raise UploadTooLarge(f"{self.name} is longer than {self.max_chars} characters")
+        if self.hash is not None:
+            self.hash.feed(text)
+
+    def finish(self) -> None:
+        self.write(b"", final=True)  # raises on a truncated UTF-8 sequence
+        self._file.close()
+        self.done = True
+
+    def chunks(self, size: int = READ_CHARS) -> Iterator[str]:
+        # newline="" keeps CRLF exactly as uploaded, like a JSON string would
+        with open(self.path, encoding="utf-8", newline="") as f:
+            while chunk := f.read(size):
+                yield chunk
+
+    def read(self) -> str:
+        return "".join(self.chunks())
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RunUpload:
+    """Incremental multipart/form-data parser for a run submission.
+
+    Fields: `resume` and `jd` (files or plain values, UTF-8 text) and an optional
+    `params` JSON object. `write` accepts the body in whatever chunks it arrives;
+    documents are spooled to UPLOAD_DIR and hashed while streaming, so the body
+    is never held in memory. The hash `finish` returns equals routes._run_hash
+    of the same run sent as JSON. Malformed input raises ValueError (UploadTooLarge for
+    size limits); call `discard` when done.
+    """
+
+    def __init__(self, content_type: str, max_chars: int):
+        kind, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if kind != b"multipart/form-data" or not boundary:
+            raise ValueError("expected multipart/form-data with a boundary")
+        self.max_chars = max_chars
+        self.docs: dict[str, SpooledDocument] = {}
+        self.params: dict[str, Any] = {}
+        self._params_raw: bytearray | None = None
+        self._h = hashlib.sha256()
+        self._hashed: list[str] = []  # documents fed to the hash so far, in DOCUMENTS order
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._current: SpooledDocument | bytearray | None = None
+        self._parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._part_begin,
+                "on_header_field": self._header_field_data,
+                "on_header_value": self._header_value_data,
+                "on_header_end": self._header_end,
+                "on_headers_finished": self._headers_finished,
+                "on_part_data": self._part_data,
+                "on_part_end": self._part_end,
+            },
+        )
+
+    def write(self, data: bytes) -> None:
+        self._parser.write(data)
+
+    # --- parser callbacks
+
+    def _part_begin(self) -> None:
+        self._disposition = b""
+        self._header_field = self._header_value = b""
+
+    def _header_field_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name in self.docs or (name == "params" and self._params_raw is not None):
+            raise ValueError(f"duplicate field {name!r}")
+        if name == "params":
+            self._current = self._params_raw = bytearray()
+        elif name in DOCUMENTS:
+            doc = self._current = self.docs[name] = SpooledDocument(name, self.max_chars)
+            if self._hashed == list(DOCUMENTS[: DOCUMENTS.index(name)]):
+                self._start_hash(doc)  # its turn: hash while it streams in
+        else:
+            raise ValueError(f"unexpected field {name!r}")
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if isinstance(self._current, bytearray):
+            self._current += data[start:end]
+            if len(self._current) > MAX_PARAMS_BYTES:
+                raise UploadTooLarge("params is too large")
+        elif self._current is not None:
+            self._current.write(data[start:end])
+
+    def _part_end(self) -> None:
+        if isinstance(self._current, SpooledDocument):
+            self._current.finish()
+        self._current = None
+
+    # ---
+
+    def _start_hash(self, doc: SpooledDocument) -> None:
+        if self._hashed:
+            self._h.update(SEPARATOR.encode("utf-8"))
+        doc.hash = _StrippedHash(self._h)
+        self._hashed.append(doc.name)
+
+    def finish(self) -> str:
+        """Validate the completed upload; returns the payload hash."""
+        self._parser.finalize()
+        missing = [n for n in DOCUMENTS if n not in self.docs or not self.docs[n].done]
+        if missing:
+            raise ValueError(f"missing or incomplete fields {missing}")
+        empty = [n for n in DOCUMENTS if self.docs[n].chars == 0]
+        if empty:
+            raise ValueError(f"empty fields {empty}")
+        if self._params_raw:
+            params = json.loads(self._params_raw)
+            if not isinstance(params, dict):
+                raise ValueError("params must be a JSON object")
+            self.params = params
+        for name in DOCUMENTS[len(self._hashed) :]:
+            # arrived out of order: hash it from the spool
+            doc = self.docs[name]
+            self._start_hash(doc)
+            for chunk in doc.chunks():
+                doc.hash.feed(chunk)  # type: ignore[union-attr]
+        self._h.update(json.dumps(self.params, sort_keys=True).encode("utf-8"))
+        return self._h.hexdigest()
+
+    def discard(self) -> None:
+        for doc in self.docs.values():
+            doc.discard()
@@ -1,11 +1,64 @@
 # backend/app/main.py
 
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.app.api.routes import router
+from backend.app.api.routes import create_broker, create_inline_ctx, router
+from backend.app.core.events import StatusPublisher
+from backend.app.core.metrics import HTTP_SECONDS, PROFILING
+from backend.app.core.queue import REDIS_URL, create_redis_pool
+from backend.app.core.run_manager import set_status_notifier
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one Redis pool shared by every request, closed on shutdown
+    app.state.redis = create_redis_pool()
+    # one pub/sub subscription feeding every status waiter (started on first use)
+    app.state.broker = create_broker(app.state.redis)
+    # compute pool for ?mode=sync runs (processes start on first use)
+    app.state.inline = create_inline_ctx()
+    # inline runs (and stale runs failed on submit) publish their status like the worker's
+    set_status_notifier(StatusPublisher.from_url(REDIS_URL))
+    try:
+        yield
+    finally:
+        set_status_notifier(None)
+        app.state.inline["compute_pool"].shutdown(wait=False, cancel_futures=True)
+        await app.state.broker.stop()
+        await app.state.redis.aclose()
+
+
+class HTTPMetrics:
+    """ASGI middleware: request latency by method, route template and status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILING.enabled:
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # the template, not the raw path, keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_SECONDS.observe(time.perf_counter() - started, scope["method"], route, str(status))
+
 
-app = FastAPI(title="JobMatch-AI API", version="0.1.0")
+app = FastAPI(title="JobMatch-AI API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +67,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(HTTPMetrics)
 
 
 @app.get("/healthz")
@@ -1,5 +1,6 @@
 # backend/app/models/schemas.py
-from typing import Any
+from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -10,16 +11,32 @@ class RunRequest(BaseModel):
     params: dict[str, Any] | None = None
 
 
+class BatchRunRequest(BaseModel):
+    resume_texts: list[str] = Field(..., min_length=1, description="Plain text resumes")
+    jd_texts: list[str] = Field(..., min_length=1, description="Plain text job descriptions")
+    params: dict[str, Any] | None = None
+
+
 class RunResponse(BaseModel):
     run_id: str
     status: str
 
 
+class BulkRunRequest(BaseModel):
+    runs: list[RunRequest] = Field(..., min_length=1)
+
+
+class BulkRunResponse(BaseModel):
+    runs: list[RunResponse]  # same order as the request
+
+
 class ArtifactMeta(BaseModel):
     name: str
     kind: str
     mime: str
-    size_bytes: int | None = None
+    size_bytes: int | None = None  # logical (uncompressed) size
+    stored_bytes: int | None = None  # on disk
+    codec: str = "identity"
 
 
 class RunStatusResponse(BaseModel):
@@ -27,3 +44,58 @@ class RunStatusResponse(BaseModel):
     status: str
     error: str | None = None
     artifacts: list[ArtifactMeta] = []
+    scorecard: dict[str, Any] | None = None  # inline for POST /runs?mode=sync
+
+
+class RunListQuery(BaseModel):
+    status: Literal["queued", "running", "succeeded", "failed"] | None = None
+    payload_hash: str | None = None
+    created_after: datetime | None = Field(None, description="inclusive")
+    created_before: datetime | None = Field(None, description="exclusive")
+    limit: int = Field(50, ge=1, le=500)
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+
+
+class RunSummary(BaseModel):
+    run_id: str
+    kind: str
+    status: str
+    payload_hash: str
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class RunListResponse(BaseModel):
+    runs: list[RunSummary]  # newest first
+    next_cursor: str | None = None  # None on the last page
+
+
+class QueueStats(BaseModel):
+    queue: str
+    depth: int  # due jobs waiting; deferred ones are left out until due
+    oldest_wait_s: float | None = None  # how long the head of the queue has waited
+
+
+class JobSearchRequest(BaseModel):
+    resume_text: str = Field(..., min_length=1, description="Plain text resume")
+    k: int = Field(10, ge=1, le=100)
+    rank: Literal["bm25", "coverage", "semantic"] = "bm25"
+
+
+class JobSearchHit(BaseModel):
+    run_id: str
+    score: float
+    matched_terms: int | None = None  # skill rankings only
+    jd_terms: int | None = None
+
+
+class JobSearchResponse(BaseModel):
+    indexed_jds: int
+    results: list[JobSearchHit] = []
+
+
+class ProfilingConfig(BaseModel):
+    enabled: bool | None = Field(None, description="node, HTTP and DB timing")
+    tracemalloc: bool | None = Field(None, description="per-node tracemalloc peak")
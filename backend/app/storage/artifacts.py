@@ -1,26 +1,41 @@
 # backend/app/storage/artifacts.py
+import gzip
 import hashlib
 import json
 import os
 import tempfile
+import zlib
+from collections import Counter
+from collections.abc import Iterator
 from datetime import UTC, datetime
 
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from .models import Artifact
+from .models import Artifact, Blob, utcnow
 
 DATA_DIR = os.environ.get("DATA_DIR", "./data")
+BLOB_DIR = os.path.join(DATA_DIR, "blobs")
+ARTIFACT_CODEC = os.environ.get("ARTIFACT_CODEC", "gzip")  # "gzip" or "identity"
+GZIP_LEVEL = int(os.environ.get("ARTIFACT_GZIP_LEVEL", "6"))
+
+CODECS = ("identity", "gzip")
+_SUFFIX = {"identity": "", "gzip": ".gz"}
+CHUNK_BYTES = 64 * 1024
 
 MIME_BY_NAME = {
     "scorecard.json": "application/json",
     "scorecard.md": "text/markdown",
     "graph_trace.jsonl": "application/json",
     "gaps.csv": "text/csv",
+    "batch_results.json": "application/json",
     # add more as needed
 }
 
 
 def run_dir(run_id: str) -> str:
+    # per-run layout used before the blob store; still read for older artifacts
     base = os.path.join(DATA_DIR, "artifacts")
     path = os.path.join(base, run_id)
     # Ensure no path traversal
@@ -48,23 +63,144 @@ def _to_bytes(content: str | dict) -> bytes:
     return content.encode("utf-8")
 
 
-def _atomic_write(target_path: str, data: bytes) -> None:
-    # Write to temp file then rename to target (atomic on POSIX)
-    d = os.path.dirname(target_path)
-    os.makedirs(d, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=d)
-    try:
+def _encode(data: bytes, codec: str) -> tuple[bytes, str]:
+    """Stored bytes and the codec actually used (identity when gzip would not shrink)."""
+    if codec == "gzip":
+        packed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)  # deterministic
+        if len(packed) < len(data):
+            return packed, "gzip"
+    elif codec != "identity":
+        raise ValueError(f"unknown artifact codec {codec!r}")
+    return data, "identity"
+
+
+def blob_path(digest: str, codec: str = "identity") -> str:
+    return os.path.join(BLOB_DIR, digest[:2], digest + _SUFFIX[codec])
+
+
+class ArtifactBatch:
+    """Unit of work for a run's artifacts, stored content-addressed.
+
+    `add` writes each artifact to a temp file in its blob directory. `commit`
+    fsyncs the temp files, then, inside the database write transaction, bumps
+    the blob reference counts, renames the files onto their digest paths and
+    fsyncs each touched blob directory once, and commits the Artifact rows
+    together with whatever else is pending on the session (e.g. the run's final
+    status). Readers only find artifacts through those rows, so they see the
+    whole set or none of it.
+
+    Bytes are stored gzip-compressed unless ARTIFACT_CODEC=identity (or gzip
+    would not make them smaller); `size_bytes` and `sha256` always describe
+    the logical, uncompressed content.
+
+    Renames happen while SQLite's single write lock is held, which is what
+    makes them safe against `collect_blobs` unlinking the same digest; a
+    failed commit unlinks the blobs it created before releasing that lock.
+    """
+
+    def __init__(self, s: Session, run_id: str, codec: str = ARTIFACT_CODEC):
+        self.s = s
+        self.run_id = run_id
+        self.codec = codec
+        self._staged: list[tuple[str, Artifact]] = []  # (tmp path, row)
+
+    def __enter__(self) -> "ArtifactBatch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.discard()
+
+    def add(self, name: str, kind: str, mime: str | None, content: str | dict) -> Artifact:
+        name = _safe_name(name)
+        data = _to_bytes(content)
+        digest = _sha256_bytes(data)
+        stored, codec = _encode(data, self.codec)
+        target = blob_path(digest, codec)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(target))
         with os.fdopen(fd, "wb") as f:
-            f.write(data)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, target_path)
-    finally:
+            f.write(stored)
+        a = Artifact(
+            run_id=self.run_id,
+            name=name,
+            kind=kind,
+            mime=mime or MIME_BY_NAME.get(name, "application/octet-stream"),
+            path=target,
+            size_bytes=len(data),
+            sha256=digest,
+            codec=codec,
+            stored_bytes=len(stored),
+            created_at=datetime.now(UTC),
+        )
+        self._staged.append((tmp_path, a))
+        return a
+
+    def commit(self) -> list[Artifact]:
+        staged, self._staged = self._staged, []
+        rows = [a for _, a in staged]
+        created: list[str] = []  # blob files this batch brought into existence
         try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
+            for tmp_path, _ in staged:
+                fd = os.open(tmp_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            refs = Counter((a.sha256, a.codec) for a in rows)
+            sizes = {(a.sha256, a.codec): a.stored_bytes for a in rows}
+            for (digest, codec), n in refs.items():
+                stmt = sqlite_insert(Blob).values(
+                    sha256=digest,
+                    codec=codec,
+                    size_bytes=sizes[digest, codec],
+                    refcount=n,
+                    created_at=utcnow(),
+                )
+                self.s.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["sha256", "codec"],
+                        set_={"refcount": Blob.refcount + stmt.excluded.refcount},
+                    )
+                )
+            for tmp_path, a in staged:
+                if not os.path.exists(a.path):
+                    created.append(a.path)
+                os.replace(tmp_path, a.path)  # same digest and codec, same bytes: harmless
+            for d in {os.path.dirname(a.path) for a in rows}:
+                _fsync_dir(d)  # make the renames durable
+            self.s.add_all(rows)
+            self.s.commit()
+        except BaseException:
+            # the rollback also undoes the Blob upserts, so nothing would ever collect
+            # these files; unlink them while the write lock still keeps other batches
+            # from publishing the same digests
+            for path in created:
+                _remove_quietly(path)
+            self.s.rollback()
+            for tmp_path, _ in staged:
+                _remove_quietly(tmp_path)
+            raise
+        return rows
+
+    def discard(self) -> None:
+        for tmp_path, _ in self._staged:
+            _remove_quietly(tmp_path)
+        self._staged = []
+
+
+def _fsync_dir(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 
 def write_artifact(
@@ -75,30 +211,9 @@ def write_artifact(
     mime: str | None,
     content: str | dict,
 ) -> Artifact:
-    name = _safe_name(name)
-    rd = run_dir(run_id)
-    fpath = os.path.join(rd, name)
-    data = _to_bytes(content)
-
-    # write atomically
-    _atomic_write(fpath, data)
-
-    size = len(data)
-    digest = _sha256_bytes(data)
-    mime = mime or MIME_BY_NAME.get(name, "application/octet-stream")
-
-    a = Artifact(
-        run_id=run_id,
-        name=name,
-        kind=kind,
-        mime=mime,
-        path=fpath,
-        size_bytes=size,
-        sha256=digest,
-        created_at=datetime.now(UTC),
-    )
-    s.add(a)
-    s.commit()
+    with ArtifactBatch(s, run_id) as batch:
+        a = batch.add(name, kind, mime, content)
+        batch.commit()
     return a
 
 
@@ -110,3 +225,67 @@ def list_artifacts_for_run(s: Session, run_id: str) -> list[Artifact]:
         .order_by(Artifact.created_at.asc(), Artifact.name.asc())
         .all()
     )
+
+
+def get_artifact_by_name(s: Session, run_id: str, name: str) -> Artifact | None:
+    # point lookup on ix_artifacts_run_name
+    return s.execute(
+        select(Artifact)
+        .where(Artifact.run_id == run_id, Artifact.name == name)
+        .order_by(Artifact.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def artifact_file(a: Artifact) -> str:
+    """Where an artifact's bytes live: its digest's blob, or a pre-blob-store run file."""
+    p = blob_path(a.sha256, a.codec)
+    return p if os.path.exists(p) else a.path
+
+
+def iter_decoded(path: str, codec: str) -> Iterator[bytes]:
+    """Logical bytes of a stored artifact, decompressed chunk by chunk."""
+    d = zlib.decompressobj(wbits=31) if codec == "gzip" else None
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_BYTES):
+            out = d.decompress(chunk) if d is not None else chunk
+            if out:
+                yield out
+    if d is not None and (tail := d.flush()):
+        yield tail
+
+
+def release_artifacts(s: Session, *run_ids: str) -> int:
+    """Delete the runs' Artifact rows and drop their blob references (caller commits)."""
+    keys = s.execute(
+        delete(Artifact)
+        .where(Artifact.run_id.in_(run_ids))
+        .returning(Artifact.sha256, Artifact.codec)
+    ).all()
+    refs = Counter((digest, codec) for digest, codec in keys)
+    if refs:
+        # one executemany on the connection, not an ORM update per digest
+        s.connection().execute(
+            update(Blob)
+            .where(Blob.sha256 == bindparam("d"), Blob.codec == bindparam("c"))
+            .values(refcount=Blob.refcount - bindparam("n")),
+            [{"d": d, "c": c, "n": n} for (d, c), n in refs.items()],
+        )
+    return sum(refs.values())
+
+
+def collect_blobs(s: Session) -> tuple[int, int]:
+    """Remove unreferenced blobs; returns (blobs, bytes) freed.
+
+    Files are unlinked while this transaction holds the write lock, so a
+    concurrent ArtifactBatch cannot re-reference a digest in between. A crash
+    before the commit leaves rows with refcount 0 and no file, which the next
+    writer of that digest (or the next collection) repairs.
+    """
+    gone = s.execute(
+        delete(Blob).where(Blob.refcount <= 0).returning(Blob.sha256, Blob.codec, Blob.size_bytes)
+    ).all()
+    for digest, codec, _ in gone:
+        _remove_quietly(blob_path(digest, codec))
+    s.commit()
+    return len(gone), sum(size for _, _, size in gone)
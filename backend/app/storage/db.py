@@ -1,18 +1,61 @@
 # backend/app/storage/db.py
 
+import asyncio
+import functools
 import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from backend.app.core.metrics import DB_SECONDS, PROFILING, statement_kind
 from backend.app.storage.models import Base
 
 DATA_DIR = os.environ.get("DATA_DIR", "./data")
 DB_PATH = os.path.join(DATA_DIR, "app.sqlite3")
-ENGINE = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+DB_THREADS = int(os.environ.get("DB_THREADS", "16"))
+BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+ENGINE = create_engine(
+    f"sqlite:///{DB_PATH}",
+    connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT_MS / 1000},
+    pool_size=DB_THREADS,  # one connection per offload thread
+    max_overflow=DB_THREADS,
+)
 SessionLocal = sessionmaker(bind=ENGINE, autoflush=False, autocommit=False)
 
+T = TypeVar("T")
+
+
+@event.listens_for(ENGINE, "connect")
+def _sqlite_pragmas(dbapi_conn, _record):
+    # The API and the ARQ worker write the same file: WAL lets readers run
+    # alongside a writer, and busy_timeout makes writers wait instead of failing.
+    cur = dbapi_conn.cursor()
+    # only takes effect on a new, empty file; migration 0007 converts existing ones
+    cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cur.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+    cur.close()
+
+
+@event.listens_for(ENGINE, "before_cursor_execute")
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    if PROFILING.enabled and context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(ENGINE, "after_cursor_execute")
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is not None:
+        DB_SECONDS.observe(time.perf_counter() - started, statement_kind(statement))
+
 
 def init_db():
     # For tests/dev, ensure tables exist. In prod, prefer `alembic upgrade head`.
@@ -33,3 +76,14 @@ def get_session():
         yield s
     finally:
         s.close()
+
+
+# Sessions are synchronous; async callers hand whole units of work (a function
+# that opens its own get_session()) to this bounded pool so SQLite calls and
+# lock waits never block the event loop.
+_executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
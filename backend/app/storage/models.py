@@ -2,11 +2,30 @@
 from __future__ import annotations
 
 import enum
+import hashlib
+import os
 import uuid
+import zlib
 from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, object_session
+
+DOCUMENT_ZLIB_LEVEL = int(os.environ.get("DOCUMENT_ZLIB_LEVEL", "6"))
 
 
 def utcnow() -> datetime:
@@ -24,17 +43,97 @@ class RunStatus(str, enum.Enum):
     failed = "failed"
 
 
+class RunKind(enum.StrEnum):
+    match = "match"  # one resume vs one JD
+    batch = "batch"  # N resumes x M JDs; texts are stored as JSON lists
+
+
+class Document(Base):
+    """A run input text (a resume, a JD, or a batch's JSON list of them), stored
+    once per content and zlib-compressed unless that would not shrink it."""
+
+    __tablename__ = "documents"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)  # sha256 of the UTF-8 text
+    codec: Mapped[str] = mapped_column(String, nullable=False, default="zlib")  # or "identity"
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # logical
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False
+    )
+
+    @property
+    def text(self) -> str:
+        return decode_document(self.codec, self.body)
+
+
+def document_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_document(text: str) -> dict[str, Any]:
+    """Column values of the documents row for `text`."""
+    data = text.encode("utf-8")
+    packed = zlib.compress(data, DOCUMENT_ZLIB_LEVEL)
+    codec, body = ("zlib", packed) if len(packed) < len(data) else ("identity", data)
+    return {
+        "id": hashlib.sha256(data).hexdigest(),
+        "codec": codec,
+        "size_bytes": len(data),
+        "body": body,
+        "created_at": utcnow(),
+    }
+
+
+def encode_document_file(path: str, chunk_bytes: int = 256 * 1024) -> dict[str, Any]:
+    """`encode_document` of a UTF-8 text file, compressed as it is read."""
+    h = hashlib.sha256()
+    z = zlib.compressobj(DOCUMENT_ZLIB_LEVEL)
+    packed: list[bytes] = []
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_bytes):
+            h.update(chunk)
+            size += len(chunk)
+            packed.append(z.compress(chunk))
+    packed.append(z.flush())
+    body = b"".join(packed)
+    codec = "zlib"
+    if len(body) >= size:
+        with open(path, "rb") as f:
+            codec, body = "identity", f.read()
+    return {
+        "id": h.hexdigest(),
+        "codec": codec,
+        "size_bytes": size,
+        "body": body,
+        "created_at": utcnow(),
+    }
+
+
+def decode_document(codec: str, body: bytes) -> str:
+    return (zlib.decompress(body) if codec == "zlib" else body).decode("utf-8")
+
+
 class Run(Base):
+    """A submission. Its texts live in `documents`: `resume_text` / `jd_text` are
+    loaded (one extra query each) only when accessed, and assigning them stores
+    the documents when the session flushes."""
+
     __tablename__ = "runs"
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind: Mapped[RunKind] = mapped_column(
+        Enum(RunKind), default=RunKind.match, server_default=RunKind.match.value
+    )
     payload_hash: Mapped[str] = mapped_column(String, index=True)
     status: Mapped[RunStatus] = mapped_column(Enum(RunStatus), index=True, default=RunStatus.queued)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    # normalized inputs
-    resume_text: Mapped[str] = mapped_column(Text)
-    jd_text: Mapped[str] = mapped_column(Text)
+    # inputs, by content hash
+    resume_doc_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), index=True)
+    jd_doc_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), index=True)
     params: Mapped[dict] = mapped_column(JSON, default=dict)
 
     created_at: Mapped[datetime] = mapped_column(
@@ -43,7 +142,68 @@ class Run(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    __table_args__ = (Index("ix_runs_payload_hash_status", "payload_hash", "status"),)
+    __table_args__ = (
+        Index("ix_runs_payload_hash_status", "payload_hash", "status"),
+        # keyset pagination (GET /runs) and retention sweeps walk these in order
+        Index("ix_runs_created_id", "created_at", "id"),
+        Index("ix_runs_status_created_id", "status", "created_at", "id"),
+    )
+
+    @property
+    def resume_text(self) -> str:
+        return self._text("resume")
+
+    @resume_text.setter
+    def resume_text(self, value: str) -> None:
+        self._set_text("resume", value)
+
+    @property
+    def jd_text(self) -> str:
+        return self._text("jd")
+
+    @jd_text.setter
+    def jd_text(self, value: str) -> None:
+        self._set_text("jd", value)
+
+    def _set_text(self, role: str, value: str) -> None:
+        setattr(self, f"{role}_doc_id", document_id(value))
+        self.__dict__.setdefault("_texts", {})[role] = value
+        self.__dict__.setdefault("_unsaved", {})[role] = value
+
+    def attach_document(self, role: str, row: dict[str, Any]) -> None:
+        """Reference an already encoded document (see encode_document_file); the text
+        itself is not loaded unless `{role}_text` is read."""
+        setattr(self, f"{role}_doc_id", row["id"])
+        self.__dict__.get("_texts", {}).pop(role, None)
+        self.__dict__.setdefault("_unsaved", {})[role] = row
+
+    def _text(self, role: str) -> str:
+        texts = self.__dict__.setdefault("_texts", {})
+        if role not in texts:
+            s = object_session(self)
+            if s is None:
+                raise RuntimeError(f"run {self.id} is detached; its {role} text was not loaded")
+            doc_id = getattr(self, f"{role}_doc_id")
+            row = s.execute(
+                select(Document.codec, Document.body).where(Document.id == doc_id)
+            ).one()
+            texts[role] = decode_document(row.codec, row.body)
+        return texts[role]
+
+
+@event.listens_for(Session, "before_flush")
+def _store_documents(session: Session, _flush_context: Any, _instances: Any) -> None:
+    # compress assigned texts here (in the flushing thread, not the request handler)
+    # and insert each distinct document once, before the runs that reference it
+    rows: dict[str, dict[str, Any]] = {}
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Run):
+            for pending in obj.__dict__.pop("_unsaved", {}).values():
+                doc = pending if isinstance(pending, dict) else encode_document(pending)
+                rows.setdefault(doc["id"], doc)
+    if rows:
+        stmt = sqlite_insert(Document).on_conflict_do_nothing(index_elements=["id"])
+        session.connection().execute(stmt, list(rows.values()))
 
 
 class Artifact(Base):
@@ -56,11 +216,59 @@ class Artifact(Base):
     mime: Mapped[str] = mapped_column(String)  # e.g., "application/json"
     path: Mapped[str] = mapped_column(String)  # absolute or relative path on disk
 
-    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-    sha256: Mapped[str] = mapped_column(String, index=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # logical
+    sha256: Mapped[str] = mapped_column(String, index=True)  # of the logical bytes
+    codec: Mapped[str] = mapped_column(
+        String, nullable=False, default="identity", server_default="identity"
+    )  # how the bytes are stored: "identity" or "gzip"
+    stored_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None: = size_bytes
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utcnow, nullable=False
     )
 
     __table_args__ = (Index("ix_artifacts_run_name", "run_id", "name"),)
+
+
+class Blob(Base):
+    """Content-addressed artifact bytes, stored once per codec under DATA_DIR/blobs/<sha[:2]>/."""
+
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String, primary_key=True)  # of the logical bytes
+    codec: Mapped[str] = mapped_column(String, primary_key=True, default="identity")
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # stored
+    refcount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # artifact rows
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False
+    )
+
+
+class JobIndexDoc(Base):
+    """A distinct (normalized) job description in the skill index."""
+
+    __tablename__ = "job_index_docs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    jd_hash: Mapped[str] = mapped_column(String, unique=True)
+    # first run that carried this JD; retention hands it on to a later one
+    run_id: Mapped[str] = mapped_column(String, index=True)
+    n_terms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False
+    )
+
+
+class JobIndexPosting(Base):
+    __tablename__ = "job_index_postings"
+
+    # clustered on (term, doc_id) so a posting list is one contiguous range
+    term: Mapped[str] = mapped_column(String, primary_key=True)
+    doc_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_job_index_postings_doc", "doc_id"),
+        {"sqlite_with_rowid": False},
+    )
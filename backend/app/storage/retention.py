@@ -0,0 +1,214 @@
+# backend/app/storage/retention.py
+"""Retention: delete old runs with their artifacts and input documents, in small
+batches, and hand the freed pages back to the filesystem.
+
+Each batch is its own short write transaction (the API and the worker wait on
+SQLite's single write lock, see SQLITE_BUSY_TIMEOUT_MS), followed by a pause.
+Blob files are unlinked by collect_blobs once nothing references them; files
+of pre-blob-store runs (artifacts/<run_id>/) are removed with their run. A JD
+in the job index moves to a surviving run with the same JD document, or leaves
+the index (postings and vector too) so a later run can index it again.
+With auto_vacuum=INCREMENTAL (migration 0007) every batch also runs a bounded
+`PRAGMA incremental_vacuum`, so the file shrinks a little at a time instead
+of needing a full VACUUM.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, exists, func, select, text, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.embeddings import get_vector_store
+
+from .artifacts import collect_blobs, release_artifacts
+from .models import Document, JobIndexDoc, JobIndexPosting, Run, RunStatus, utcnow
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = os.environ.get("DATA_DIR", "./data")
+# "<status>=<days>" pairs; statuses left out are kept forever
+RETENTION_POLICY = os.environ.get("RETENTION_POLICY", "succeeded=30,failed=14")
+RETENTION_BATCH = int(os.environ.get("RETENTION_BATCH", "500"))  # runs per transaction
+RETENTION_PAUSE_S = float(os.environ.get("RETENTION_PAUSE_S", "0.05"))  # between batches
+RETENTION_VACUUM_PAGES = int(os.environ.get("RETENTION_VACUUM_PAGES", "2000"))  # per batch
+
+
+def parse_policy(spec: str) -> dict[RunStatus, timedelta]:
+    """Max age per status from "succeeded=30,failed=7.5" (days)."""
+    policy: dict[RunStatus, timedelta] = {}
+    for item in filter(None, (p.strip() for p in spec.split(","))):
+        status, sep, days = item.partition("=")
+        if not sep:
+            raise ValueError(f"retention policy entry {item!r} is not <status>=<days>")
+        try:
+            policy[RunStatus(status.strip())] = timedelta(days=float(days))
+        except ValueError as e:
+            raise ValueError(f"bad retention policy entry {item!r}: {e}") from None
+    return policy
+
+
+@dataclass
+class SweepStats:
+    runs: int = 0
+    artifacts: int = 0
+    documents: int = 0
+    index_moved: int = 0  # indexed JDs handed to a surviving run
+    index_dropped: int = 0
+    blobs: int = 0
+    blob_bytes: int = 0
+    run_dirs: int = 0
+    pages: int = 0  # freed by incremental_vacuum
+    batches: int = 0
+    by_status: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _expired(status: RunStatus, cutoff: datetime, limit: int):
+    # served by ix_runs_status_created_id
+    return (
+        select(Run.id, Run.resume_doc_id, Run.jd_doc_id)
+        .where(Run.status == status, Run.created_at < cutoff)
+        .order_by(Run.created_at)
+        .limit(limit)
+    )
+
+
+def _release_index_docs(s: Session, rows: Sequence[Any]) -> dict[str, str | None]:
+    """{run id: surviving run now carrying its indexed JD, or None if the JD left the index}."""
+    ids = [r.id for r in rows]
+    jd_of = {r.id: r.jd_doc_id for r in rows}
+    heirs: dict[str, str | None] = {}
+    docs = s.execute(
+        select(JobIndexDoc.id, JobIndexDoc.run_id).where(JobIndexDoc.run_id.in_(ids))
+    ).all()
+    for doc_id, run_id in docs:
+        heir = s.scalar(
+            select(Run.id)
+            .where(
+                Run.jd_doc_id == jd_of[run_id],
+                Run.status == RunStatus.succeeded,
+                Run.id.not_in(ids),
+            )
+            .order_by(Run.created_at.desc())
+            .limit(1)
+        )
+        if heir is None:
+            s.execute(delete(JobIndexPosting).where(JobIndexPosting.doc_id == doc_id))
+            s.execute(delete(JobIndexDoc).where(JobIndexDoc.id == doc_id))
+        else:
+            s.execute(update(JobIndexDoc).where(JobIndexDoc.id == doc_id).values(run_id=heir))
+        heirs[run_id] = heir
+    return heirs
+
+
+def _delete_batch(s: Session, rows: Sequence[Any], stats: SweepStats) -> None:
+    ids = [r.id for r in rows]
+    heirs = _release_index_docs(s, rows)
+    if heirs:
+        # before the commit: retire() is idempotent, so a failed batch is simply redone
+        moves = {run_id: heir for run_id, heir in heirs.items() if heir is not None}
+        get_vector_store().retire(heirs, moves)
+        stats.index_moved += len(moves)
+        stats.index_dropped += len(heirs) - len(moves)
+    stats.artifacts += release_artifacts(s, *ids)
+    s.execute(delete(Run).where(Run.id.in_(ids)))
+    # documents no remaining run points at; a run inserted concurrently either
+    # committed first (and is seen here) or re-inserts its document after us
+    doc_ids = {r.resume_doc_id for r in rows} | {r.jd_doc_id for r in rows}
+    gone = s.execute(
+        delete(Document)
+        .where(
+            Document.id.in_(doc_ids),
+            ~exists().where(Run.resume_doc_id == Document.id),
+            ~exists().where(Run.jd_doc_id == Document.id),
+        )
+        .returning(Document.id)
+    ).all()
+    stats.documents += len(gone)
+    s.commit()
+
+
+def _remove_run_dirs(ids: list[str]) -> int:
+    removed = 0
+    for run_id in ids:
+        path = os.path.join(DATA_DIR, "artifacts", run_id)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def incremental_vacuum(s: Session, pages: int) -> int:
+    """Return up to `pages` free pages to the filesystem; pages freed (0 unless
+    the database uses auto_vacuum=INCREMENTAL)."""
+    if pages <= 0 or s.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        return 0
+    before = s.execute(text("PRAGMA freelist_count")).scalar() or 0
+    s.execute(text(f"PRAGMA incremental_vacuum({int(pages)})"))
+    s.commit()
+    return before - (s.execute(text("PRAGMA freelist_count")).scalar() or 0)
+
+
+def sweep(
+    s: Session,
+    policy: dict[RunStatus, timedelta] | None = None,
+    now: datetime | None = None,
+    batch: int = RETENTION_BATCH,
+    max_batches: int | None = None,
+    pause_s: float = RETENTION_PAUSE_S,
+    vacuum_pages: int = RETENTION_VACUUM_PAGES,
+) -> SweepStats:
+    """Delete runs older than the policy allows, `batch` runs per transaction.
+
+    Stops after `max_batches` (the rest is left for the next sweep).
+    """
+    policy = parse_policy(RETENTION_POLICY) if policy is None else policy
+    now = now or utcnow()
+    stats = SweepStats()
+    for status, age in policy.items():
+        cutoff = now - age
+        while max_batches is None or stats.batches < max_batches:
+            rows = s.execute(_expired(status, cutoff, batch)).all()
+            if not rows:
+                break
+            _delete_batch(s, rows, stats)
+            blobs, freed = collect_blobs(s)
+            stats.blobs += blobs
+            stats.blob_bytes += freed
+            stats.run_dirs += _remove_run_dirs([r.id for r in rows])
+            stats.pages += incremental_vacuum(s, vacuum_pages)
+            stats.runs += len(rows)
+            stats.by_status[status.value] = stats.by_status.get(status.value, 0) + len(rows)
+            stats.batches += 1
+            if len(rows) < batch:
+                break
+            time.sleep(pause_s)  # let the API and the worker take the write lock
+    if stats.runs:
+        log.info("retention sweep: %s", stats.as_dict())
+    return stats
+
+
+def pending(
+    s: Session, policy: dict[RunStatus, timedelta] | None = None, now: datetime | None = None
+) -> dict[str, int]:
+    """Runs per status a sweep would delete now (for --dry-run)."""
+    policy = parse_policy(RETENTION_POLICY) if policy is None else policy
+    now = now or utcnow()
+    return {
+        status.value: s.scalar(
+            select(func.count()).where(Run.status == status, Run.created_at < now - age)
+        )
+        or 0
+        for status, age in policy.items()
+    }
@@ -1,12 +1,11 @@
 # backend/worker.py
 
-# Convenient entrypoint to run worker without module path issues
-from typing import cast
+# Convenient entrypoint to run worker without module path issues.
+# Consumes the interactive, bulk and oversized queues (see run_workers);
+# `arq backend.app.core.queue.WorkerSettings` still runs the interactive queue alone.
+import asyncio
 
-from arq import run_worker
-from arq.typing import WorkerSettingsType
-
-from backend.app.core.queue import WorkerSettings
+from backend.app.core.queue import run_workers
 
 if __name__ == "__main__":
-    run_worker(cast(WorkerSettingsType, WorkerSettings))
+    asyncio.run(run_workers())
@@ -0,0 +1,91 @@
+# benchmarks/bench_cas.py
+"""Disk saved by the content-addressed (and compressed) artifact store.
+
+python -m benchmarks.bench_cas [--payloads 200] [--max-resubmits 4]
+python -m benchmarks.bench_cas --data-dir ./data    # report on an existing database
+
+The replay submits each synthetic resume/JD pair 1..max-resubmits times with
+different params (which do not change the scorecard), as users re-running a
+match do, through RunManager on a scratch DATA_DIR.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+
+def _report() -> None:
+    from sqlalchemy import func, select
+
+    from backend.app.storage.db import ensure_dirs, get_session
+    from backend.app.storage.models import Artifact
+
+    ensure_dirs()
+    with get_session() as s:
+        n, logical = s.execute(
+            select(func.count(Artifact.id), func.coalesce(func.sum(Artifact.size_bytes), 0))
+        ).one()
+        stored_size = func.coalesce(Artifact.stored_bytes, Artifact.size_bytes)
+        distinct = (
+            select(Artifact.sha256, func.max(stored_size).label("size"))
+            .group_by(Artifact.sha256, Artifact.codec)
+            .subquery()
+        )
+        blobs, stored = s.execute(
+            select(func.count(), func.coalesce(func.sum(distinct.c.size), 0))
+        ).one()
+    saved = logical - stored
+    pct = 100.0 * saved / logical if logical else 0.0
+    print(f"artifacts {n:>8}  logical {logical / 1e6:>9.2f} MB")
+    print(f"blobs     {blobs:>8}  stored  {stored / 1e6:>9.2f} MB")
+    print(f"saved {saved / 1e6:.2f} MB ({pct:.1f}%)")
+
+
+def _replay(payloads: int, max_resubmits: int, seed: int) -> None:
+    from backend.app.core.run_manager import RunManager, compute_match
+    from backend.app.storage.db import ensure_dirs, get_session
+    from backend.app.storage.models import Run, RunStatus
+
+    skills = ["python", "fastapi", "docker", "aws", "sql", "react", "kubernetes", "go", "rust"]
+    rnd = random.Random(seed)
+    jds = [" ".join(rnd.sample(skills, 4)) + f" role {i}" for i in range(max(1, payloads // 10))]
+    ensure_dirs()
+    for p in range(payloads):
+        resume = " ".join(rnd.sample(skills, rnd.randint(2, 7))) + f" candidate {p} " * 50
+        jd = rnd.choice(jds)
+        state = compute_match(resume, jd)
+        for k in range(rnd.randint(1, max_resubmits)):
+            with get_session() as s:
+                run = Run(
+                    payload_hash=f"replay-{p}-{k}",
+                    status=RunStatus.running,
+                    resume_text=resume,
+                    jd_text=jd,
+                    params={"attempt": k},
+                )
+                s.add(run)
+                s.commit()
+                RunManager(s, run).finish(state)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--payloads", type=int, default=200)
+    ap.add_argument("--max-resubmits", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=3)
+    ap.add_argument("--data-dir", default=None, help="report on this DATA_DIR instead")
+    args = ap.parse_args()
+    if args.data_dir:
+        os.environ["DATA_DIR"] = args.data_dir
+    else:
+        os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_cas_")
+        os.environ["FEATURE_CACHE_DISK_BYTES"] = "0"
+        _replay(args.payloads, args.max_resubmits, args.seed)
+    _report()
+
+
+if __name__ == "__main__":
+    main()
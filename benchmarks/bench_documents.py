@@ -0,0 +1,138 @@
+# benchmarks/bench_documents.py
+"""Database size and GET /runs/{id} latency, run texts inline vs the documents table.
+
+python -m benchmarks.bench_documents [--runs 100000] [--jds 500] [--lookups 2000]
+
+Builds a database at the pre-documents schema (0005) with every resume/JD pair
+inline on its run row, copies it and migrates the copy to head, then reports
+file size after VACUUM and status-lookup latency on both. Resumes are unique
+per run; JDs are drawn from a pool of `--jds`, as many candidates apply to
+the same posting. The old layout is timed at the SQL level (the current app
+cannot open it); the new one both at the SQL level and through the endpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_documents_")
+os.environ["DB_BOOTSTRAP"] = "none"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+from .synth import document  # noqa: E402
+
+LOOKUP_SQL = "SELECT id, status, error FROM runs WHERE id = ?"
+
+
+def _alembic(path: str) -> Config:
+    cfg = Config("alembic.ini")
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    return cfg
+
+
+def _build_old(path: str, runs: int, jds: int, seed: int) -> list[str]:
+    command.upgrade(_alembic(path), "0005_artifact_codec")
+    resumes = [document("resume", 4_000, s) for s in range(200)]
+    postings = [document("jd", 2_500, s) for s in range(jds)]
+    rnd = random.Random(seed)
+    now = datetime.now(UTC).isoformat(" ")
+    ids = [f"{i:032x}" for i in range(runs)]
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (id, kind, payload_hash, status, resume_text, jd_text, params, "
+            "created_at) VALUES (?, 'match', ?, 'succeeded', ?, ?, '{}', ?)",
+            (
+                (rid, f"h{i}", f"Candidate {i}\n" + rnd.choice(resumes), rnd.choice(postings), now)
+                for i, rid in enumerate(ids)
+            ),
+        )
+    conn.close()
+    return ids
+
+
+def _size_mb(path: str) -> float:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path) / 1e6
+
+
+def _pct(samples: list[float]) -> tuple[float, float]:
+    q = statistics.quantiles(samples, n=20)
+    return q[9] * 1000, q[18] * 1000  # p50, p95 in ms
+
+
+def _sql_lookups(path: str, ids: list[str]) -> tuple[float, float]:
+    conn = sqlite3.connect(path)
+    samples = []
+    for rid in ids:
+        t0 = time.perf_counter()
+        conn.execute(LOOKUP_SQL, (rid,)).fetchone()
+        samples.append(time.perf_counter() - t0)
+    conn.close()
+    return _pct(samples)
+
+
+async def _endpoint_lookups(ids: list[str]) -> tuple[float, float]:
+    from httpx import ASGITransport, AsyncClient
+
+    from backend.app.main import app
+
+    samples = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as ac:
+        await ac.get(f"/runs/{ids[0]}")
+        for rid in ids:
+            t0 = time.perf_counter()
+            assert (await ac.get(f"/runs/{rid}")).status_code == 200
+            samples.append(time.perf_counter() - t0)
+    return _pct(samples)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=100_000)
+    ap.add_argument("--jds", type=int, default=500)
+    ap.add_argument("--lookups", type=int, default=2_000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    work = os.environ["DATA_DIR"]
+    old, new = os.path.join(work, "old.sqlite3"), os.path.join(work, "app.sqlite3")
+    t0 = time.perf_counter()
+    ids = _build_old(old, args.runs, args.jds, args.seed)
+    print(f"built {args.runs} runs in {time.perf_counter() - t0:.1f}s")
+    shutil.copyfile(old, new)
+    t0 = time.perf_counter()
+    command.upgrade(_alembic(new), "head")
+    print(f"migrated in {time.perf_counter() - t0:.1f}s")
+
+    sample = random.Random(args.seed).choices(ids, k=args.lookups)
+    print(
+        f"{'layout':<10}{'size MB':>10}{'sql p50':>10}{'sql p95':>10}{'api p50':>10}{'api p95':>10}"
+    )
+    print(
+        f"{'inline':<10}{_size_mb(old):>10.1f}"
+        + "".join(f"{v:>10.3f}" for v in _sql_lookups(old, sample))
+    )
+    api = asyncio.run(_endpoint_lookups(sample))
+    print(
+        f"{'documents':<10}{_size_mb(new):>10.1f}"
+        + "".join(f"{v:>10.3f}" for v in (*_sql_lookups(new, sample), *api))
+    )
+    shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
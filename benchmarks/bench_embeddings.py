@@ -0,0 +1,83 @@
+# benchmarks/bench_embeddings.py
+"""Vector store open time, brute-force vs IVF query latency and IVF recall@10.
+
+python -m benchmarks.bench_embeddings [--rows 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app.core.embeddings import EMBEDDING_DIM, ENCODER, ID_BYTES, VectorStore
+
+
+def _fill(prefix: str, rows: int, rng: np.random.Generator) -> np.ndarray:
+    # clustered synthetic vectors written straight to the store's file layout
+    centers = rng.normal(size=(256, EMBEDDING_DIM))
+    vecs = centers[rng.integers(0, 256, size=rows)] + 0.6 * rng.normal(size=(rows, EMBEDDING_DIM))
+    vecs = (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+    vecs.tofile(f"{prefix}.f32")
+    ids = np.array([f"run-{i}".encode().ljust(ID_BYTES, b"\0") for i in range(rows)])
+    ids.astype(f"S{ID_BYTES}").tofile(f"{prefix}.ids")
+    return vecs
+
+
+def _latency(fn, queries) -> tuple[float, list]:
+    out, t0 = [], time.perf_counter()
+    for q in queries:
+        out.append(fn(q))
+    return (time.perf_counter() - t0) * 1000 / len(queries), out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--queries", type=int, default=50)
+    args = ap.parse_args()
+    rng = np.random.default_rng(5)
+
+    text = "python fastapi postgresql kubernetes " * 50_000  # ~2M chars
+    t0 = time.perf_counter()
+    ENCODER.encode(text)
+    print(f"encode {len(text)} chars: {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "jd")
+        for rows in (args.rows // 10, args.rows):
+            vecs = _fill(prefix, rows, rng)
+            VectorStore(prefix).build_ivf()
+            t0 = time.perf_counter()
+            store = VectorStore(prefix)
+            store.search(vecs[0], k=1)  # maps the files and probes a few lists
+            print(
+                f"open + first IVF query @ {rows} rows: {(time.perf_counter() - t0) * 1000:.1f}ms"
+            )
+
+        queries = vecs[rng.integers(0, len(vecs), size=args.queries)] + 0.05
+        t0 = time.perf_counter()
+        store.build_ivf()
+        print(f"build_ivf @ {len(store)} rows: {time.perf_counter() - t0:.1f}s")
+        brute = VectorStore(prefix + "-brute")
+        os.link(f"{prefix}.f32", f"{prefix}-brute.f32")
+        os.link(f"{prefix}.ids", f"{prefix}-brute.ids")
+        brute_ms, exact = _latency(lambda q: brute.search(q, k=10), queries)
+        for nprobe in (4, 8, 16):
+            ivf_ms, approx = _latency(lambda q, p=nprobe: store.search(q, k=10, nprobe=p), queries)
+            recall = np.mean(
+                [
+                    len({h["id"] for h in a} & {h["id"] for h in b}) / 10
+                    for a, b in zip(approx, exact, strict=True)
+                ]
+            )
+            print(
+                f"nprobe={nprobe:<3} brute {brute_ms:.1f}ms  ivf {ivf_ms:.1f}ms  recall@10 {recall:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
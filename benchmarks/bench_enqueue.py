@@ -0,0 +1,89 @@
+# benchmarks/bench_enqueue.py
+"""Enqueue throughput: a pool per request (old enqueue_run) vs one shared pool vs bulk.
+
+python -m benchmarks.bench_enqueue [--redis redis://localhost:6379/15] [--jobs 2000]
+
+Without --redis a fakeredis TCP server is started in-process (pip install fakeredis);
+it is much slower than a real Redis, so compare the ratios rather than the absolutes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import threading
+import time
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from backend.app.core.queue import enqueue_run, enqueue_runs_bulk
+
+
+def _fake_server() -> str:
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"redis://{host}:{port}/0"
+
+
+async def _per_request(url: str, run_id: str) -> None:
+    # what enqueue_run did before: connect (and ping) for every submission
+    redis = await create_pool(RedisSettings.from_dsn(url))
+    await redis.enqueue_job("run_match_job", run_id=run_id)
+    await redis.aclose()  # the old code leaked the pool; closing is the generous case
+
+
+async def _gather(jobs: list, concurrency: int) -> None:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(coro):
+        async with sem:
+            await coro
+
+    await asyncio.gather(*(one(j) for j in jobs))
+
+
+async def run(url: str, n: int, concurrency: int, chunk: int) -> None:
+    ids = [f"bench-{i}" for i in range(n)]
+    shared = ArqRedis.from_url(url, max_connections=concurrency)
+    await shared.flushdb()
+
+    t = time.perf_counter()
+    await _gather([_per_request(url, i) for i in ids], concurrency)
+    report("pool per request", n, time.perf_counter() - t)
+
+    t = time.perf_counter()
+    await _gather([enqueue_run(shared, run_id=i) for i in ids], concurrency)
+    report("shared pool", n, time.perf_counter() - t)
+
+    t = time.perf_counter()
+    await _gather(
+        [enqueue_runs_bulk(shared, ids[lo : lo + chunk]) for lo in range(0, n, chunk)],
+        concurrency,
+    )
+    report(f"bulk x{chunk}", n, time.perf_counter() - t)
+
+    await shared.flushdb()
+    await shared.aclose()
+
+
+def report(label: str, n: int, seconds: float) -> None:
+    print(f"{label:<18} {n / seconds:>10,.0f} jobs/s  ({seconds * 1000:.0f} ms)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis", default=None, help="redis URL (a scratch DB: it is flushed)")
+    ap.add_argument("--jobs", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--chunk", type=int, default=100, help="runs per bulk call")
+    args = ap.parse_args()
+    url = args.redis or _fake_server()
+    asyncio.run(run(url, args.jobs, args.concurrency, args.chunk))
+
+
+if __name__ == "__main__":
+    main()
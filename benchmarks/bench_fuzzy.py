@@ -0,0 +1,99 @@
+# benchmarks/bench_fuzzy.py
+"""Fuzzy skill lookup cost vs vocabulary size: partition index vs a linear scan.
+
+python -m benchmarks.bench_fuzzy [--sizes 1000,5000,10000,50000] [--queries 2000]
+
+The vocabulary is a synthetic taxonomy (benchmarks.synth skills plus
+pronounceable multi-syllable terms). Queries are taxonomy terms with one or
+two random edits, half of them also present in the smallest vocabulary,
+plus 20% unrelated words. "scan" is the baseline the index replaces: a
+length check and a bounded edit distance against every term.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from functools import partial
+
+from backend.app.core.fuzzy import FuzzyIndex, FuzzySettings, edit_distance
+from benchmarks.synth import SKILLS
+
+SYLLABLES = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"] + ["ion", "ex", "ql", "js"]
+
+
+def _taxonomy(n: int, rnd: random.Random) -> list[str]:
+    terms = dict.fromkeys(s.lower() for s in SKILLS)
+    while len(terms) < n:
+        terms["".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 5)))] = None
+    return list(terms)[:n]
+
+
+def _typo(term: str, rnd: random.Random) -> str:
+    q = list(term)
+    for _ in range(rnd.randint(1, 2)):
+        op, at = rnd.randrange(3), rnd.randrange(len(q))
+        if op == 0:
+            q[at] = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+        elif op == 1:
+            q.insert(at, rnd.choice("abcdefghijklmnopqrstuvwxyz"))
+        elif len(q) > 4:
+            del q[at]
+    return "".join(q)
+
+
+def _scan(vocab: list[str], term: str, settings: FuzzySettings) -> str | None:
+    best, best_sim = None, 0.0
+    k = settings.max_edits
+    for t in vocab:
+        if abs(len(t) - len(term)) > k:
+            continue
+        d = edit_distance(term, t, k)
+        sim = 1 - d / max(len(term), len(t))
+        if d <= k and sim >= settings.min_similarity and sim > best_sim:
+            best, best_sim = t, sim
+    return best
+
+
+def _us(fn, queries: list[str]) -> tuple[float, int]:
+    t = time.perf_counter()
+    found = sum(fn(q) is not None for q in queries)
+    return (time.perf_counter() - t) / len(queries) * 1e6, found
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,5000,10000,50000")
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=5)
+    args = ap.parse_args()
+    rnd = random.Random(args.seed)
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    taxonomy = _taxonomy(sizes[-1], rnd)
+    settings = FuzzySettings()
+    print(f"{'terms':>7}{'build ms':>10}{'index us':>10}{'scan us':>10}{'speedup':>9}{'found':>7}")
+    for n in sizes:
+        vocab = taxonomy[:n]
+        queries = [
+            _typo(rnd.choice(taxonomy[: sizes[0]] if i % 2 else vocab), rnd)
+            for i in range(args.queries)
+        ]
+        queries[::5] = [
+            "".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=rnd.randint(4, 12)))
+            for _ in queries[::5]
+        ]
+        t = time.perf_counter()
+        index = FuzzyIndex(vocab)
+        build_ms = (time.perf_counter() - t) * 1000
+        index_us, found = _us(partial(index.lookup, settings=settings), queries)
+        sample = queries[: max(50, args.queries // 20)]  # the scan is slow at 50k
+        scan_us = _us(partial(_scan, vocab, settings=settings), sample)[0]
+        print(
+            f"{n:>7}{build_ms:>10.1f}{index_us:>10.1f}{scan_us:>10.0f}"
+            f"{scan_us / index_us:>8.0f}x{found / len(queries):>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/bench_ingest.py
+"""Submission cost, JSON body vs streamed multipart upload, and feature-stage peak memory.
+
+python -m benchmarks.bench_ingest [--sizes 100000,1000000,2000000]
+
+Peak memory is Python allocations (tracemalloc) during one call, on a scratch
+DATA_DIR with enqueueing stubbed out. The feature stages compare the old
+three-pass normalization and whole-text encoder with the chunked ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_ingest_")
+
+import numpy as np  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import backend.app.api.routes as routes  # noqa: E402
+from backend.app.core.embeddings import _PRIME, ENCODER  # noqa: E402
+from backend.app.core.graph import _norm_text  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.storage.db import ensure_dirs  # noqa: E402
+
+from .synth import pair  # noqa: E402
+
+
+def _legacy_norm(t: str) -> str:
+    t = t.replace("\r\n", "\n")
+    t = re.sub(r"[\x00-\x08\x0B-\x1F\x7F]", " ", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def _legacy_encode(text: str) -> np.ndarray:
+    codes = np.frombuffer(f" {text.lower()} ".encode("utf-32-le"), dtype=np.uint32)
+    codes = codes.astype(np.uint64)
+    vec = np.zeros(ENCODER.dim, dtype=np.float64)
+    for n in ENCODER.ngrams:
+        h = np.zeros(len(codes) - n + 1, dtype=np.uint64)
+        for i in range(n):
+            h = h * _PRIME + codes[i : len(codes) - n + 1 + i]
+        h ^= h >> np.uint64(29)
+        buckets = (h % np.uint64(ENCODER.dim)).astype(np.int64)
+        signs = np.where((h >> np.uint64(63)) == 0, 1.0, -1.0)
+        vec += np.bincount(buckets, weights=signs, minlength=ENCODER.dim)
+    vec = np.sign(vec) * np.log1p(np.abs(vec))
+    return vec / np.linalg.norm(vec)
+
+
+async def _measure(call, repeat: int = 3) -> tuple[float, float]:
+    """(best ms untraced, peak MB of a traced call); tracemalloc itself skews timings."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    await call()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return best * 1000, peak
+
+
+def _unique(text: str) -> str:
+    # a fresh payload every call (no dedupe), same length
+    u = str(uuid.uuid4())
+    return u + text[len(u) :]
+
+
+async def _as_json(ac: AsyncClient, resume: str, jd: str) -> None:
+    body = {"resume_text": _unique(resume), "jd_text": jd}
+    assert (await ac.post("/runs", json=body)).status_code == 202
+
+
+async def _as_upload(ac: AsyncClient, resume: str, jd: str) -> None:
+    files = {
+        "resume": ("cv.txt", _unique(resume).encode()),
+        "jd": ("jd.txt", jd.encode()),
+    }
+    assert (await ac.post("/runs/upload", files=files)).status_code == 202
+
+
+async def _submissions(sizes: list[int]) -> None:
+    async def _noop(*args, **kwargs):
+        return None
+
+    routes.enqueue_run = _noop
+    logging.getLogger("backend.app.core.events").setLevel(logging.CRITICAL)  # no Redis here
+    print(f"{'submit':<10}{'chars':>10}{'json ms':>10}{'json MB':>10}{'up ms':>10}{'up MB':>10}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as ac:
+        await _as_json(ac, "warm up the broker", "x")
+        for size in sizes:
+            resume, jd = pair(size)
+            row: list[float] = []
+            for submit in (_as_json, _as_upload):
+                # the client builds its request inside the window too; both sides alike
+                row += await _measure(lambda f=submit, r=resume, j=jd: f(ac, r, j))
+            print(f"{'':<10}{size:>10}" + "".join(f"{v:>10.1f}" for v in row))
+
+
+async def _features(sizes: list[int]) -> None:
+    print(f"{'features':<10}{'chars':>10}{'old ms':>10}{'old MB':>10}{'new ms':>10}{'new MB':>10}")
+    for size in sizes:
+        resume, _ = pair(size)
+
+        async def old(t: str = resume) -> None:
+            _legacy_encode(_legacy_norm(t))
+
+        async def new(t: str = resume) -> None:
+            ENCODER.encode(_norm_text(t))
+
+        row = [*await _measure(old), *await _measure(new)]
+        print(f"{'':<10}{size:>10}" + "".join(f"{v:>10.1f}" for v in row))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100000,1000000,2000000")
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    ensure_dirs()
+    asyncio.run(_submissions(sizes))
+    asyncio.run(_features(sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_jd_index.py
+"""Top-k "best jobs for this resume" latency over a synthetic 100k-JD index.
+
+python -m benchmarks.bench_jd_index [--docs 100000] [--queries 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.app.core.jd_index import InvertedIndex
+
+VOCAB = 20_000
+
+
+def _docs(rng: np.random.Generator, n: int, lo: int, hi: int) -> list[list[str]]:
+    # Zipf-ish term popularity: a few skills (python, sql, ...) appear in most JDs
+    weights = 1.0 / np.arange(1, VOCAB + 1) ** 0.9
+    weights /= weights.sum()
+    out = []
+    for size in rng.integers(lo, hi, size=n):
+        ids = np.unique(rng.choice(VOCAB, size=int(size), p=weights))
+        out.append([f"skill{i}" for i in ids])
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(11)
+    t0 = time.perf_counter()
+    index = InvertedIndex()
+    for i, terms in enumerate(_docs(rng, args.docs, 15, 60), start=1):
+        index.add(i, f"run-{i}", terms)
+    print(f"indexed {len(index)} JDs in {time.perf_counter() - t0:.1f}s")
+
+    queries = _docs(rng, args.queries, 40, 128)
+    for rank in ("bm25", "coverage"):
+        index.search(queries[0], k=args.k, rank=rank)  # warm posting arrays
+        lat = []
+        for q in queries:
+            t = time.perf_counter()
+            index.search(q, k=args.k, rank=rank)
+            lat.append((time.perf_counter() - t) * 1000)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        print(f"{rank:<9} k={args.k}  p50={p50:.1f}ms  p95={p95:.1f}ms  p99={p99:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_lexicon.py
+"""Skill extraction throughput (MB/s) for the compiled lexicon vs the old regex loop.
+
+python -m benchmarks.bench_lexicon
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from backend.app.api.routes import MAX_LEN
+from backend.app.core.graph import ALIAS, COMMON_STOP, SKILL_REGEX, _extract_skills
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, MAX_LEN]
+
+
+def _legacy_extract(text: str) -> list[str]:
+    raw = [m.group(1).lower() for m in SKILL_REGEX.finditer(text)]
+    mapped = [ALIAS.get(x, x) for x in raw]
+    dedup: list[str] = []
+    for x in mapped:
+        if x in COMMON_STOP or x.isdigit() or len(x) < 2:
+            continue
+        if x not in dedup:
+            dedup.append(x)
+    return dedup[:128]
+
+
+def _corpus(size: int, vocab: int, seed: int = 7) -> str:
+    rnd = random.Random(seed)
+    words = [
+        "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)) for _ in range(vocab)
+    ]
+    words += sorted(COMMON_STOP) + ["deep learning", "Python", "FastAPI", "k8s"]
+    out: list[str] = []
+    n = 0
+    while n < size:
+        w = rnd.choice(words)
+        out.append(w)
+        n += len(w) + 1
+    return " ".join(out)[:size]
+
+
+def _bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    # "wide" hits the 128-skill cap early; "narrow" has fewer distinct terms than the
+    # cap, so the whole input must be scanned (worst case).
+    print(f"{'corpus':<8}{'chars':>10}{'legacy MB/s':>14}{'lexicon MB/s':>14}")
+    for label, vocab in (("wide", 5_000), ("narrow", 60)):
+        for size in SIZES:
+            text = _corpus(size, vocab)
+            repeat = 5 if size <= 100_000 else 2
+            mb = len(text.encode("utf-8")) / 1e6
+            legacy = mb / _bench(_legacy_extract, text, repeat)
+            new = mb / _bench(_extract_skills, text, repeat)
+            print(f"{label:<8}{size:>10}{legacy:>14.1f}{new:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_offline.py
+"""Offline scoring throughput (pairs/s): `cli score` vs runs through the worker path.
+
+python -m benchmarks.bench_offline [--pairs 2000] [--chars 5000] [--procs 4] [--chunks 1,8,32,128]
+
+"worker" executes every pair as a run through _run_job_async, as the ARQ
+worker does (status updates, artifacts, JD index in SQLite), on the same
+process pool; Redis and HTTP are left out, so it flatters the old path.
+"offline" is score_file at each chunk size. Pairs come from benchmarks.synth,
+with a JD shared by every 10 resumes as in a nightly re-score.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_offline_")
+os.environ["FEATURE_CACHE_DISK_BYTES"] = "0"
+
+from backend.app.core.offline import score_file  # noqa: E402
+from backend.app.core.queue import create_compute_pool  # noqa: E402
+from backend.app.storage.db import ensure_dirs, get_session  # noqa: E402
+from backend.app.storage.models import Run, RunStatus  # noqa: E402
+from benchmarks.bench_worker import _drain  # noqa: E402
+from benchmarks.synth import document  # noqa: E402
+
+
+def _write_pairs(path: Path, n: int, chars: int) -> list[tuple[str, str]]:
+    pairs = [
+        (document("resume", chars, seed=i), document("jd", chars // 2, seed=i // 10))
+        for i in range(n)
+    ]
+    with path.open("w") as f:
+        for i, (resume, jd) in enumerate(pairs):
+            f.write(json.dumps({"id": f"p{i}", "resume_text": resume, "jd_text": jd}) + "\n")
+    return pairs
+
+
+def _worker(pairs: list[tuple[str, str]], procs: int) -> float:
+    with get_session() as s:
+        runs = [
+            Run(payload_hash=f"offline-{i}", status=RunStatus.queued, resume_text=r, jd_text=j)
+            for i, (r, j) in enumerate(pairs)
+        ]
+        s.add_all(runs)
+        s.commit()
+        ids = [r.id for r in runs]
+    pool = create_compute_pool(procs)
+    try:
+        pool.submit(int).result()
+        t = time.perf_counter()
+        asyncio.run(_drain({"compute_pool": pool}, ids))
+        return time.perf_counter() - t
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", type=int, default=2000)
+    ap.add_argument("--chars", type=int, default=5000)
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--chunks", default="1,8,32,128")
+    args = ap.parse_args()
+    ensure_dirs()
+    tmp = Path(os.environ["DATA_DIR"])
+    src = tmp / "pairs.jsonl"
+    pairs = _write_pairs(src, args.pairs, args.chars)
+    print(f"{args.pairs} pairs of ~{args.chars} resume chars, {args.procs} processes")
+
+    seconds = _worker(pairs, args.procs)
+    print(f"{'worker':<16} {args.pairs / seconds:>8.1f} pairs/s")
+    for chunk in (int(c) for c in args.chunks.split(",")):
+        pool = create_compute_pool(args.procs, feature_cache=False)
+        try:
+            pool.submit(int).result()  # processes up before the clock starts
+            stats = score_file(src, tmp / f"out-{chunk}.jsonl", pool, args.procs, chunk=chunk)
+        finally:
+            pool.shutdown()
+        assert stats.failed == 0
+        print(f"{f'offline chunk={chunk}':<16} {stats.pairs_per_s:>8.1f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
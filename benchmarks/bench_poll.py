@@ -0,0 +1,133 @@
+# benchmarks/bench_poll.py
+"""GET /runs/{id} latency for 200 parallel pollers while a worker process writes.
+
+python -m benchmarks.bench_poll [--pollers 200] [--interval 1.0] [--polls 10]
+
+Each poller asks for its run every `interval` seconds (as the frontend does);
+latency is measured from the scheduled poll time, so time spent waiting for a
+blocked event loop counts. Both modes use a scratch DATA_DIR and a separate
+writer process standing in for the ARQ worker:
+  before - sessions used directly on the event loop, default rollback journal
+  after  - run_db thread offload + WAL / busy_timeout / synchronous=NORMAL
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+WRITE_INTERVAL = 0.05  # worker commits/s ~ 20
+WRITE_BYTES = 2_000_000  # a MAX_LEN resume per committed run
+
+
+def _setup(mode: str):
+    from sqlalchemy import event
+
+    from backend.app.storage import db
+
+    if mode == "before":
+        event.remove(db.ENGINE, "connect", db._sqlite_pragmas)
+    return db
+
+
+def _write(mode: str) -> None:
+    from backend.app.storage.models import Run, RunStatus
+
+    db = _setup(mode)
+    i = 0
+    while True:
+        with db.get_session() as s:
+            s.add(
+                Run(
+                    payload_hash=f"w-{i}",
+                    status=RunStatus.succeeded,
+                    resume_text="r" * WRITE_BYTES,
+                    jd_text="j",
+                )
+            )
+            s.commit()
+        i += 1
+        time.sleep(WRITE_INTERVAL)
+
+
+def _measure(mode: str, pollers: int, interval: float, polls: int) -> None:
+    import numpy as np
+    from httpx import ASGITransport, AsyncClient
+
+    import backend.app.api.routes as routes_mod
+    from backend.app.main import app
+    from backend.app.storage.models import Run, RunStatus
+
+    db = _setup(mode)
+    if mode == "before":
+
+        async def _inline(fn, *args, **kwargs):
+            return fn(*args, **kwargs)
+
+        routes_mod.run_db = _inline  # type: ignore[assignment]
+
+    db.ensure_dirs()
+    with db.get_session() as s:
+        runs = [
+            Run(payload_hash=f"bench-{i}", status=RunStatus.queued, resume_text="r", jd_text="j")
+            for i in range(pollers)
+        ]
+        s.add_all(runs)
+        s.commit()
+        ids = [r.id for r in runs]
+
+    async def _poller(ac: AsyncClient, n: int, lat: list[float]) -> None:
+        start = time.perf_counter() + interval * n / pollers  # spread pollers evenly
+        for k in range(polls):
+            due = start + k * interval
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            r = await ac.get(f"/runs/{ids[n]}")
+            lat.append((time.perf_counter() - due) * 1000)
+            r.raise_for_status()
+
+    async def _run() -> list[float]:
+        lat: list[float] = []
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            await ac.get(f"/runs/{ids[0]}")  # warm up
+            await asyncio.gather(*(_poller(ac, n, lat) for n in range(pollers)))
+        return lat
+
+    writer = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_poll", "--write", mode])
+    try:
+        time.sleep(1.0)
+        lat = asyncio.run(_run())
+    finally:
+        writer.terminate()
+        writer.wait()
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    print(f"{mode:<7} n={len(lat)}  p50={p50:.1f}ms  p95={p95:.1f}ms  p99={p99:.1f}ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pollers", type=int, default=200)
+    ap.add_argument("--interval", type=float, default=1.0)
+    ap.add_argument("--polls", type=int, default=10)
+    ap.add_argument("--mode", choices=("before", "after"), default=None)
+    ap.add_argument("--write", choices=("before", "after"), default=None)
+    args = ap.parse_args()
+    if args.write:
+        _write(args.write)
+    elif args.mode:
+        _measure(args.mode, args.pollers, args.interval, args.polls)
+    else:
+        for mode in ("before", "after"):
+            env = dict(os.environ, DATA_DIR=tempfile.mkdtemp(prefix="bench_poll_"))
+            cmd = [sys.executable, "-m", "benchmarks.bench_poll", "--mode", mode]
+            cmd += ["--pollers", str(args.pollers), "--interval", str(args.interval)]
+            cmd += ["--polls", str(args.polls)]
+            subprocess.run(cmd, env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_queues.py
+"""Interactive run latency during a burst of large runs: one FIFO queue vs routed queues.
+
+python -m benchmarks.bench_queues [--procs 2] [--bulk 16] [--oversized 2] [--interactive 30]
+
+A burst of bulk (~400k chars) and oversized (~1.2M chars) runs is queued,
+then small interactive runs arrive every --gap seconds. "fifo" is the
+previous worker: one queue, WorkerSettings.max_jobs jobs in flight, the
+compute pool taken first come first served. "routed" is run_workers: each
+run on the queue route_queue picks, QUEUE_MAX_JOBS per queue, pool slots
+handed out by the FairGate. Runs go through _run_job_async on a real
+process pool; latency is enqueue to finished.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_queues_")
+os.environ["FEATURE_CACHE_DISK_BYTES"] = "0"
+
+from backend.app.core.queue import (  # noqa: E402
+    QUEUE_MAX_JOBS,
+    QUEUE_WEIGHTS,
+    QUEUES,
+    WorkerSettings,
+    _init_compute_process,
+    _run_job_async,
+    route_queue,
+)
+from backend.app.core.scheduling import FairGate  # noqa: E402
+from backend.app.storage.db import ensure_dirs  # noqa: E402
+from benchmarks.bench_worker import _check, _create_runs  # noqa: E402
+
+QUEUE_OF = {q: name for name, q in QUEUES.items()}
+
+
+def _ms(samples: list[float]) -> str:
+    q = statistics.quantiles(samples, n=100)
+    return f"p50 {q[49] * 1000:>7.0f}ms  p99 {q[98] * 1000:>7.0f}ms"
+
+
+async def _replay(
+    pool: ProcessPoolExecutor, procs: int, jobs: list[tuple[str, int]], gap: float, routed: bool
+) -> dict[str, list[float]]:
+    """jobs: (run_id, chars); those after the burst arrive every `gap` seconds."""
+    gate = FairGate(procs, QUEUE_WEIGHTS)
+    caps = {
+        name: asyncio.Semaphore(QUEUE_MAX_JOBS[name] if routed else WorkerSettings.max_jobs)
+        for name in QUEUES
+    }
+    latency: dict[str, list[float]] = {name: [] for name in QUEUES}
+
+    async def one(run_id: str, chars: int) -> None:
+        name = QUEUE_OF[route_queue(chars)]
+        t0 = time.perf_counter()
+        ctx = (
+            {"compute_pool": pool, "gate": gate, "queue": name}
+            if routed
+            else {"compute_pool": pool}
+        )
+        async with caps[name if routed else "interactive"]:
+            await _run_job_async(ctx, run_id)
+        latency[name].append(time.perf_counter() - t0)
+
+    tasks = []
+    for run_id, chars in jobs:
+        if route_queue(chars) == QUEUES["interactive"]:
+            await asyncio.sleep(gap)
+        tasks.append(asyncio.create_task(one(run_id, chars)))
+        await asyncio.sleep(0)  # keep arrival order at the semaphores
+    await asyncio.gather(*tasks)
+    return latency
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--procs", type=int, default=2)
+    ap.add_argument("--bulk", type=int, default=16)
+    ap.add_argument("--oversized", type=int, default=2)
+    ap.add_argument("--interactive", type=int, default=30)
+    ap.add_argument("--gap", type=float, default=0.2)
+    args = ap.parse_args()
+    ensure_dirs()
+
+    for seed, mode in enumerate(("fifo", "routed")):
+        # resume chars; the JD adds a quarter (see _create_runs)
+        groups = [(args.oversized, 1_000_000), (args.bulk, 320_000), (args.interactive, 4_000)]
+        jobs: list[tuple[str, int]] = []
+        for i, (n, chars) in enumerate(groups):
+            jobs += [(r, chars + chars // 4) for r in _create_runs(n, chars, seed=seed * 10 + i)]
+        with ProcessPoolExecutor(max_workers=args.procs, initializer=_init_compute_process) as pool:
+            for _ in range(args.procs):
+                pool.submit(int).result()
+            t = time.perf_counter()
+            latency = asyncio.run(_replay(pool, args.procs, jobs, args.gap, mode == "routed"))
+            total = time.perf_counter() - t
+        _check([r for r, _ in jobs])
+        print(f"{mode:<7} all done in {total:6.1f}s")
+        for name, samples in latency.items():
+            print(f"  {name:<12} {len(samples):>3} runs  {_ms(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_retention.py
+"""Retention sweep throughput, and what it costs a concurrent writer.
+
+python -m benchmarks.bench_retention [--runs 20000] [--batches 100,500,5000]
+
+For each batch size: fills a scratch database with expired runs (one artifact
+each), then sweeps it while another thread keeps inserting runs as the API
+does, and reports sweep time, the longest batch (how long the write lock was
+held) and the writer's p50 / p99 / max insert latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_retention_")
+
+from sqlalchemy import delete  # noqa: E402
+
+from backend.app.storage import retention  # noqa: E402
+from backend.app.storage.artifacts import ArtifactBatch  # noqa: E402
+from backend.app.storage.db import ensure_dirs, get_session  # noqa: E402
+from backend.app.storage.models import Run, RunStatus  # noqa: E402
+
+POLICY = {RunStatus.succeeded: timedelta(days=1)}
+OLD = datetime(2020, 1, 1, tzinfo=UTC)
+
+
+def _fill(n: int) -> None:
+    with get_session() as s:
+        s.execute(delete(Run))
+        s.commit()
+        for start in range(0, n, 1000):
+            runs = [
+                Run(
+                    payload_hash=f"old-{i}",
+                    status=RunStatus.succeeded,
+                    resume_text=f"resume {i} " * 300,
+                    jd_text=f"jd {i % 50} " * 200,
+                    created_at=OLD,
+                )
+                for i in range(start, min(n, start + 1000))
+            ]
+            s.add_all(runs)
+            s.commit()
+            with ArtifactBatch(s, "") as batch:
+                for r in runs:
+                    batch.add("scorecard.json", "json", None, {"run": r.id}).run_id = r.id
+                batch.commit()
+
+
+def _writer(stop: threading.Event, samples: list[float]) -> None:
+    i = 0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        with get_session() as s:
+            s.add(Run(payload_hash=f"new-{i}", resume_text=f"fresh {i}", jd_text="jd"))
+            s.commit()
+        samples.append(time.perf_counter() - t0)
+        i += 1
+        time.sleep(0.002)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20_000)
+    ap.add_argument("--batches", default="100,500,5000")
+    args = ap.parse_args()
+    ensure_dirs()
+
+    # time each batch: wrap the per-batch transaction
+    longest = [0.0]
+    real_delete = retention._delete_batch
+
+    def _timed(s, rows, stats):
+        t0 = time.perf_counter()
+        real_delete(s, rows, stats)
+        longest[0] = max(longest[0], time.perf_counter() - t0)
+
+    retention._delete_batch = _timed
+
+    print(
+        f"{'batch':>6}{'runs':>8}{'sweep s':>9}{'max tx ms':>11}{'w p50':>8}{'w p99':>8}{'w max':>8}"
+    )
+    for size in [int(b) for b in args.batches.split(",")]:
+        _fill(args.runs)
+        longest[0] = 0.0
+        samples: list[float] = []
+        stop = threading.Event()
+        writer = threading.Thread(target=_writer, args=(stop, samples))
+        writer.start()
+        t0 = time.perf_counter()
+        with get_session() as s:
+            stats = retention.sweep(s, POLICY, batch=size)
+        took = time.perf_counter() - t0
+        stop.set()
+        writer.join()
+        q = statistics.quantiles(samples, n=100)
+        print(
+            f"{size:>6}{stats.runs:>8}{took:>9.2f}{longest[0] * 1000:>11.1f}"
+            f"{q[49] * 1000:>8.1f}{q[98] * 1000:>8.1f}{max(samples) * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/bench_run_listing.py
+"""GET /runs page latency at page 1 vs deep pages, keyset cursor vs OFFSET.
+
+python -m benchmarks.bench_run_listing [--rows 1000000] [--limit 50] [--pages 1,100,10000]
+
+Fills a scratch database (alembic head) with `--rows` runs, then times
+GET /runs through the ASGI app at each page, reached with the cursor the
+previous page would have returned, unfiltered and with ?status=. The OFFSET
+column is the same page fetched with LIMIT/OFFSET in plain SQL, for contrast.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_run_listing_")
+os.environ["DB_BOOTSTRAP"] = "none"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from backend.app.api.routes import _encode_cursor  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.storage.db import DB_PATH  # noqa: E402
+from backend.app.storage.models import document_id  # noqa: E402
+
+STATUSES = ["succeeded"] * 8 + ["failed", "queued"]
+COLUMNS = "id, kind, status, payload_hash, error, created_at, started_at, finished_at"
+
+
+def _fill(rows: int, seed: int) -> None:
+    cfg = Config("alembic.ini")
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{DB_PATH}")
+    command.upgrade(cfg, "head")
+    rnd = random.Random(seed)
+    t0 = datetime(2024, 1, 1, tzinfo=UTC)
+    doc = document_id("")
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (id, kind, payload_hash, status, params, created_at, "
+            "resume_doc_id, jd_doc_id) VALUES (?, 'match', ?, ?, '{}', ?, ?, ?)",
+            (
+                (
+                    f"{rnd.getrandbits(128):032x}",
+                    f"{rnd.getrandbits(64):016x}",
+                    rnd.choice(STATUSES),
+                    # the storage format SQLAlchemy uses for DateTime on SQLite
+                    (t0 + timedelta(seconds=i * 3)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    doc,
+                    doc,
+                )
+                for i in range(rows)
+            ),
+        )
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def _cursor(conn: sqlite3.Connection, where: str, offset: int) -> str | None:
+    if offset == 0:
+        return None
+    created_at, run_id = conn.execute(
+        f"SELECT created_at, id FROM runs {where} ORDER BY created_at DESC, id DESC "
+        "LIMIT 1 OFFSET ?",
+        (offset - 1,),
+    ).fetchone()
+    return _encode_cursor(datetime.fromisoformat(created_at), run_id)
+
+
+def _ms(samples: list[float]) -> tuple[float, float]:
+    q = statistics.quantiles(samples, n=20)
+    return q[9] * 1000, q[18] * 1000
+
+
+async def _api(ac: AsyncClient, params: dict, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = await ac.get("/runs", params=params)
+        samples.append(time.perf_counter() - t0)
+        assert r.status_code == 200 and len(r.json()["runs"]) == params["limit"]
+    return _ms(samples)
+
+
+def _offset(conn: sqlite3.Connection, where: str, limit: int, offset: int, repeat: int):
+    sql = f"SELECT {COLUMNS} FROM runs {where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(sql, (limit, offset)).fetchall()
+        samples.append(time.perf_counter() - t0)
+    return _ms(samples)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    conn = sqlite3.connect(DB_PATH)
+    print(f"{'filter':<18}{'page':>7}{'api p50':>10}{'api p95':>10}{'OFFSET p50':>12}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as ac:
+        await ac.get("/runs", params={"limit": 1})
+        for label, where, extra in (
+            ("all", "", {}),
+            ("status=succeeded", "WHERE status = 'succeeded'", {"status": "succeeded"}),
+        ):
+            for page in (int(p) for p in args.pages.split(",")):
+                offset = (page - 1) * args.limit
+                params = {**extra, "limit": args.limit}
+                if (cursor := _cursor(conn, where, offset)) is not None:
+                    params["cursor"] = cursor
+                p50, p95 = await _api(ac, params, args.repeat)
+                off50, _ = _offset(conn, where, args.limit, offset, max(3, args.repeat // 10))
+                print(f"{label:<18}{page:>7}{p50:>10.2f}{p95:>10.2f}{off50:>12.2f}")
+    conn.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--pages", default="1,100,10000")
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    _fill(args.rows, args.seed)
+    print(f"filled {args.rows} runs in {time.perf_counter() - t0:.1f}s")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
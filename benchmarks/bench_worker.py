@@ -0,0 +1,131 @@
+# benchmarks/bench_worker.py
+"""Worker throughput (runs/s) by compute process count, vs the old inline execution.
+
+python -m benchmarks.bench_worker [--runs 40] [--chars 200000] [--procs 1,2,4]
+
+Runs are executed through _run_job_async exactly as the ARQ worker does
+(max_jobs concurrent jobs, DB/artifact I/O in threads) on a scratch DATA_DIR;
+every run has distinct text so the feature cache never hits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_worker_")
+os.environ["FEATURE_CACHE_DISK_BYTES"] = "0"
+
+from concurrent.futures import ProcessPoolExecutor  # noqa: E402
+
+from backend.app.core.queue import (  # noqa: E402
+    WorkerSettings,
+    _init_compute_process,
+    _run_job,
+    _run_job_async,
+)
+from backend.app.storage.db import ensure_dirs, get_session  # noqa: E402
+from backend.app.storage.models import Run, RunStatus  # noqa: E402
+
+SKILLS = ["python", "fastapi", "docker", "aws", "sql", "react", "kubernetes", "go", "rust"]
+
+
+def _text(rnd: random.Random, chars: int) -> str:
+    out: list[str] = []
+    n = 0
+    while n < chars:
+        w = (
+            rnd.choice(SKILLS)
+            if rnd.random() < 0.1
+            else "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(3, 9)))
+        )
+        out.append(w)
+        n += len(w) + 1
+    return " ".join(out)
+
+
+def _create_runs(n: int, chars: int, seed: int) -> list[str]:
+    rnd = random.Random(seed)
+    with get_session() as s:
+        runs = [
+            Run(
+                payload_hash=f"bench-{seed}-{i}",
+                status=RunStatus.queued,
+                resume_text=_text(rnd, chars),
+                jd_text=_text(rnd, chars // 4),
+            )
+            for i in range(n)
+        ]
+        s.add_all(runs)
+        s.commit()
+        return [r.id for r in runs]
+
+
+async def _drain(ctx, ids: list[str]) -> float:
+    """Run all jobs; returns the worst event-loop stall seen meanwhile (seconds)."""
+    sem = asyncio.Semaphore(WorkerSettings.max_jobs)
+    worst = 0.0
+
+    async def one(run_id: str) -> None:
+        async with sem:
+            await _run_job_async(ctx, run_id)
+
+    async def ticker() -> None:
+        nonlocal worst
+        while True:
+            t = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst = max(worst, time.perf_counter() - t - 0.005)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.gather(*(one(r) for r in ids))
+    tick.cancel()
+    return worst
+
+
+def _check(ids: list[str]) -> None:
+    with get_session() as s:
+        for run_id in ids:
+            run = s.get(Run, run_id)
+            assert run is not None and run.status == RunStatus.succeeded, run_id
+
+
+def _report(label: str, n: int, seconds: float, stall: float) -> None:
+    print(f"{label:<12} {n / seconds:>7.2f} runs/s  worst loop stall {stall * 1000:>6.0f}ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=40)
+    ap.add_argument("--chars", type=int, default=200_000)
+    ap.add_argument("--procs", default=",".join(str(p) for p in (1, 2, 4, os.cpu_count() or 1)))
+    args = ap.parse_args()
+    ensure_dirs()
+    print(f"{os.cpu_count()} cores, {args.runs} runs of ~{args.chars} resume chars")
+
+    ids = _create_runs(args.runs, args.chars, seed=0)
+    t = time.perf_counter()
+    stall = 0.0
+    for run_id in ids:
+        t1 = time.perf_counter()
+        _run_job(run_id)  # what the worker did before: inline on its event loop
+        stall = max(stall, time.perf_counter() - t1)
+    _report("inline", len(ids), time.perf_counter() - t, stall)
+    _check(ids)
+
+    for seed, procs in enumerate(sorted({int(p) for p in args.procs.split(",")}), start=1):
+        ids = _create_runs(args.runs, args.chars, seed=seed)
+        with ProcessPoolExecutor(max_workers=procs, initializer=_init_compute_process) as pool:
+            pool.submit(int).result()  # start the processes outside the timing
+            t = time.perf_counter()
+            stall = asyncio.run(_drain({"compute_pool": pool}, ids))
+            _report(f"{procs} process", len(ids), time.perf_counter() - t, stall)
+        _check(ids)
+
+
+if __name__ == "__main__":
+    main()
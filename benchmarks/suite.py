@@ -0,0 +1,210 @@
+# benchmarks/suite.py
+"""Hot-path microbenchmarks on synthetic documents, saved as JSON, with a regression gate.
+
+python -m benchmarks.suite --out .bench/latest.json                 # run and save
+python -m benchmarks.suite --baseline .bench/baseline.json          # run, fail on regressions
+python -m benchmarks.suite --current new.json --baseline old.json   # compare two saved runs
+python -m benchmarks.suite --cases norm_text,graph --sizes 1000,100000
+
+Each case is timed at every size in benchmarks.synth.SIZES (1 KB .. MAX_LEN) and
+reports the best per-call time over --repeat samples. Compare mode exits with
+status 1 when any case shared with the baseline got slower than
+(1 + --threshold) times its baseline time; cases that look regressed are
+re-measured up to --retries times first, keeping their best time, since a
+single noisy sample on a shared machine easily exceeds the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+MIN_SAMPLE_S = 0.02  # small inputs are looped until a sample takes at least this long
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> tuple[float, float]:
+    """(best, median) seconds per call."""
+    fn()  # warm up; also sizes the inner loop
+    t0 = time.perf_counter()
+    fn()
+    loops = max(1, int(MIN_SAMPLE_S / max(time.perf_counter() - t0, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - t0) / loops)
+    return min(samples), statistics.median(samples)
+
+
+def _cases() -> dict[str, Callable[[int], Callable[[], Any]]]:
+    """name -> setup(size) returning the call to time. Imports are deferred so
+    that main() can point DATA_DIR at a scratch directory first."""
+    from backend.app.api.routes import _run_hash
+    from backend.app.core.graph import _extract_skills, _norm_text, run_minimal_graph
+    from backend.app.models.schemas import RunRequest
+    from backend.app.storage.artifacts import write_artifact
+    from backend.app.storage.db import ensure_dirs, get_session
+
+    from .synth import document, pair
+
+    def norm_text(size: int) -> Callable[[], Any]:
+        text = document("resume", size)
+        return lambda: _norm_text(text)
+
+    def extract_skills(size: int) -> Callable[[], Any]:
+        text = _norm_text(document("resume", size))
+        return lambda: _extract_skills(text)
+
+    def graph(size: int) -> Callable[[], Any]:
+        resume, jd = pair(size)
+        return lambda: run_minimal_graph(resume, jd)  # no feature cache: always computes
+
+    def run_hash(size: int) -> Callable[[], Any]:
+        # what POST /runs does before touching the database: validate, then hash
+        resume, jd = pair(size)
+        body = {"resume_text": resume, "jd_text": jd, "params": {"top_k": 5}}
+        return lambda: _run_hash(RunRequest.model_validate(body))
+
+    def artifact(size: int) -> Callable[[], Any]:
+        ensure_dirs()
+        text = document("resume", size)
+        n = 0
+
+        def call() -> None:
+            nonlocal n
+            n += 1  # distinct content each time, so every call writes a new blob
+            with get_session() as s:
+                write_artifact(s, f"bench-{size}", f"a{n}.txt", "text", "text/plain", text + str(n))
+
+        return call
+
+    return {
+        "norm_text": norm_text,
+        "extract_skills": extract_skills,
+        "graph": graph,
+        "run_hash": run_hash,
+        "write_artifact": artifact,
+    }
+
+
+def run(
+    cases: Iterable[str] | None = None, sizes: Iterable[int] | None = None, repeat: int = 5
+) -> dict[str, dict[str, float]]:
+    """Time the selected cases; keys are "case/size"."""
+    from .synth import SIZES
+
+    available = _cases()
+    names = list(cases or available)
+    unknown = set(names) - available.keys()
+    if unknown:
+        raise ValueError(f"unknown cases {sorted(unknown)}; have {sorted(available)}")
+    results: dict[str, dict[str, float]] = {}
+    for name in names:
+        for size in sizes or SIZES:
+            best, median = _time(available[name](size), repeat)
+            results[f"{name}/{size}"] = {
+                "seconds": best,
+                "median": median,
+                "chars": size,
+                "mb_s": size / best / 1e6,
+            }
+            print(
+                f"{name + '/' + str(size):<28}{best * 1000:>12.3f} ms{size / best / 1e6:>10.1f} MB/s"
+            )
+    return results
+
+
+def compare(
+    current: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """Cases slower than (1 + threshold) x baseline. Cases missing on either side are skipped."""
+    regressions = []
+    print(f"{'case':<28}{'baseline ms':>14}{'current ms':>14}{'change':>9}")
+    for key in sorted(current.keys() & baseline.keys()):
+        old, new = baseline[key]["seconds"], current[key]["seconds"]
+        change = new / old - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSED"
+        print(f"{key:<28}{old * 1000:>14.3f}{new * 1000:>14.3f}{change * 100:>8.1f}%{flag}")
+    return regressions
+
+
+def _meta() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _load(path: str) -> dict[str, dict[str, float]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", help="comma-separated subset of the cases")
+    ap.add_argument("--sizes", help="comma-separated document sizes in chars")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="write the results here as JSON")
+    ap.add_argument("--current", help="compare this saved result instead of running")
+    ap.add_argument("--baseline", help="saved result to compare against")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    ap.add_argument("--retries", type=int, default=2)
+    args = ap.parse_args(argv)
+
+    if args.current:
+        results = _load(args.current)
+    else:
+        os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_suite_")
+        results = run(
+            args.cases.split(",") if args.cases else None,
+            [int(s) for s in args.sizes.split(",")] if args.sizes else None,
+            args.repeat,
+        )
+    baseline = _load(args.baseline) if args.baseline else {}
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+    for _ in range(0 if args.current else args.retries):
+        if not regressions:
+            break
+        print(f"re-measuring {len(regressions)} case(s)")
+        for key in regressions:
+            name, size = key.rsplit("/", 1)
+            again = run([name], [int(size)], args.repeat)[key]
+            if again["seconds"] < results[key]["seconds"]:
+                results[key] = again
+        regressions = compare(results, baseline, args.threshold)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": _meta(), "results": results}, f, indent=2, sort_keys=True)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/synth.py
+"""Seeded synthetic resumes and job descriptions of any size.
+
+The same (kind, chars, seed) always yields the same text, so benchmark numbers
+from different commits are comparable. Documents look like pasted PDF text:
+section headings, bullets, CRLF line endings, tabs, the odd form feed and
+non-ASCII punctuation, with lexicon skills and their aliases spread through
+ordinary prose.
+"""
+
+from __future__ import annotations
+
+import random
+
+from backend.app.api.routes import MAX_LEN
+from backend.app.core.graph import ALIAS, SKILL_PHRASES
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000, MAX_LEN)
+
+SKILLS = sorted(
+    SKILL_PHRASES
+    | set(ALIAS)
+    | {"python", "fastapi", "docker", "kubernetes", "aws", "sql", "react", "terraform", "go"}
+)
+VERBS = ["Built", "Led", "Designed", "Shipped", "Migrated", "Scaled", "Owned", "Automated"]
+NOUNS = ["pipeline", "service", "platform", "dashboard", "API", "model", "cluster", "team"]
+FILLER = (
+    "the a of and to for with on across using into reducing improving latency cost "
+    "customers users data production reliability quarterly revenue by % weeks"
+).split()
+SECTIONS = {
+    "resume": ["SUMMARY", "EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION"],
+    "jd": ["About the role", "Responsibilities", "Requirements", "Nice to have", "Benefits"],
+}
+
+
+def _bullet(rnd: random.Random) -> str:
+    words = [rnd.choice(VERBS), "a", rnd.choice(NOUNS)]
+    for _ in range(rnd.randint(6, 18)):
+        words.append(rnd.choice(SKILLS) if rnd.random() < 0.15 else rnd.choice(FILLER))
+    if rnd.random() < 0.2:
+        words.append(f"{rnd.randint(2, 90)}%")
+    return rnd.choice(("- ", "• ", "* ", "\t")) + " ".join(words) + rnd.choice((".", ";", ""))
+
+
+def document(kind: str, chars: int, seed: int = 0) -> str:
+    """A `kind` ("resume" or "jd") document of exactly `chars` characters."""
+    rnd = random.Random(f"{kind}:{chars}:{seed}")
+    parts: list[str] = []
+    n = 0
+    while n < chars:
+        heading = rnd.choice(SECTIONS[kind])
+        block = [heading.upper() if rnd.random() < 0.5 else heading]
+        block += [_bullet(rnd) for _ in range(rnd.randint(3, 8))]
+        if rnd.random() < 0.1:
+            block.append("\x0c")  # page break left by PDF extraction
+        if rnd.random() < 0.1:
+            block.append("Zürich – São Paulo — remote ✓")
+        text = "\r\n".join(block) + "\r\n\r\n"
+        parts.append(text)
+        n += len(text)
+    return "".join(parts)[:chars]
+
+
+def pair(chars: int, seed: int = 0) -> tuple[str, str]:
+    """(resume, jd) with the JD a tenth of the resume's size, at least 1 KB."""
+    return document("resume", chars, seed), document("jd", max(1_000, chars // 10), seed)
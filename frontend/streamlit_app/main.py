@@ -1,5 +1,6 @@
 # streamlit_app/main.py
 import asyncio
+import json
 import os
 
 import httpx
@@ -26,21 +27,38 @@ status_placeholder = st.empty()
 artifacts_placeholder = st.empty()
 
 
+def show_status(run_id: str, data: dict) -> bool:
+    """Render a status event; True once the run is terminal."""
+    if data["status"] == "succeeded":
+        status_placeholder.success(f"Run `{run_id}`: succeeded ✅")
+        return True
+    if data["status"] == "failed":
+        status_placeholder.error(f"Run `{run_id}`: failed ❌ — {data.get('error')}")
+        return True
+    status_placeholder.info(f"Run `{run_id}`: {data['status']}…")
+    return False
+
+
 async def poll_status(run_id: str):
     status_placeholder.info(f"Run `{run_id}` queued…")
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # the server pushes status changes; no read timeout between events
+    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=None)) as client:
+        try:
+            async with client.stream("GET", f"{API_BASE}/runs/{run_id}/events") as r:
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if line.startswith("data: "):
+                        data = json.loads(line[len("data: ") :])
+                        if show_status(run_id, data):
+                            return data
+        except httpx.HTTPError:
+            pass  # stream dropped (proxy, restart): fall back to long-polling
         while True:
-            r = await client.get(f"{API_BASE}/runs/{run_id}")
+            r = await client.get(f"{API_BASE}/runs/{run_id}", params={"wait": 30})
             r.raise_for_status()
             data = r.json()
-            if data["status"] == "succeeded":
-                status_placeholder.success(f"Run `{run_id}`: succeeded ✅")
-                return data
-            if data["status"] == "failed":
-                status_placeholder.error(f"Run `{run_id}`: failed ❌ — {data.get('error')}")
+            if show_status(run_id, data):
                 return data
-            status_placeholder.info(f"Run `{run_id}`: {data['status']}…")
-            await asyncio.sleep(1.0)
 
 
 if run_btn:
@@ -48,8 +66,11 @@ if run_btn:
         st.warning("Please paste both Resume and Job Description.")
     else:
         with st.spinner("Submitting…"):
+            # small payloads are scored inline by the API (200); others are queued (202)
             resp = httpx.post(
                 f"{API_BASE}/runs",
+                params={"mode": "sync"},
+                timeout=30.0,
                 json={
                     "resume_text": resume_text,
                     "jd_text": jd_text,
@@ -59,8 +80,10 @@ if run_btn:
             if resp.status_code not in (200, 202):
                 st.error(f"Error: {resp.text}")
             else:
-                run_id = resp.json()["run_id"]
-                data = asyncio.run(poll_status(run_id))
+                data = resp.json()
+                run_id = data["run_id"]
+                if not show_status(run_id, data):
+                    data = asyncio.run(poll_status(run_id))
                 if data and data.get("artifacts"):
                     with artifacts_placeholder.container():
                         st.subheader("Artifacts")
@@ -0,0 +1,32 @@
+# migrations/versions/0002_run_kind.py
+"""add runs.kind for batch runs
+
+Revision ID: 0002_run_kind
+Revises: 0001_baseline
+Create Date: 2025-10-20 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002_run_kind"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("runs") as batch:
+        batch.add_column(
+            sa.Column(
+                "kind",
+                sa.Enum("match", "batch", name="runkind"),
+                nullable=False,
+                server_default="match",
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("runs") as batch:
+        batch.drop_column("kind")
@@ -0,0 +1,39 @@
+# migrations/versions/0003_job_index.py
+"""inverted skill index over job descriptions
+
+Revision ID: 0003_job_index
+Revises: 0002_run_kind
+Create Date: 2025-10-21 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_job_index"
+down_revision = "0002_run_kind"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_index_docs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("jd_hash", sa.String(), unique=True),
+        sa.Column("run_id", sa.String()),
+        sa.Column("n_terms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "job_index_postings",
+        sa.Column("term", sa.String(), primary_key=True),
+        sa.Column("doc_id", sa.Integer(), primary_key=True),
+        sqlite_with_rowid=False,
+    )
+    op.create_index("ix_job_index_postings_doc", "job_index_postings", ["doc_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_index_postings_doc", table_name="job_index_postings")
+    op.drop_table("job_index_postings")
+    op.drop_table("job_index_docs")
@@ -0,0 +1,31 @@
+# migrations/versions/0004_blobs.py
+"""content-addressed artifact blobs with reference counts
+
+Revision ID: 0004_blobs
+Revises: 0003_job_index
+Create Date: 2025-10-22 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_blobs"
+down_revision = "0003_job_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing artifacts keep their per-run files (Artifact.path); only new
+    # artifacts are written to and counted in the blob store.
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(), primary_key=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("blobs")
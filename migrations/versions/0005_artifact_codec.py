@@ -0,0 +1,57 @@
+# migrations/versions/0005_artifact_codec.py
+"""compressed artifact storage: codec and stored size
+
+Revision ID: 0005_artifact_codec
+Revises: 0004_blobs
+Create Date: 2025-10-23 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_artifact_codec"
+down_revision = "0004_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("artifacts") as batch:
+        batch.add_column(sa.Column("codec", sa.String(), nullable=False, server_default="identity"))
+        batch.add_column(sa.Column("stored_bytes", sa.Integer(), nullable=True))
+
+    # a digest may now be stored once per codec: blobs are keyed by (sha256, codec)
+    op.create_table(
+        "blobs_new",
+        sa.Column("sha256", sa.String(), primary_key=True),
+        sa.Column("codec", sa.String(), primary_key=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO blobs_new (sha256, codec, size_bytes, refcount, created_at) "
+        "SELECT sha256, 'identity', size_bytes, refcount, created_at FROM blobs"
+    )
+    op.drop_table("blobs")
+    op.rename_table("blobs_new", "blobs")
+
+
+def downgrade() -> None:
+    # gzip blobs cannot be described by the old schema; only identity blobs are kept
+    op.create_table(
+        "blobs_old",
+        sa.Column("sha256", sa.String(), primary_key=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO blobs_old (sha256, size_bytes, refcount, created_at) "
+        "SELECT sha256, size_bytes, refcount, created_at FROM blobs WHERE codec = 'identity'"
+    )
+    op.drop_table("blobs")
+    op.rename_table("blobs_old", "blobs")
+    with op.batch_alter_table("artifacts") as batch:
+        batch.drop_column("stored_bytes")
+        batch.drop_column("codec")
@@ -0,0 +1,132 @@
+# migrations/versions/0006_documents.py
+"""run texts move to a content-addressed, compressed documents table
+
+Revision ID: 0006_documents
+Revises: 0005_artifact_codec
+Create Date: 2025-10-24 00:00:00
+"""
+
+import hashlib
+import zlib
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_documents"
+down_revision = "0005_artifact_codec"
+branch_labels = None
+depends_on = None
+
+BATCH = 500  # runs converted per round trip
+
+
+def _document(text: str) -> dict:
+    # same encoding as storage.models.encode_document, frozen here
+    data = text.encode("utf-8")
+    packed = zlib.compress(data, 6)
+    codec, body = ("zlib", packed) if len(packed) < len(data) else ("identity", data)
+    return {
+        "id": hashlib.sha256(data).hexdigest(),
+        "codec": codec,
+        "size_bytes": len(data),
+        "body": body,
+        "created_at": datetime.now(UTC),
+    }
+
+
+def upgrade() -> None:
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("codec", sa.String(), nullable=False, server_default="zlib"),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    with op.batch_alter_table("runs") as batch:
+        batch.add_column(sa.Column("resume_doc_id", sa.String(), nullable=True))
+        batch.add_column(sa.Column("jd_doc_id", sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    runs = sa.table(
+        "runs",
+        sa.column("id", sa.String()),
+        sa.column("resume_text", sa.Text()),
+        sa.column("jd_text", sa.Text()),
+        sa.column("resume_doc_id", sa.String()),
+        sa.column("jd_doc_id", sa.String()),
+    )
+    documents = sa.table(
+        "documents",
+        sa.column("id", sa.String()),
+        sa.column("codec", sa.String()),
+        sa.column("size_bytes", sa.Integer()),
+        sa.column("body", sa.LargeBinary()),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+    )
+    insert_doc = documents.insert().prefix_with("OR IGNORE")
+    set_ids = (
+        runs.update()
+        .where(runs.c.id == sa.bindparam("run_id"))
+        .values(resume_doc_id=sa.bindparam("r"), jd_doc_id=sa.bindparam("j"))
+    )
+    last = ""
+    while True:
+        # keyset over the primary key: each batch reads only its own rows' texts
+        rows = conn.execute(
+            sa.select(runs.c.id, runs.c.resume_text, runs.c.jd_text)
+            .where(runs.c.id > last)
+            .order_by(runs.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        docs: dict[str, dict] = {}
+        ids = []
+        for run_id, resume, jd in rows:
+            r, j = _document(resume or ""), _document(jd or "")
+            docs.setdefault(r["id"], r)
+            docs.setdefault(j["id"], j)
+            ids.append({"run_id": run_id, "r": r["id"], "j": j["id"]})
+        conn.execute(insert_doc, list(docs.values()))
+        conn.execute(set_ids, ids)
+        last = rows[-1].id
+
+    with op.batch_alter_table("runs") as batch:
+        batch.alter_column("resume_doc_id", nullable=False)
+        batch.alter_column("jd_doc_id", nullable=False)
+        batch.drop_column("resume_text")
+        batch.drop_column("jd_text")
+        batch.create_foreign_key("fk_runs_resume_doc", "documents", ["resume_doc_id"], ["id"])
+        batch.create_foreign_key("fk_runs_jd_doc", "documents", ["jd_doc_id"], ["id"])
+    op.create_index("ix_runs_resume_doc_id", "runs", ["resume_doc_id"])
+    op.create_index("ix_runs_jd_doc_id", "runs", ["jd_doc_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_jd_doc_id", table_name="runs")
+    op.drop_index("ix_runs_resume_doc_id", table_name="runs")
+    with op.batch_alter_table("runs") as batch:
+        batch.add_column(sa.Column("resume_text", sa.Text()))
+        batch.add_column(sa.Column("jd_text", sa.Text()))
+
+    conn = op.get_bind()
+    conn.connection.create_function(
+        "doc_text", 2, lambda codec, body: _decode(codec, body), deterministic=True
+    )
+    op.execute(
+        "UPDATE runs SET "
+        "resume_text = (SELECT doc_text(codec, body) FROM documents WHERE id = resume_doc_id), "
+        "jd_text = (SELECT doc_text(codec, body) FROM documents WHERE id = jd_doc_id)"
+    )
+    with op.batch_alter_table("runs") as batch:
+        batch.drop_constraint("fk_runs_jd_doc", type_="foreignkey")
+        batch.drop_constraint("fk_runs_resume_doc", type_="foreignkey")
+        batch.drop_column("jd_doc_id")
+        batch.drop_column("resume_doc_id")
+    op.drop_table("documents")
+
+
+def _decode(codec: str, body: bytes) -> str:
+    return (zlib.decompress(body) if codec == "zlib" else body).decode("utf-8")
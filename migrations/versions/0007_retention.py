@@ -0,0 +1,32 @@
+# migrations/versions/0007_retention.py
+"""retention: (status, created_at) index and auto_vacuum=INCREMENTAL
+
+Revision ID: 0007_retention
+Revises: 0006_documents
+Create Date: 2025-10-25 00:00:00
+"""
+
+from alembic import op
+
+revision = "0007_retention"
+down_revision = "0006_documents"
+branch_labels = None
+depends_on = None
+
+
+def _set_auto_vacuum(mode: str) -> None:
+    # switching modes on an existing file only takes effect with a full VACUUM,
+    # which cannot run inside a transaction (and rewrites the whole file once)
+    with op.get_context().autocommit_block():
+        op.execute(f"PRAGMA auto_vacuum={mode}")
+        op.execute("VACUUM")
+
+
+def upgrade() -> None:
+    op.create_index("ix_runs_status_created_at", "runs", ["status", "created_at"])
+    _set_auto_vacuum("INCREMENTAL")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_status_created_at", table_name="runs")
+    _set_auto_vacuum("NONE")
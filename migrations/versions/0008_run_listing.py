@@ -0,0 +1,27 @@
+# migrations/versions/0008_run_listing.py
+"""keyset indexes for GET /runs: (created_at, id) and (status, created_at, id)
+
+Revision ID: 0008_run_listing
+Revises: 0007_retention
+Create Date: 2025-10-26 00:00:00
+"""
+
+from alembic import op
+
+revision = "0008_run_listing"
+down_revision = "0007_retention"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_runs_created_id", "runs", ["created_at", "id"])
+    # supersedes (status, created_at): the id tiebreak keeps pages in index order
+    op.create_index("ix_runs_status_created_id", "runs", ["status", "created_at", "id"])
+    op.drop_index("ix_runs_status_created_at", table_name="runs")
+
+
+def downgrade() -> None:
+    op.create_index("ix_runs_status_created_at", "runs", ["status", "created_at"])
+    op.drop_index("ix_runs_status_created_id", table_name="runs")
+    op.drop_index("ix_runs_created_id", table_name="runs")
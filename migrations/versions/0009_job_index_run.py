@@ -0,0 +1,22 @@
+# migrations/versions/0009_job_index_run.py
+"""index job_index_docs.run_id: retention looks up the JDs of the runs it deletes
+
+Revision ID: 0009_job_index_run
+Revises: 0008_run_listing
+Create Date: 2025-10-27 00:00:00
+"""
+
+from alembic import op
+
+revision = "0009_job_index_run"
+down_revision = "0008_run_listing"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_job_index_docs_run_id", "job_index_docs", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_index_docs_run_id", table_name="job_index_docs")
@@ -1,11 +1,14 @@
 # tests/test_api_contract.py
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from backend.app.core.dedupe import RECENT_RUNS
 from backend.app.main import app
-from backend.app.storage.db import ensure_dirs
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.models import Run, RunStatus
 
 
 @pytest.mark.anyio
@@ -40,3 +43,127 @@ async def test_create_and_poll_run(monkeypatch):
         body = r2.json()
         assert body["run_id"] == run_id
         assert body["status"] in ("queued", "running", "succeeded", "failed")
+
+
+@pytest.mark.anyio
+async def test_sync_mode_returns_finished_run_inline(monkeypatch):
+    import backend.app.api.routes as routes_mod
+
+    enqueued = []
+
+    async def _record_enqueue(redis, run_id, **kwargs):
+        enqueued.append((run_id, kwargs.get("defer_by")))
+
+    monkeypatch.setattr(routes_mod, "enqueue_run", _record_enqueue)
+    monkeypatch.setattr(app.state, "inline", routes_mod.create_inline_ctx(processes=0), False)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        payload = {"resume_text": f"Python SQL Docker {uuid.uuid4()}", "jd_text": "Python AWS"}
+        r = await ac.post("/runs", params={"mode": "sync"}, json=payload)
+        assert r.status_code == 200
+        body = r.json()
+        assert body["status"] == "succeeded"
+        assert body["scorecard"]["overall_score"] > 0
+        assert "scorecard.json" in {a["name"] for a in body["artifacts"]}
+
+        # a repeat is answered from the finished run
+        again = await ac.post("/runs", params={"mode": "sync"}, json=payload)
+        assert again.status_code == 200 and again.json()["run_id"] == body["run_id"]
+
+        # no free inline slot: queued like an async submission
+        app.state.inline["admission"] = routes_mod.asyncio.Semaphore(0)
+        payload["resume_text"] += " busy"
+        r = await ac.post("/runs", params={"mode": "sync"}, json=payload)
+        assert r.status_code == 202 and r.json()["status"] == "queued"
+        assert "scorecard" not in r.json()
+    # the inline run's deferred fallback (a worker takes over if the API dies), then the busy one
+    (inline_id, defer), (queued_id, no_defer) = enqueued
+    assert (inline_id, queued_id, no_defer) == (body["run_id"], r.json()["run_id"], None)
+    assert defer > routes_mod.orphaned_after(len(payload["resume_text"]))
+
+
+@pytest.mark.anyio
+async def test_fallback_job_leaves_a_failed_inline_run_failed(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import backend.app.api.routes as routes_mod
+    import backend.app.core.queue as queue_mod
+    import backend.app.core.run_manager as run_manager_mod
+
+    enqueued = []
+
+    async def _record_enqueue(redis, run_id, **kwargs):
+        enqueued.append((run_id, kwargs))
+
+    def _broken(*args, **kwargs):
+        raise RuntimeError("inline compute failed")
+
+    published = []
+    monkeypatch.setattr(run_manager_mod, "_notifier", lambda *a: published.append(a[:2]))
+    monkeypatch.setattr(routes_mod, "enqueue_run", _record_enqueue)
+    monkeypatch.setattr(app.state, "inline", routes_mod.create_inline_ctx(processes=0), False)
+    monkeypatch.setattr(queue_mod, "compute_match", _broken)
+    payload = {"resume_text": f"Python failing inline {uuid.uuid4()}", "jd_text": "Python"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.post("/runs", params={"mode": "sync"}, json=payload)
+    assert r.json()["status"] == "failed"
+    error = r.json()["error"]
+
+    # later the deferred fallback fires on a healthy worker
+    monkeypatch.undo()
+    monkeypatch.setattr(run_manager_mod, "_notifier", lambda *a: published.append(a[:2]))
+    [(run_id, kwargs)] = enqueued
+    assert kwargs["takeover"] is True
+    published.clear()
+    pool = ThreadPoolExecutor(max_workers=1)
+    await queue_mod.run_match_job({"compute_pool": pool}, run_id, takeover=kwargs["takeover"])
+    pool.shutdown()
+    with get_session() as s:
+        run = s.get(Run, run_id)
+        assert (run.status, run.error) == (RunStatus.failed, error)
+    assert published == []
+
+
+@pytest.mark.anyio
+async def test_stale_in_flight_runs_are_failed_not_reused(monkeypatch):
+    import backend.app.api.routes as routes_mod
+
+    enqueued = []
+
+    async def _record_enqueue(redis, run_id, **kwargs):
+        enqueued.append(run_id)
+
+    async def _record_bulk(redis, run_ids, queues):
+        enqueued.extend(run_ids)
+
+    monkeypatch.setattr(routes_mod, "enqueue_run", _record_enqueue)
+    monkeypatch.setattr(routes_mod, "enqueue_runs_bulk", _record_bulk)
+    payload = {"resume_text": f"Python {uuid.uuid4()}", "jd_text": "Python", "params": {}}
+
+    def _age(run_id, status, hours):
+        with get_session() as s:
+            run = s.get(Run, run_id)
+            run.status = status
+            run.created_at = run.started_at = datetime.now(UTC) - timedelta(hours=hours)
+            s.commit()
+        RECENT_RUNS.clear()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = (await ac.post("/runs", json=payload)).json()["run_id"]
+        _age(first, RunStatus.running, 0.5)  # a long job, still within its timeout
+        assert (await ac.post("/runs", json=payload)).json()["run_id"] == first
+
+        _age(first, RunStatus.running, 2)  # its worker died with it
+        second = (await ac.post("/runs", json=payload)).json()["run_id"]
+        assert second != first
+        lost = (await ac.get(f"/runs/{first}")).json()
+        assert lost["status"] == "failed" and "abandoned" in lost["error"]
+
+        _age(second, RunStatus.queued, 25)  # its ARQ job expired unstarted
+        r = await ac.post("/runs/bulk", json={"runs": [payload]})
+        third = r.json()["runs"][0]["run_id"]
+        assert third not in (first, second)
+        assert (await ac.get(f"/runs/{second}")).json()["status"] == "failed"
+    assert enqueued == [first, second, third]
@@ -0,0 +1,237 @@
+# tests/test_artifacts.py
+import hashlib
+import os
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from backend.app.main import app
+from backend.app.storage import artifacts as artifacts_mod
+from backend.app.storage.artifacts import (
+    ArtifactBatch,
+    blob_path,
+    collect_blobs,
+    iter_decoded,
+    list_artifacts_for_run,
+    release_artifacts,
+    write_artifact,
+)
+from backend.app.storage.db import ENGINE, ensure_dirs, get_session
+from backend.app.storage.models import Blob, Run, RunStatus
+
+
+def _new_run(s, tag: str) -> str:
+    run = Run(payload_hash=tag, status=RunStatus.running, resume_text="r", jd_text="j")
+    s.add(run)
+    s.commit()
+    return run.id
+
+
+def _tmp_files(digest: str) -> list[str]:
+    return [f for f in os.listdir(os.path.dirname(blob_path(digest))) if f.startswith(".tmp_")]
+
+
+def test_batch_publishes_blobs_rows_and_status_together(monkeypatch):
+    ensure_dirs()
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(artifacts_mod.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    tag = uuid.uuid4().hex
+
+    with get_session() as s:
+        run_id = _new_run(s, tag)
+        with ArtifactBatch(s, run_id) as batch:
+            batch.add("scorecard.json", "scorecard", None, {"overall_score": 1, "tag": tag})
+            batch.add("scorecard.md", "scorecard", None, f"# Scorecard {tag}")
+            batch.add("graph_trace.jsonl", "trace", None, f'{{"tag": "{tag}"}}\n')
+            s.get(Run, run_id).status = RunStatus.succeeded
+            batch.commit()
+
+        assert s.get(Run, run_id).status == RunStatus.succeeded
+        arts = list_artifacts_for_run(s, run_id)
+        assert sorted(a.name for a in arts) == [
+            "graph_trace.jsonl",
+            "scorecard.json",
+            "scorecard.md",
+        ]
+        for a in arts:
+            assert a.path == blob_path(a.sha256, a.codec)
+            assert os.path.getsize(a.path) == a.stored_bytes
+            logical = b"".join(iter_decoded(a.path, a.codec))
+            assert hashlib.sha256(logical).hexdigest() == a.sha256
+            assert len(logical) == a.size_bytes
+            assert s.get(Blob, (a.sha256, a.codec)).refcount == 1
+        shard_dirs = {os.path.dirname(a.path) for a in arts}
+    assert len(synced) == 3 + len(shard_dirs)  # each file once, each blob directory once
+
+
+def test_failed_commit_leaves_nothing_referenced(monkeypatch):
+    ensure_dirs()
+    tag = uuid.uuid4().hex
+    with get_session() as s:
+        run_id = _new_run(s, tag)
+
+        def _boom():
+            raise RuntimeError("disk full")
+
+        kept = write_artifact(s, _new_run(s, f"{tag}-other"), "gaps.csv", "gaps", None, tag)
+        kept_path = blob_path(kept.sha256, kept.codec)
+        with ArtifactBatch(s, run_id) as batch:
+            a = batch.add("scorecard.md", "scorecard", None, f"# Scorecard {tag}")
+            batch.add("gaps.csv", "gaps", None, tag)  # an existing blob
+            s.get(Run, run_id).status = RunStatus.succeeded
+            monkeypatch.setattr(s, "commit", _boom)
+            with pytest.raises(RuntimeError):
+                batch.commit()
+        monkeypatch.undo()
+
+        assert s.get(Run, run_id).status == RunStatus.running
+        assert list_artifacts_for_run(s, run_id) == []
+        assert s.get(Blob, (a.sha256, a.codec)) is None
+    assert _tmp_files(a.sha256) == []
+    assert not os.path.exists(blob_path(a.sha256, a.codec))  # no row, so no orphan either
+    assert os.path.exists(kept_path)
+
+
+def test_identical_artifacts_share_one_blob_until_released():
+    ensure_dirs()
+    body = f"# Same scorecard {uuid.uuid4().hex}"
+    with get_session() as s:
+        first = _new_run(s, "cas-first")
+        second = _new_run(s, "cas-second")
+        a1 = write_artifact(s, first, "scorecard.md", "scorecard", None, body)
+        a2 = write_artifact(s, second, "scorecard.md", "scorecard", None, body)
+        key = (a1.sha256, a1.codec)
+        assert (a2.sha256, a2.codec) == key and a1.path == a2.path
+        assert s.get(Blob, key).refcount == 2
+
+        assert release_artifacts(s, first) == 1
+        s.commit()
+        collect_blobs(s)
+        assert os.path.exists(blob_path(*key))
+        assert s.get(Blob, key).refcount == 1
+
+        release_artifacts(s, second)
+        s.commit()
+        freed, _ = collect_blobs(s)
+        assert freed >= 1
+        assert not os.path.exists(blob_path(*key))
+        assert s.get(Blob, key) is None
+
+
+def test_discard_removes_staged_files():
+    ensure_dirs()
+    with get_session() as s:
+        run_id = _new_run(s, "artifact-batch-discard")
+        with ArtifactBatch(s, run_id) as batch:
+            a = batch.add("scorecard.md", "scorecard", None, f"# draft {uuid.uuid4().hex}")
+        assert _tmp_files(a.sha256) == []
+        assert not os.path.exists(a.path)
+        with pytest.raises(ValueError):
+            ArtifactBatch(s, run_id).add("../escape", "x", None, "")
+
+
+def test_large_artifacts_are_stored_gzipped():
+    ensure_dirs()
+    trace = "".join(f'{{"node": "n{i}", "ok": true}}\n' for i in range(2000))
+    with get_session() as s:
+        run_id = _new_run(s, "artifact-gzip")
+        a = write_artifact(s, run_id, "graph_trace.jsonl", "trace", None, trace)
+        assert a.codec == "gzip" and a.path.endswith(".gz")
+        assert a.stored_bytes < a.size_bytes // 5
+        assert os.path.getsize(a.path) == a.stored_bytes
+        assert b"".join(iter_decoded(a.path, a.codec)).decode() == trace
+        # identity-coded copies of the same content are separate blobs
+        b = ArtifactBatch(s, run_id, codec="identity")
+        ident = b.add("graph_trace.jsonl", "trace", None, trace)
+        b.commit()
+        assert ident.sha256 == a.sha256 and ident.path != a.path
+
+
+@pytest.mark.anyio
+async def test_download_negotiates_content_encoding():
+    ensure_dirs()
+    trace = "".join(f'{{"node": "n{i}", "ok": true}}\n' for i in range(2000))
+    with get_session() as s:
+        run_id = _new_run(s, f"artifact-http-{uuid.uuid4().hex}")
+        a = write_artifact(s, run_id, "graph_trace.jsonl", "trace", None, trace)
+        stored = open(a.path, "rb").read()
+
+    url = f"/artifacts/{run_id}/graph_trace.jsonl"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        async with ac.stream("GET", url, headers={"Accept-Encoding": "br, gzip;q=0.8"}) as r:
+            raw = b"".join([c async for c in r.aiter_raw()])
+        assert r.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in r.headers["vary"]
+        assert raw == stored  # passed through, not re-encoded
+
+        for ae in ("identity", "gzip;q=0, *;q=1"):
+            r = await ac.get(url, headers={"Accept-Encoding": ae})
+            assert "content-encoding" not in r.headers
+            assert int(r.headers["content-length"]) == len(trace.encode())
+            assert r.text == trace
+
+        r = await ac.get(f"/artifacts/{run_id}")
+        (meta,) = r.json()["files"]
+        assert meta["codec"] == "gzip"
+        assert meta["size_bytes"] == len(trace.encode())
+        assert meta["stored_bytes"] == len(stored)
+
+
+@pytest.mark.anyio
+async def test_download_etag_304_range_and_single_lookup():
+    ensure_dirs()
+    body = "".join(f"line {i:05d}\n" for i in range(1000))
+    with get_session() as s:
+        run_id = _new_run(s, f"artifact-cache-{uuid.uuid4().hex}")
+        a = write_artifact(s, run_id, "gaps.csv", "gaps", None, body)
+        digest = a.sha256
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    url = f"/artifacts/{run_id}/gaps.csv"
+    transport = ASGITransport(app=app)
+    event.listen(ENGINE, "before_cursor_execute", _count)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            r = await ac.get(url, headers={"Accept-Encoding": "identity"})
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", _count)
+    assert len(statements) == 1 and "artifacts" in statements[0]
+    assert r.headers["etag"] == f'"{digest}"'
+    assert "immutable" in r.headers["cache-control"]
+    assert r.text == body
+
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        h = {"Accept-Encoding": "identity", "If-None-Match": f'"other", W/"{digest}"'}
+        r = await ac.get(url, headers=h)
+        assert r.status_code == 304 and r.content == b""
+        assert r.headers["etag"] == f'"{digest}"'
+
+        # the gzip representation has its own validator
+        r = await ac.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{digest}"'})
+        assert r.status_code == 200
+        gz_etag = r.headers["etag"]
+        assert gz_etag == f'"{digest}-gzip"'
+        r = await ac.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gz_etag})
+        assert r.status_code == 304
+
+        # ranges apply to the stored gzip bytes
+        stored = open(blob_path(digest, "gzip"), "rb").read()
+        h = {"Accept-Encoding": "gzip", "Range": "bytes=0-99"}
+        async with ac.stream("GET", url, headers=h) as r:
+            raw = b"".join([c async for c in r.aiter_raw()])
+        assert r.status_code == 206
+        assert r.headers["content-range"] == f"bytes 0-99/{len(stored)}"
+        assert raw == stored[:100]
+
+        r = await ac.get(f"/artifacts/{run_id}/missing.csv")
+        assert r.status_code == 404 and r.json()["detail"] == "artifact not found"
+        r = await ac.get("/artifacts/no-such-run/gaps.csv")
+        assert r.json()["detail"] == "run not found"
@@ -0,0 +1,76 @@
+# tests/test_batch.py
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.core.batch import score_batch
+from backend.app.core.graph import run_minimal_graph
+from backend.app.main import app
+from backend.app.storage.db import ensure_dirs
+
+RESUMES = [
+    "Built APIs in Python & FastAPI. Used PostgreSQL and Docker. Deployed on AWS.",
+    "Deep learning researcher: PyTorch, computer vision, LLM fine-tuning, Python.",
+]
+JDS = [
+    "Looking for a Python developer with FastAPI, PostgreSQL, and AWS experience.",
+    "ML engineer: deep learning, PyTorch, Kubernetes, Go.",
+    "Looking for a Python developer with FastAPI, PostgreSQL, and AWS experience.",
+    "Accountant.",
+]
+
+
+def test_batch_matches_single_runs():
+    out = score_batch(RESUMES, JDS)
+    assert (out["resumes"], out["jds"], out["distinct_jds"]) == (2, 4, 3)
+    assert [r["rank"] for r in out["results"]] == list(range(1, 9))
+    scores = [r["overall_score"] for r in out["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+    for row in out["results"]:
+        sc = run_minimal_graph(RESUMES[row["resume_index"]], JDS[row["jd_index"]]).scorecard
+        assert row["overall_score"] == sc["overall_score"]
+        assert row["dimensions"] == sc["dimensions"]
+        assert row["coverage_terms_overlap"] == sc["coverage_terms_overlap"]
+
+
+def test_batch_top_k():
+    out = score_batch(RESUMES, JDS, top_k=3)
+    assert len(out["results"]) == 3
+
+
+@pytest.mark.anyio
+async def test_create_batch_run(monkeypatch):
+    ensure_dirs()
+    enqueued = []
+
+    async def _fake_enqueue(redis, run_id, **kwargs):
+        enqueued.append(run_id)
+
+    import backend.app.api.routes as routes_mod
+    from backend.app.core.queue import _run_job
+
+    monkeypatch.setattr(routes_mod, "enqueue_batch_run", _fake_enqueue)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        payload = {"resume_texts": RESUMES, "jd_texts": JDS, "params": {"top_k": 5}}
+        r = await ac.post("/runs/batch", json=payload)
+        assert r.status_code == 202
+        run_id = r.json()["run_id"]
+        assert enqueued == [run_id]
+
+        _run_job(run_id, batch=True)
+
+        r2 = await ac.get(f"/runs/{run_id}")
+        assert r2.json()["status"] == "succeeded"
+        r3 = await ac.get(f"/artifacts/{run_id}/batch_results.json")
+        assert r3.status_code == 200
+        assert len(json.loads(r3.content)["results"]) == 5
+
+        for bad in ("5", -1, 0, True):
+            payload["params"] = {"top_k": bad}
+            r4 = await ac.post("/runs/batch", json=payload)
+            assert r4.status_code == 422 and "top_k" in r4.json()["detail"]
+        assert enqueued == [run_id]
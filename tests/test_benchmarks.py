@@ -0,0 +1,34 @@
+# tests/test_benchmarks.py
+import json
+
+from benchmarks import suite
+from benchmarks.synth import document, pair
+
+
+def test_synthetic_documents_are_seeded_and_exact_size():
+    assert document("resume", 5_000, seed=1) == document("resume", 5_000, seed=1)
+    assert document("resume", 5_000, seed=1) != document("resume", 5_000, seed=2)
+    resume, jd = pair(20_000)
+    assert (len(resume), len(jd)) == (20_000, 2_000)
+    assert "\r\n" in resume and "python" in resume.lower()
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {"a/1": {"seconds": 1.0}, "b/1": {"seconds": 1.0}, "gone/1": {"seconds": 1.0}}
+    current = {"a/1": {"seconds": 1.1}, "b/1": {"seconds": 1.3}, "new/1": {"seconds": 9.0}}
+    assert suite.compare(current, baseline, threshold=0.15) == ["b/1"]
+
+
+def test_gate_exits_nonzero_on_saved_regression(tmp_path):
+    results = suite.run(["norm_text", "run_hash"], [1_000], repeat=1)
+    assert set(results) == {"norm_text/1000", "run_hash/1000"}
+    fast = {k: {**v, "seconds": v["seconds"] / 10} for k, v in results.items()}
+
+    def save(name, res):
+        p = tmp_path / name
+        p.write_text(json.dumps({"meta": {}, "results": res}))
+        return str(p)
+
+    current, baseline = save("current.json", results), save("baseline.json", fast)
+    assert suite.main(["--current", current, "--baseline", baseline]) == 1
+    assert suite.main(["--current", current, "--baseline", current]) == 0
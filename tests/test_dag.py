@@ -0,0 +1,97 @@
+# tests/test_dag.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.core.dag import Graph, Memo, Node
+from backend.app.core.graph import run_minimal_graph, skip_nodes
+from backend.app.main import app
+
+
+def _graph(calls: list[str], barrier: threading.Barrier | None = None) -> Graph:
+    def left(x):
+        calls.append("left")
+        if barrier is not None:
+            barrier.wait(timeout=5)  # only passes if "right" runs at the same time
+        return {"l": x + 1}
+
+    def right(x):
+        calls.append("right")
+        if barrier is not None:
+            barrier.wait(timeout=5)
+        return {"r": x * 2}
+
+    return Graph(
+        [
+            Node("join", lambda a, b: {"sum": a + b}, ("l", "r"), ("sum",), memoize=True),
+            Node("left", left, ("x",), ("l",), trace=lambda v: [{"node": "left", "l": v["l"]}]),
+            Node("right", right, ("x",), ("r",), defaults={"r": 0}),
+        ]
+    )
+
+
+def test_independent_nodes_run_concurrently_and_trace_in_declaration_order():
+    g = _graph([], threading.Barrier(2))
+    assert g.inputs == ["x"]
+    assert [n.name for n in g.order][-1] == "join"
+    with ThreadPoolExecutor(2) as pool:
+        values, trace = g.run({"x": 3}, executor=pool)
+    assert values["sum"] == 4 + 6
+    assert trace == [{"node": "left", "l": 4}]
+
+
+def test_memoized_nodes_are_keyed_by_input_values():
+    calls: list[str] = []
+    g = _graph(calls)
+    memo = Memo()
+    assert g.run({"x": 1}, memo=memo)[0]["sum"] == 4
+    assert g.run({"x": 1}, memo=memo)[0]["sum"] == 4
+    assert (memo.hits, memo.misses) == (1, 1)
+    assert g.run({"x": 2}, memo=memo)[0]["sum"] == 7
+    assert len(memo) == 2 and calls.count("left") == 3  # only "join" is memoized
+
+
+def test_skipping_uses_defaults_or_prunes_downstream():
+    calls: list[str] = []
+    g = _graph(calls)
+    values, _ = g.run({"x": 5}, skip={"right"})
+    assert values["sum"] == 6 and "right" not in calls
+    values, trace = g.run({"x": 5}, skip={"left"})
+    assert "sum" not in values and trace == []  # no default for "l": join is skipped too
+    with pytest.raises(ValueError, match="unknown"):
+        g.run({"x": 5}, skip={"nope"})
+    with pytest.raises(ValueError, match="missing graph inputs"):
+        g.run({})
+
+
+def test_cycles_and_duplicate_outputs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        Graph([Node("a", dict, ("b",), ("a",)), Node("b", dict, ("a",), ("b",))])
+    with pytest.raises(ValueError, match="produced by"):
+        Graph([Node("a", dict, (), ("v",)), Node("b", dict, (), ("v",))])
+
+
+def test_match_graph_can_skip_semantic_match():
+    st = run_minimal_graph("Python FastAPI AWS", "Python AWS", skip=["semantic_match"])
+    assert st.semantic_match is None and st.jd_embedding is None
+    assert "semantic_match" not in st.scorecard["dimensions"]
+    assert [e["node"] for e in st.logs] == [
+        "normalize_text",
+        "extract_skills_rule_based",
+        "fuzzy_match",
+        "score_rule_based",
+        "build_scorecard",
+    ]
+
+
+@pytest.mark.anyio
+async def test_skip_nodes_must_list_optional_nodes():
+    assert skip_nodes({"skip_nodes": ["semantic_match"]}) == ("semantic_match",)
+    assert skip_nodes({}) == ()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        for bad in ("semantic_match", ["score_rule_based"], ["nope"], [1]):
+            body = {"resume_text": "python", "jd_text": "python", "params": {"skip_nodes": bad}}
+            r = await ac.post("/runs", json=body)
+            assert r.status_code == 422 and "skip_nodes" in r.json()["detail"]
@@ -0,0 +1,40 @@
+# tests/test_db.py
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from backend.app.main import app
+from backend.app.storage.db import BUSY_TIMEOUT_MS, ensure_dirs, get_session, run_db
+from backend.app.storage.models import Run, RunStatus
+
+
+def test_sqlite_pragmas_on_connect():
+    ensure_dirs()
+    with get_session() as s:
+        assert s.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert s.execute(text("PRAGMA busy_timeout")).scalar() == BUSY_TIMEOUT_MS
+        assert s.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+@pytest.mark.anyio
+async def test_concurrent_polls_run_off_the_event_loop():
+    ensure_dirs()
+
+    def _create(n):
+        with get_session() as s:
+            runs = [
+                Run(payload_hash=f"poll-{i}", status=RunStatus.queued, resume_text="a", jd_text="b")
+                for i in range(n)
+            ]
+            s.add_all(runs)
+            s.commit()
+            return [r.id for r in runs]
+
+    ids = await run_db(_create, 20)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        rs = await asyncio.gather(*(ac.get(f"/runs/{ids[i % 20]}") for i in range(200)))
+    assert all(r.status_code == 200 for r in rs)
+    assert [r.json()["run_id"] for r in rs] == [ids[i % 20] for i in range(200)]
@@ -0,0 +1,79 @@
+# tests/test_documents.py
+import sqlite3
+import uuid
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, func, select
+
+from backend.app.storage.db import ENGINE, ensure_dirs, get_session
+from backend.app.storage.models import Document, Run, RunStatus, document_id, encode_document
+
+
+def test_same_text_is_stored_once_and_compressed():
+    ensure_dirs()
+    jd = f"Python FastAPI AWS {uuid.uuid4()} " * 200
+    with get_session() as s:
+        runs = [
+            Run(payload_hash=f"doc-{i}", resume_text=f"cv {i} {jd}", jd_text=jd) for i in range(3)
+        ]
+        s.add_all(runs)
+        s.commit()
+        ids = [r.id for r in runs]
+    with get_session() as s:
+        doc = s.get(Document, document_id(jd))
+        assert doc.codec == "zlib" and len(doc.body) < doc.size_bytes and doc.text == jd
+        assert s.scalar(select(func.count()).where(Run.jd_doc_id == doc.id)) == 3
+        assert s.get(Run, ids[1]).resume_text == f"cv 1 {jd}"
+    assert encode_document("ab")["codec"] == "identity"  # zlib would grow it
+
+
+def test_texts_load_only_when_read():
+    ensure_dirs()
+    with get_session() as s:
+        run = Run(payload_hash="lazy", status=RunStatus.queued, resume_text="a b", jd_text="c d")
+        s.add(run)
+        s.commit()
+        run_id = run.id
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(ENGINE, "before_cursor_execute", _record)
+    try:
+        with get_session() as s:
+            run = s.get(Run, run_id)
+            assert run.status == RunStatus.queued
+            assert not any("documents" in q for q in statements)
+            assert run.jd_text == "c d"
+            assert sum("documents" in q for q in statements) == 1
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", _record)
+
+
+def test_migration_moves_texts_and_back(tmp_path):
+    path = tmp_path / "app.sqlite3"
+    cfg = Config("alembic.ini")
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(cfg, "0005_artifact_codec")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (id, kind, payload_hash, status, resume_text, jd_text, params, "
+            "created_at) VALUES (?, 'match', ?, 'succeeded', ?, 'Python AWS', '{}', "
+            "'2025-01-01 00:00:00')",
+            [(f"r{i}", f"h{i}", f"resume {i}") for i in range(3)],
+        )
+    command.upgrade(cfg, "head")
+    with conn:
+        assert conn.execute("SELECT count(*) FROM documents").fetchone() == (4,)
+        assert conn.execute("SELECT jd_doc_id FROM runs WHERE id = 'r2'").fetchone() == (
+            document_id("Python AWS"),
+        )
+    command.downgrade(cfg, "0005_artifact_codec")
+    with conn:
+        rows = conn.execute("SELECT id, resume_text, jd_text FROM runs ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [(f"r{i}", f"resume {i}", "Python AWS") for i in range(3)]
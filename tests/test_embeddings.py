@@ -0,0 +1,70 @@
+# tests/test_embeddings.py
+import numpy as np
+
+from backend.app.core import embeddings
+from backend.app.core.embeddings import HashingEncoder, VectorStore, cosine
+from backend.app.core.graph import run_minimal_graph
+
+
+def test_encoder_is_deterministic_and_normalized():
+    enc = HashingEncoder(dim=128)
+    a = enc.encode("PostgreSQL and Kubernetes")
+    assert np.allclose(a, enc.encode("postgresql and kubernetes"))
+    assert abs(np.linalg.norm(a) - 1.0) < 1e-9
+    near = cosine(a, enc.encode("postgres on kubernetes clusters"))
+    far = cosine(a, enc.encode("watercolour painting workshop"))
+    assert near > far
+
+
+def test_scorecard_has_semantic_match():
+    st = run_minimal_graph("Python FastAPI PostgreSQL", "Python developer, FastAPI, PostgreSQL")
+    assert 0 < st.scorecard["dimensions"]["semantic_match"] <= 100
+    assert st.jd_embedding is not None
+
+
+def test_store_brute_force_and_ivf(tmp_path):
+    rng = np.random.default_rng(0)
+    vecs = rng.normal(size=(600, 16)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    store = VectorStore(str(tmp_path / "jd"), dim=16)
+    for i, v in enumerate(vecs[:500]):
+        store.add(f"run-{i}", v)
+
+    exact = store.search(vecs[7], k=3)
+    assert exact[0]["id"] == "run-7"
+
+    store.build_ivf(nlist=8)
+    for i, v in enumerate(vecs[500:], start=500):
+        store.add(f"run-{i}", v)  # tail rows are searched exhaustively
+
+    reopened = VectorStore(str(tmp_path / "jd"), dim=16)
+    assert len(reopened) == 600
+    assert reopened.search(vecs[7], k=1, nprobe=2)[0]["id"] == "run-7"
+    assert reopened.search(vecs[550], k=1, nprobe=1)[0]["id"] == "run-550"
+
+
+def test_ivf_builds_are_locked_and_published_as_one_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(embeddings, "IVF_MIN_ROWS", 50)
+    rng = np.random.default_rng(1)
+    vecs = rng.normal(size=(120, 16)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    store = VectorStore(str(tmp_path / "jd"), dim=16)
+    for i, v in enumerate(vecs):
+        store.add(f"run-{i}", v)
+
+    other = VectorStore(str(tmp_path / "jd"), dim=16)  # as if in another worker
+    with other._file_lock("ivf.lock"):
+        assert store.maybe_build_ivf() is False  # skipped, not queued behind the build
+    assert store.maybe_build_ivf() is True
+    assert store.maybe_build_ivf() is False  # nothing new to cover
+
+    def published():
+        return {p.name.split(".")[2] for p in tmp_path.glob("jd.ivf.*.npy")}
+
+    (first,) = published()
+    assert other.search(vecs[3], k=1, nprobe=1)[0]["id"] == "run-3"
+    other.build_ivf(nlist=4)
+    (second,) = published()  # the superseded set is removed with the switch
+    assert second != first
+    assert store.search(vecs[3], k=1, nprobe=4)[0]["id"] == "run-3"
+    assert len(store._load_ivf()["centroids"]) == 4
@@ -0,0 +1,176 @@
+# tests/test_events.py
+import asyncio
+import json
+
+import pytest
+from arq.connections import ArqRedis
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from backend.app.api.routes import get_broker
+from backend.app.core.events import StatusBroker, StatusPublisher
+from backend.app.core.run_manager import RunManager, set_status_notifier
+from backend.app.main import app
+from backend.app.storage.db import ENGINE, ensure_dirs, get_session
+from backend.app.storage.models import Run
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def pubsub():
+    """An async broker (API side) and a sync publisher (worker side) on one fake server."""
+    server = fakeredis.FakeServer()
+    redis = ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis(server=server).connection_pool)
+    broker = StatusBroker(redis)
+    publisher = StatusPublisher(fakeredis.FakeRedis(server=server))
+    app.dependency_overrides[get_broker] = lambda: broker
+    set_status_notifier(publisher)
+    yield broker, publisher
+    set_status_notifier(None)
+    app.dependency_overrides.pop(get_broker, None)
+
+
+def _queued_run() -> str:
+    ensure_dirs()
+    with get_session() as s:
+        run = Run(payload_hash="events", resume_text="r" * 10_000, jd_text="j")
+        s.add(run)
+        s.commit()
+        return run.id
+
+
+def _advance(run_id: str, error: str | None = None) -> None:
+    with get_session() as s:
+        mgr = RunManager(s, s.get(Run, run_id))
+        if error is None:
+            mgr.start()
+        else:
+            mgr.fail(error)
+
+
+@pytest.mark.anyio
+async def test_publisher_reaches_broker_subscribers(pubsub):
+    broker, publisher = pubsub
+    async with broker.subscribe("r1") as q, broker.subscribe("r2") as other:
+        assert broker.healthy
+        await asyncio.to_thread(publisher, "r1", "running", None)
+        assert await asyncio.wait_for(q.get(), 1) == {
+            "run_id": "r1",
+            "status": "running",
+            "error": None,
+        }
+        assert other.empty()
+    assert broker._waiters == {}
+    await broker.stop()
+
+
+@pytest.mark.anyio
+async def test_long_poll_returns_on_change_without_polling_db(pubsub):
+    broker, _ = pubsub
+    run_id = _queued_run()
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        poll = asyncio.create_task(ac.get(f"/runs/{run_id}", params={"wait": 10}))
+        await asyncio.sleep(1.5)  # longer than the fallback poll interval
+        event.listen(ENGINE, "before_cursor_execute", _count)
+        try:
+            await asyncio.sleep(1.5)
+        finally:
+            event.remove(ENGINE, "before_cursor_execute", _count)
+        assert statements == [] and not poll.done()
+
+        await asyncio.to_thread(_advance, run_id)
+        r = await asyncio.wait_for(poll, 5)
+        assert r.json()["status"] == "running"
+
+        # an unchanged run answers with its current status once the wait expires
+        r = await ac.get(f"/runs/{run_id}", params={"wait": 0.2})
+        assert r.json()["status"] == "running"
+        assert (await ac.get("/runs/missing", params={"wait": 1})).status_code == 404
+    await broker.stop()
+
+
+@pytest.mark.anyio
+async def test_sse_streams_changes_until_terminal(pubsub):
+    broker, _ = pubsub
+    run_id = _queued_run()
+
+    async def _drive():
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(_advance, run_id)
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(_advance, run_id, "boom")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        driver = asyncio.create_task(_drive())
+        r = await asyncio.wait_for(ac.get(f"/runs/{run_id}/events"), 10)
+        await driver
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(line.removeprefix("data: "))
+        for line in r.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert [e["status"] for e in events] == ["queued", "running", "failed"]
+    assert events[-1]["error"] == "boom"
+    await broker.stop()
+
+
+@pytest.mark.anyio
+async def test_long_poll_falls_back_to_db_without_broker(pubsub):
+    broker, _ = pubsub
+    broker.redis = ArqRedis.from_url("redis://127.0.0.1:1")  # nothing listening
+    set_status_notifier(None)
+    run_id = _queued_run()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        poll = asyncio.create_task(ac.get(f"/runs/{run_id}", params={"wait": 10}))
+        await asyncio.sleep(1.5)  # past the broker's connect attempt
+        await asyncio.to_thread(_advance, run_id)
+        r = await asyncio.wait_for(poll, 5)
+    assert r.json()["status"] == "running"
+    assert not broker.healthy
+    await broker.stop()
+
+
+@pytest.mark.anyio
+async def test_slow_inline_run_completion_reaches_waiters(pubsub, monkeypatch):
+    import backend.app.api.routes as routes_mod
+    from backend.app.core import run_manager
+
+    async def _noop_enqueue(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(routes_mod, "enqueue_run", _noop_enqueue)
+    monkeypatch.setattr(routes_mod, "SYNC_WAIT_S", 0.0)  # answer before the run finishes
+    monkeypatch.setattr(app.state, "inline", routes_mod.create_inline_ctx(processes=0), False)
+    broker, _ = pubsub
+    payload = {"resume_text": "Python and Docker, inline", "jd_text": "Python developer"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.post("/runs", params={"mode": "sync"}, json=payload)
+        assert r.status_code == 202
+        run_id = r.json()["run_id"]
+        r = await asyncio.wait_for(ac.get(f"/runs/{run_id}/events"), 10)
+    statuses = [
+        json.loads(line.removeprefix("data: "))["status"]
+        for line in r.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert statuses[-1] == "succeeded"
+    await broker.stop()
+
+    # the API installs the same publisher the worker uses
+    saved = dict(app.state._state)
+    try:
+        async with app.router.lifespan_context(app):
+            assert isinstance(run_manager._notifier, StatusPublisher)
+        assert run_manager._notifier is None
+    finally:
+        app.state._state.clear()
+        app.state._state.update(saved)
+        set_status_notifier(pubsub[1])
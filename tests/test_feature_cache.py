@@ -0,0 +1,69 @@
+# tests/test_feature_cache.py
+import sqlite3
+
+from backend.app.core.feature_cache import FeatureCache, features_key
+from backend.app.core.graph import run_minimal_graph
+
+RESUME = "Built APIs in Python & FastAPI. Used PostgreSQL and Docker. Deployed on AWS."
+JD = "Looking for a Python developer with FastAPI, PostgreSQL, and AWS experience."
+
+
+def _cache_entry(state):
+    return next(e for e in state.logs if e["node"] == "feature_cache")
+
+
+def test_graph_uses_cache(tmp_path):
+    cache = FeatureCache(str(tmp_path / "fc.sqlite3"))
+    plain = run_minimal_graph(RESUME, JD)
+    first = run_minimal_graph(RESUME, JD, cache=cache)
+    second = run_minimal_graph(RESUME, JD, cache=cache)
+
+    assert first.scorecard == plain.scorecard == second.scorecard
+    assert first.jd_text == plain.jd_text
+    assert _cache_entry(first) == {"node": "feature_cache", "hits": 0, "misses": 2, "evictions": 0}
+    assert _cache_entry(second)["hits"] == 2
+
+
+def test_disk_tier_survives_restart_and_evicts(tmp_path):
+    path = str(tmp_path / "fc.sqlite3")
+    cache = FeatureCache(path, memory_bytes=0)
+    cache.put("a", {"text": "x" * 1000, "skills": ["x"]})
+    cache.close()
+
+    reopened = FeatureCache(path, memory_bytes=0, disk_bytes=60)
+    assert reopened.get("a") == {"text": "x" * 1000, "skills": ["x"]}
+    evicted = reopened.put("b", {"text": "y" * 1000, "skills": []})
+    assert evicted >= 1
+    assert reopened.get("a") is None
+    assert reopened.get("b") is not None
+
+
+def test_memory_tier_is_bounded():
+    cache = FeatureCache(None, memory_bytes=25)
+    for k in "abc":
+        cache.put(k, {"text": "t" * 10, "skills": []})
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert features_key("doc", "v1") != features_key("doc", "v2")
+
+
+def test_disk_total_is_shared_and_reads_touch_in_batches(tmp_path):
+    path = str(tmp_path / "fc.sqlite3")
+    a = FeatureCache(path, memory_bytes=0)
+    b = FeatureCache(path, memory_bytes=0)
+    a.put("x", {"text": "short", "skills": []})
+    b.put("y", {"text": "y" * 500, "skills": []})
+    a.put("x", {"text": "a longer text " * 20, "skills": ["z"]})  # replaced in place
+
+    db = sqlite3.connect(path)
+    total, summed = db.execute(
+        "SELECT (SELECT total FROM features_size), (SELECT SUM(size) FROM features)"
+    ).fetchone()
+    assert total == summed > 0
+
+    accessed = "SELECT accessed FROM features WHERE key = 'x'"
+    (before,) = db.execute(accessed).fetchone()
+    assert b.get("x") is not None
+    assert db.execute(accessed).fetchone() == (before,)  # no write on the read path
+    b.close()
+    assert db.execute(accessed).fetchone()[0] > before
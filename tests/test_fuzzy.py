@@ -0,0 +1,96 @@
+# tests/test_fuzzy.py
+import random
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.core.dag import Memo
+from backend.app.core.fuzzy import FuzzyIndex, FuzzySettings, edit_distance, fuzzy_settings
+from backend.app.core.graph import run_minimal_graph
+from backend.app.main import app
+
+RESUME = "Shipped services on k8s and postgre; kuberntes, scikit learn, node.js, tensorflw, Python"
+JD = "We use PostgreSQL, Kubernetes, scikitlearn, nodejs, TensorFlow, Python and Docker"
+
+
+def _levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def test_index_lookup_agrees_with_a_linear_scan():
+    rnd = random.Random(7)
+    word = lambda n: "".join(rnd.choice("abcdefgh") for _ in range(n))  # noqa: E731
+    vocab = sorted({word(rnd.randint(4, 12)) for _ in range(1500)})
+    index = FuzzyIndex(vocab)
+    settings = FuzzySettings(max_edits=2, min_similarity=0.8)
+    hits = 0
+    for _ in range(200):
+        q = list(rnd.choice(vocab))
+        for _ in range(rnd.randint(1, 3)):  # substitutions, insertions, deletions
+            op, at = rnd.randrange(3), rnd.randrange(len(q))
+            if op == 0:
+                q[at] = rnd.choice("abcdefgh")
+            elif op == 1:
+                q.insert(at, rnd.choice("abcdefgh"))
+            elif len(q) > 4:
+                del q[at]
+        query = "".join(q)
+        assert edit_distance(query, vocab[0], 2) == min(_levenshtein(query, vocab[0]), 3)
+
+        hit = index.lookup(query, settings)
+        cap = min(2, int(0.2 * len(query) / 0.8 + 1e-9))
+        within = []
+        for t in vocab:
+            if abs(len(t) - len(query)) <= cap and (d := _levenshtein(query, t)) <= cap:
+                if (sim := round(1 - d / max(len(query), len(t)), 3)) >= 0.8:
+                    within.append(sim)
+        if query in vocab:
+            assert hit is not None and hit.similarity == 1.0
+        elif within:
+            assert hit is not None and hit.similarity == max(within)
+            hits += 1
+        else:
+            assert hit is None
+    assert hits > 25
+
+
+def test_match_graph_reports_near_misses_separately():
+    st = run_minimal_graph(RESUME, JD)
+    fuzzy = {m["resume"]: (m["jd"], m["via"]) for m in st.scorecard["fuzzy_matches"]}
+    assert fuzzy == {
+        "k8s": ("kubernetes", "numeronym"),
+        "postgre": ("postgresql", "spelling"),
+        "scikit learn": ("scikitlearn", "squashed"),
+        "node.js": ("nodejs", "squashed"),
+        "tensorflw": ("tensorflow", "spelling"),
+    }
+    assert st.scorecard["coverage_terms_overlap"] == ["python"]  # exact overlap unchanged
+    assert st.scorecard["fuzzy_skills_match"] > st.scorecard["dimensions"]["skills_match"]
+
+    strict = run_minimal_graph(RESUME, JD, fuzzy=fuzzy_settings({"fuzzy_min_similarity": 0.95}))
+    assert {m["via"] for m in strict.scorecard["fuzzy_matches"]} == {"numeronym", "squashed"}
+    off = run_minimal_graph(RESUME, JD, skip=["fuzzy_match"])
+    assert off.scorecard["fuzzy_matches"] == [] and off.scorecard["dimensions"] == (
+        st.scorecard["dimensions"]
+    )
+
+    memo = Memo()
+    for resume in ("python docker", "pythn dockr", "k8s"):
+        run_minimal_graph(resume, JD, memo=memo, skip=["semantic_match"])
+    assert (memo.misses, memo.hits) == (1, 2)  # the JD's index was built once
+
+
+@pytest.mark.anyio
+async def test_bad_fuzzy_params_are_rejected_up_front():
+    with pytest.raises(ValueError):
+        fuzzy_settings({"fuzzy_max_edits": "two"})
+    body = {"resume_text": "python", "jd_text": "python", "params": {"fuzzy_min_similarity": 2}}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.post("/runs", json=body)
+    assert r.status_code == 422 and "fuzzy_min_similarity" in r.json()["detail"]
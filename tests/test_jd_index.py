@@ -0,0 +1,70 @@
+# tests/test_jd_index.py
+import math
+import random
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.core.jd_index import K1, B, InvertedIndex
+from backend.app.main import app
+from backend.app.storage.db import ensure_dirs
+
+
+def _brute_force(docs, query, k, rank):
+    n = len(docs)
+    avgdl = sum(len(d) for d in docs) / n
+    df = {t: sum(t in d for d in docs) for t in query}
+    scored = []
+    for d in docs:
+        common = [t for t in set(query) if t in d]
+        if not common:
+            continue
+        if rank == "bm25":
+            w = (K1 + 1) / (1 + K1 * (1 - B + B * len(d) / avgdl))
+            score = sum(math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) * w for t in common)
+        else:
+            score = len(common) / len(d)
+        scored.append(score)
+    return sorted(scored, reverse=True)[:k]
+
+
+@pytest.mark.parametrize("rank", ["bm25", "coverage"])
+def test_top_k_matches_exhaustive_ranking(rank):
+    rnd = random.Random(3)
+    vocab = [f"t{i}" for i in range(300)]
+    docs = [rnd.sample(vocab[: rnd.randint(40, 300)], rnd.randint(3, 40)) for _ in range(500)]
+    index = InvertedIndex()
+    for i, d in enumerate(docs):
+        index.add(i + 1, f"run-{i}", d)
+    for _ in range(20):
+        query = rnd.sample(vocab, rnd.randint(1, 60))
+        got = [r["score"] for r in index.search(query, k=10, rank=rank)]
+        assert got == pytest.approx(_brute_force(docs, query, 10, rank), abs=1e-4)
+
+
+@pytest.mark.anyio
+async def test_search_endpoint_finds_indexed_run(monkeypatch):
+    ensure_dirs()
+
+    async def _noop_enqueue_run(*args, **kwargs):
+        return None
+
+    import backend.app.api.routes as routes_mod
+    from backend.app.core.queue import _run_job
+
+    monkeypatch.setattr(routes_mod, "enqueue_run", _noop_enqueue_run)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        jd = "Rust, Zig and WebAssembly compiler engineer; LLVM internals."
+        r = await ac.post("/runs", json={"resume_text": "Zig hacker", "jd_text": jd})
+        run_id = r.json()["run_id"]
+        _run_job(run_id)
+
+        q = {"resume_text": "I write Zig and LLVM passes", "k": 3}
+        r1 = await ac.get("/search/jobs", params=q)
+        r2 = await ac.post("/search/jobs", json={**q, "rank": "coverage"})
+        r3 = await ac.post("/search/jobs", json={**q, "rank": "semantic"})
+        for resp in (r1, r2, r3):
+            assert resp.status_code == 200
+            assert resp.json()["results"][0]["run_id"] == run_id
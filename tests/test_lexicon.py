@@ -0,0 +1,31 @@
+# tests/test_lexicon.py
+import json
+
+from backend.app.core import lexicon
+from backend.app.core.graph import _extract_skills
+from backend.app.core.lexicon import Lexicon, load_lexicon
+
+
+def test_multi_word_skills_and_aliases():
+    skills = _extract_skills("Deep Learning, LLM work, machine learning and ML. Python, py, Py.")
+    assert skills == ["deep learning", "large language model", "machinelearning", "python"]
+
+
+def test_stopword_phrase_prefix_falls_back_to_tokens():
+    lex = Lexicon(skills=["data science"], stopwords=["data"])
+    assert lex.extract("data engineering data science data") == ["engineering", "data science"]
+
+
+def test_phrase_spanning_window_boundary(monkeypatch):
+    monkeypatch.setattr(lexicon, "WINDOW_CHARS", 8)
+    lex = Lexicon(skills=["large language model"])
+    text = "aaaaaaa large language model bbbbbbb"
+    assert lex.extract(text) == ["aaaaaaa", "large language model", "bbbbbbb"]
+
+
+def test_limit_and_load_table(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({"alias": {"k8s": "kubernetes"}, "stopwords": ["the"]}))
+    lex = load_lexicon(str(path))
+    assert lex.extract("the k8s go rust", limit=2) == ["kubernetes", "go"]
+    assert lex.version == Lexicon.from_table(lex.to_table()).version
@@ -0,0 +1,131 @@
+# tests/test_metrics.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from arq.connections import ArqRedis
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.api.routes import get_redis
+from backend.app.core import metrics, queue
+from backend.app.core.graph import run_minimal_graph
+from backend.app.main import app
+from backend.app.storage.db import ensure_dirs
+
+fakeredis = pytest.importorskip("fakeredis")
+
+RESUME = "Built APIs in Python & FastAPI. Used PostgreSQL and Docker on AWS."
+JD = "Python developer with FastAPI, PostgreSQL and AWS experience."
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.observe(v, 'a"b')
+    lines = list(h.render())
+    assert 't_seconds_bucket{route="a\\"b",le="0.1"} 2' in lines
+    assert 't_seconds_bucket{route="a\\"b",le="1.0"} 3' in lines
+    assert 't_seconds_bucket{route="a\\"b",le="+Inf"} 4' in lines
+    assert 't_seconds_count{route="a\\"b"} 4' in lines
+    assert h.count('a"b') == 4
+
+
+def test_profiled_graph_appends_node_timings_to_the_trace():
+    plain = run_minimal_graph(RESUME, JD)
+    prof = run_minimal_graph(RESUME, JD, profile=True, trace_memory=True)
+    n = len(plain.logs)
+    assert prof.logs[:n] == plain.logs and prof.scorecard == plain.scorecard
+    entries = prof.logs[n:]
+    assert [e["target"] for e in entries] == [
+        "resume_features",
+        "jd_features",
+        "semantic_match",
+        "jd_fuzzy_index",
+        "fuzzy_match",
+        "score_rule_based",
+        "build_scorecard",
+    ]
+    assert all(e["node"] == "profile" and e["wall_ms"] >= 0 and e["cpu_ms"] >= 0 for e in entries)
+    assert all(e["peak_bytes"] >= 0 for e in entries)
+
+    before = metrics.NODE_SECONDS.count("semantic_match")
+    metrics.observe_trace(prof.logs)
+    assert metrics.NODE_SECONDS.count("semantic_match") == before + 1
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_and_runtime_switch(monkeypatch):
+    ensure_dirs()
+    redis = ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis().connection_pool)
+    app.dependency_overrides[get_redis] = lambda: redis
+    metrics.set_profiling(enabled=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            await ac.get("/runs/missing")
+            body = (await ac.get("/metrics")).text
+            assert 'route="/runs/{run_id}",status="404"' in body
+            assert 'jobmatch_db_query_seconds_count{statement="SELECT"}' in body
+
+            seen = metrics.HTTP_SECONDS.count("GET", "/healthz", "200")
+            r = await ac.put("/metrics/profiling", json={"enabled": False})
+            assert r.json() == {"enabled": False, "tracemalloc": False}
+            await ac.get("/healthz")
+            assert metrics.HTTP_SECONDS.count("GET", "/healthz", "200") == seen
+
+            # workers read the switches back from Redis
+            metrics.set_profiling(enabled=True)
+            monkeypatch.setattr(metrics, "_profiling_read_at", None)
+            assert not (await metrics.load_profiling(redis)).enabled
+    finally:
+        metrics.set_profiling(enabled=False, tracemalloc=False)
+        app.dependency_overrides.pop(get_redis, None)
+        await redis.aclose()
+
+
+@pytest.mark.anyio
+async def test_worker_metrics_server():
+    server = await metrics.serve_metrics("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b"# TYPE jobmatch_graph_node_seconds histogram" in response
+
+
+@pytest.mark.anyio
+async def test_second_worker_starts_without_its_metrics_port(monkeypatch):
+    first = await metrics.serve_metrics("127.0.0.1", 0)
+    monkeypatch.setattr(queue, "WORKER_METRICS_HOST", "127.0.0.1")
+    monkeypatch.setattr(queue, "WORKER_METRICS_PORT", first.sockets[0].getsockname()[1])
+    monkeypatch.setattr(queue, "create_compute_pool", lambda: ThreadPoolExecutor(1))
+    monkeypatch.setattr(queue.StatusPublisher, "from_url", lambda url: None)
+    ctx: dict = {}
+    try:
+        await queue.startup(ctx)  # the port is taken: logged, not fatal
+        assert "metrics_server" not in ctx
+        await queue.shutdown(ctx)
+    finally:
+        first.close()
+
+
+@pytest.mark.anyio
+async def test_profiling_switches_are_read_once_per_refresh_across_jobs(monkeypatch):
+    class _Redis:
+        reads = 0
+
+        async def get(self, key):
+            self.reads += 1
+            return None
+
+    redis = _Redis()
+    monkeypatch.setattr(metrics, "_profiling_read_at", None)
+    worker_ctx = {"redis": redis}
+    for job_ctx in ({**worker_ctx, "job_id": "a"}, {**worker_ctx, "job_id": "b"}):
+        await metrics.load_profiling(job_ctx["redis"])  # as _execute does, per job copy
+    assert redis.reads == 1
@@ -0,0 +1,107 @@
+# tests/test_offline_scoring.py
+import json
+
+import pytest
+
+from backend.app import cli
+from backend.app.core.offline import checkpoint_path, score_file
+from backend.app.core.queue import create_compute_pool
+from backend.app.core.run_manager import compute_match
+
+SKILLS = ["python", "sql", "docker", "aws", "react", "kubernetes"]
+
+
+def _pairs(path, n):
+    with path.open("w") as f:
+        for i in range(n):
+            resume = " ".join(SKILLS[: 1 + i % len(SKILLS)]) + f" engineer {i}"
+            f.write(json.dumps({"id": f"c{i}", "resume_text": resume, "jd_text": "python aws"}))
+            f.write("\n")
+        f.write(json.dumps({"id": "broken", "resume_text": "python"}) + "\n")
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_score_resumes_from_the_checkpoint_without_duplicates(tmp_path, capsys):
+    src, out = tmp_path / "pairs.jsonl", tmp_path / "scores.jsonl"
+    _pairs(src, 25)
+    assert cli.main(["score", str(src), "--out", str(out), "--processes", "0", "--chunk", "4"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["scored"], summary["failed"]) == (25, 1)
+    full = _lines(out)
+    assert [r["offset"] for r in full] == list(range(26))
+    assert (
+        full[3]["scorecard"]
+        == compute_match("python sql docker aws engineer 3", "python aws", {}).scorecard
+    )
+    assert full[-1]["id"] == "broken" and "missing jd_text" in full[-1]["error"]
+
+    # as if killed after the chunk ending at offset 12, mid-way through writing the next
+    cp = json.loads(checkpoint_path(out).read_text())
+    assert cp["offset"] == 26
+    kept = "".join(json.dumps(r) + "\n" for r in full[:12]).encode()
+    out.write_bytes(kept + b'{"offset": 12, "id": "c1')
+    checkpoint_path(out).write_text(json.dumps({**cp, "offset": 12, "output_bytes": len(kept)}))
+
+    pool = create_compute_pool(0)
+    try:
+        stats = score_file(src, out, pool, 1, chunk=5)
+    finally:
+        pool.shutdown()
+    assert (stats.resumed_at, stats.scored, stats.failed) == (12, 13, 1)
+    assert _lines(out) == full
+
+    # a checkpoint is tied to its input
+    other = tmp_path / "other.jsonl"
+    _pairs(other, 2)
+    with pytest.raises(ValueError, match="--restart"):
+        score_file(other, out, pool, 1)
+
+
+def test_score_reads_a_csv_manifest_of_document_paths(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "r1.txt").write_text("python sql docker")
+    (docs / "jd.txt").write_text("python aws")
+    manifest, out = tmp_path / "manifest.csv", tmp_path / "scores.jsonl"
+    manifest.write_text(
+        "id,resume_path,jd_path\nr1,docs/r1.txt,docs/jd.txt\n,docs/nope,docs/jd.txt\n"
+    )
+
+    pool = create_compute_pool(0)
+    try:
+        stats = score_file(manifest, out, pool, 1, skip=("semantic_match",))
+    finally:
+        pool.shutdown()
+
+    ok, missing = _lines(out)
+    assert (stats.scored, stats.failed) == (1, 1)
+    assert ok["id"] == "r1" and ok["scorecard"]["coverage_terms_overlap"] == ["python"]
+    assert "semantic_match" not in ok["scorecard"]["dimensions"]
+    assert missing["id"] == "1" and missing["error"].startswith("FileNotFoundError")
+
+
+def test_bad_lines_are_per_record_errors_and_the_service_cache_is_left_alone(tmp_path, monkeypatch):
+    def _shared_cache():
+        raise AssertionError("offline scoring opened the service's feature cache")
+
+    monkeypatch.setattr("backend.app.core.run_manager.get_feature_cache", _shared_cache)
+    src, out, cache = tmp_path / "pairs.jsonl", tmp_path / "scores.jsonl", tmp_path / "fc.db"
+    good = json.dumps({"resume_text": "python sql", "jd_text": "python"})
+    src.write_text(f'{good}\n{{"resume_text": "python",\n[1, 2]\n{good}\n')
+
+    pool = create_compute_pool(0)
+    try:
+        stats = score_file(src, out, pool, 1, chunk=2, feature_cache=cache)
+    finally:
+        pool.shutdown()
+
+    lines = _lines(out)
+    assert (stats.scored, stats.failed) == (2, 2)
+    assert [r["offset"] for r in lines] == [0, 1, 2, 3]
+    assert lines[1]["error"].startswith("JSONDecodeError")
+    assert lines[2] == {"offset": 2, "id": "2", "error": "ValueError: not a JSON object"}
+    assert lines[3]["scorecard"] == lines[0]["scorecard"]
+    assert cache.exists()
@@ -0,0 +1,148 @@
+# tests/test_queue.py
+import asyncio
+import uuid
+
+import pytest
+from arq.connections import ArqRedis
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.api.routes import create_broker, get_broker, get_redis
+from backend.app.core.dedupe import RecentRuns
+from backend.app.core.events import StatusPublisher
+from backend.app.core.queue import enqueue_run, enqueue_runs_bulk, job_id
+from backend.app.core.run_manager import RunManager, set_status_notifier
+from backend.app.main import app, lifespan
+from backend.app.storage.db import get_session
+from backend.app.storage.models import Run
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _fake_pool() -> ArqRedis:
+    return ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis().connection_pool)
+
+
+@pytest.mark.anyio
+async def test_bulk_enqueue_matches_enqueue_job():
+    redis = _fake_pool()
+    await enqueue_run(redis, run_id="single")
+    assert await enqueue_runs_bulk(redis, ["a", "b", "c"]) == 3
+    assert await enqueue_runs_bulk(redis, []) == 0
+
+    jobs = await redis.queued_jobs()
+    assert sorted(j.kwargs["run_id"] for j in jobs) == ["a", "b", "c", "single"]
+    assert {j.function for j in jobs} == {"run_match_job"}
+    assert len({j.job_id for j in jobs}) == 4
+    await redis.aclose()
+
+
+@pytest.mark.anyio
+async def test_lifespan_owns_one_pool(monkeypatch):
+    import backend.app.main as main_mod
+
+    pools = []
+
+    def _create():
+        pools.append(_fake_pool())
+        return pools[-1]
+
+    monkeypatch.setattr(main_mod, "create_redis_pool", _create)
+    async with lifespan(app):
+        assert app.state.redis is pools[0]
+    assert len(pools) == 1
+    del app.state.redis, app.state.broker
+
+
+@pytest.mark.anyio
+async def test_bulk_runs_endpoint_dedupes_and_enqueues_once():
+    redis = _fake_pool()
+    app.dependency_overrides[get_redis] = lambda: redis
+    try:
+        tag = uuid.uuid4()
+        runs = [
+            {"resume_text": f"python sql {tag}", "jd_text": "python"},
+            {"resume_text": f"docker {tag}", "jd_text": "docker aws"},
+            {"resume_text": f"python sql {tag}", "jd_text": "python"},
+        ]
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            r = await ac.post("/runs/bulk", json={"runs": runs})
+        assert r.status_code == 202
+        out = r.json()["runs"]
+        assert [o["status"] for o in out] == ["queued"] * 3
+        assert out[0]["run_id"] == out[2]["run_id"] != out[1]["run_id"]
+
+        jobs = await redis.queued_jobs()
+        assert sorted(j.kwargs["run_id"] for j in jobs) == sorted({o["run_id"] for o in out})
+    finally:
+        app.dependency_overrides.pop(get_redis, None)
+        await redis.aclose()
+
+
+@pytest.mark.anyio
+async def test_enqueue_is_idempotent_per_run():
+    redis = _fake_pool()
+    await enqueue_run(redis, run_id="x")
+    await enqueue_run(redis, run_id="x")
+    assert await enqueue_runs_bulk(redis, ["x", "y", "y"]) == 1
+    assert await enqueue_runs_bulk(redis, ["y"]) == 0
+    jobs = await redis.queued_jobs()
+    assert sorted(j.job_id for j in jobs) == [job_id("x"), job_id("y")]
+    await redis.aclose()
+
+
+def test_recent_runs_expire_evict_and_forget_failures(monkeypatch):
+    recent = RecentRuns(max_entries=2, ttl=10)
+    recent.put("h1", "r1", "queued")
+    recent.put("h2", "r2", "running")
+    recent.put("hf", "rf", "failed")  # never cached
+    assert recent.get("hf") is None and len(recent) == 2
+
+    recent.on_status({"run_id": "r1", "status": "succeeded", "error": None})
+    assert recent.get("h1") == ("r1", "succeeded")
+    recent.on_status({"run_id": "r2", "status": "failed", "error": "boom"})
+    assert recent.get("h2") is None
+
+    recent.put("h3", "r3", "queued")
+    recent.put("h4", "r4", "queued")  # evicts the oldest
+    assert recent.get("h1") is None and recent.get("h4") == ("r4", "queued")
+    recent.on_status(None)  # resubscribed: events may have been missed
+    assert len(recent) == 0
+
+    recent.put("h5", "r5", "queued")
+    monkeypatch.setattr("backend.app.core.dedupe.time.monotonic", lambda: 1e12)
+    assert recent.get("h5") is None
+
+
+@pytest.mark.anyio
+async def test_duplicate_submissions_share_one_inflight_run(monkeypatch):
+    server = fakeredis.FakeServer()
+    redis = ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis(server=server).connection_pool)
+    broker = create_broker(redis)
+    app.dependency_overrides[get_redis] = lambda: redis
+    app.dependency_overrides[get_broker] = lambda: broker
+    set_status_notifier(StatusPublisher(fakeredis.FakeRedis(server=server)))
+    body = {"resume_text": f"python {uuid.uuid4()}", "jd_text": "python"}
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = (await ac.post("/runs", json=body)).json()
+            # duplicates while queued are answered from memory: no SQL at all
+            monkeypatch.setattr("backend.app.api.routes.get_session", None)
+            dupes = [(await ac.post("/runs", json=body)).json() for _ in range(9)]
+            monkeypatch.undo()
+            assert {d["run_id"] for d in dupes} == {first["run_id"]}
+            assert len(await redis.queued_jobs()) == 1
+
+            # a failed run is not reused; the next submission starts a fresh one
+            with get_session() as s:
+                RunManager(s, s.get(Run, first["run_id"])).fail("boom")
+            await asyncio.sleep(0.1)
+            retry = (await ac.post("/runs", json=body)).json()
+            assert retry["run_id"] != first["run_id"] and retry["status"] == "queued"
+            assert len(await redis.queued_jobs()) == 2
+    finally:
+        set_status_notifier(None)
+        app.dependency_overrides.pop(get_redis, None)
+        app.dependency_overrides.pop(get_broker, None)
+        await broker.stop()
+        await redis.aclose()
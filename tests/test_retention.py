@@ -0,0 +1,140 @@
+# tests/test_retention.py
+import json
+import os
+import random
+import string
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from backend.app import cli
+from backend.app.core.embeddings import ENCODER, get_vector_store
+from backend.app.core.graph import LEXICON
+from backend.app.core.jd_index import get_job_index
+from backend.app.core.queue import _run_job
+from backend.app.storage.artifacts import blob_path, write_artifact
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.models import Document, JobIndexDoc, Run, RunStatus, document_id
+from backend.app.storage.retention import DATA_DIR, parse_policy, sweep
+
+OLD = datetime(2000, 1, 1, tzinfo=UTC)
+POLICY = {RunStatus.succeeded: timedelta(days=3650), RunStatus.failed: timedelta(days=3650)}
+
+
+def _noise(n: int, rnd: random.Random) -> str:
+    return "".join(rnd.choice(string.ascii_letters) for _ in range(n))  # does not compress
+
+
+def test_sweep_deletes_expired_runs_in_batches_with_their_files():
+    ensure_dirs()
+    rnd = random.Random(1)
+    tag = uuid.uuid4().hex
+    shared_jd = f"shared JD {tag}"
+    with get_session() as s:
+        expired = [
+            Run(
+                payload_hash=f"ret-{tag}-{i}",
+                status=RunStatus.succeeded if i % 2 else RunStatus.failed,
+                resume_text=_noise(20_000, rnd),
+                jd_text=shared_jd,
+                created_at=OLD + timedelta(minutes=i),
+            )
+            for i in range(5)
+        ]
+        young = Run(payload_hash=f"ret-{tag}-y", resume_text="keep me", jd_text=shared_jd)
+        young.status = RunStatus.succeeded
+        stuck = Run(payload_hash=f"ret-{tag}-q", resume_text="queued", jd_text="forever")
+        stuck.created_at = OLD
+        s.add_all([*expired, young, stuck])
+        s.commit()
+        gone_ids = [r.id for r in expired]
+        kept_ids = [young.id, stuck.id]
+        private = write_artifact(s, gone_ids[1], "scorecard.json", "json", None, {"t": tag})
+        shared = write_artifact(s, gone_ids[3], "gaps.csv", "csv", None, f"shared,{tag}\n")
+        write_artifact(s, young.id, "gaps.csv", "csv", None, f"shared,{tag}\n")
+        private_blob = blob_path(private.sha256, private.codec)
+        shared_blob = blob_path(shared.sha256, shared.codec)
+        legacy_dir = os.path.join(DATA_DIR, "artifacts", gone_ids[0])
+        os.makedirs(legacy_dir)
+
+        stats = sweep(s, POLICY, batch=2, pause_s=0)
+
+    assert stats.runs >= 5 and stats.batches >= 3
+    assert stats.by_status.get("failed", 0) >= 3 and stats.run_dirs >= 1
+    assert not os.path.exists(private_blob) and os.path.exists(shared_blob)
+    assert not os.path.exists(legacy_dir)
+    assert stats.pages > 0  # auto_vacuum=INCREMENTAL returned the resumes' pages
+    with get_session() as s:
+        assert s.scalars(select(Run.id).where(Run.id.in_(gone_ids))).all() == []
+        assert sorted(s.scalars(select(Run.id).where(Run.id.in_(kept_ids)))) == sorted(kept_ids)
+        assert s.get(Document, document_id(shared_jd)) is not None  # still used by `young`
+        assert s.get(Run, kept_ids[0]).jd_text == shared_jd
+        assert stats.documents >= 5
+
+
+def test_policy_parsing_and_cli_dry_run(capsys):
+    assert parse_policy("succeeded=30, failed=0.5,") == {
+        RunStatus.succeeded: timedelta(days=30),
+        RunStatus.failed: timedelta(hours=12),
+    }
+    with pytest.raises(ValueError):
+        parse_policy("done=3")
+    with pytest.raises(ValueError):
+        parse_policy("succeeded")
+
+    ensure_dirs()
+    with get_session() as s:
+        run = Run(payload_hash="ret-dry", resume_text="a", jd_text="b", created_at=OLD)
+        run.status = RunStatus.failed
+        s.add(run)
+        s.commit()
+        run_id = run.id
+    assert cli.main(["sweep", "--dry-run", "--policy", "failed=3650"]) == 0
+    assert json.loads(capsys.readouterr().out)["would_delete"]["failed"] >= 1
+    with get_session() as s:
+        assert s.get(Run, run_id) is not None
+
+
+def test_search_after_a_sweep_only_returns_surviving_runs():
+    ensure_dirs()
+    tag = uuid.uuid4().hex
+    shared_jd = f"Haskell, OCaml and Erlang compiler engineer ({tag})"
+    lone_jd = f"Elixir, Kotlin and Terraform platform engineer ({tag})"
+    with get_session() as s:
+        old = Run(payload_hash=f"idx-{tag}-o", resume_text="ocaml", jd_text=shared_jd)
+        young = Run(payload_hash=f"idx-{tag}-y", resume_text="haskell", jd_text=shared_jd)
+        lone = Run(payload_hash=f"idx-{tag}-l", resume_text="elixir", jd_text=lone_jd)
+        old.created_at = lone.created_at = OLD
+        s.add_all([old, young, lone])
+        s.commit()
+        old_id, young_id, lone_id = old.id, young.id, lone.id
+    for run_id in (old_id, young_id, lone_id):  # `old` indexes the shared JD first
+        _run_job(run_id)
+
+    def semantic(jd: str) -> str | None:
+        top = get_vector_store().search(ENCODER.encode(jd), k=1)
+        return top[0]["id"] if top and top[0]["score"] > 0.999 else None
+
+    skills = LEXICON.extract(f"{shared_jd} {lone_jd}")
+    with get_session() as s:
+        index = get_job_index(s)  # loaded before the sweep
+        lexical = {h["run_id"] for h in index.search(skills, k=10_000, s=s)}
+        assert {old_id, lone_id} <= lexical and semantic(lone_jd) == lone_id
+        stats = sweep(s, POLICY, pause_s=0)
+        assert stats.index_moved >= 1 and stats.index_dropped >= 1
+
+        lexical = {h["run_id"] for h in index.search(skills, k=10_000, s=s)}
+        assert young_id in lexical and not lexical & {old_id, lone_id}
+        assert (semantic(shared_jd), semantic(lone_jd)) == (young_id, None)
+
+    # the dropped JD can be indexed again by a new run
+    with get_session() as s:
+        again = Run(payload_hash=f"idx-{tag}-a", resume_text="kotlin", jd_text=lone_jd)
+        s.add(again)
+        s.commit()
+        again_id = again.id
+    _run_job(again_id)
+    with get_session() as s:
+        assert again_id in s.scalars(select(JobIndexDoc.run_id)).all()
@@ -0,0 +1,64 @@
+# tests/test_run_listing.py
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from backend.app.main import app
+from backend.app.storage.db import ENGINE, ensure_dirs, get_session
+from backend.app.storage.models import Run, RunStatus
+
+T0 = datetime(1999, 6, 1, tzinfo=UTC)
+RANGE = {"created_after": "1999-06-01T00:00:00Z", "created_before": "1999-06-02T00:00:00Z"}
+
+
+def _seed() -> list[str]:
+    ensure_dirs()
+    with get_session() as s:
+        runs = []
+        for i in range(23):
+            run = Run(payload_hash=f"list-{i % 4}", resume_text="r", jd_text="j")
+            run.status = RunStatus.failed if i % 3 == 0 else RunStatus.succeeded
+            run.created_at = T0 + timedelta(minutes=i // 2)  # pairs share a timestamp
+            runs.append(run)
+        s.add_all(runs)
+        s.commit()
+        return [r.id for r in sorted(runs, key=lambda r: (r.created_at, r.id), reverse=True)]
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_cover_the_range_in_order_without_loading_texts():
+    expected = _seed()
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    seen: list[str] = []
+    event.listen(ENGINE, "before_cursor_execute", _record)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            params = {**RANGE, "limit": 5}
+            while True:
+                r = await ac.get("/runs", params=params)
+                assert r.status_code == 200
+                body = r.json()
+                seen += [run["run_id"] for run in body["runs"]]
+                if body["next_cursor"] is None:
+                    break
+                params["cursor"] = body["next_cursor"]
+
+            failed = await ac.get("/runs", params={**RANGE, "status": "failed", "limit": 100})
+            by_hash = await ac.get("/runs", params={**RANGE, "payload_hash": "list-1"})
+            bad = await ac.get("/runs", params={"cursor": "not-a-cursor"})
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", _record)
+
+    assert seen == expected
+    assert not any("FROM documents" in q for q in statements)  # a column projection
+    runs = failed.json()["runs"]
+    assert len(runs) == 8 and {run["status"] for run in runs} == {"failed"}
+    assert runs[0]["created_at"].startswith("1999-06-01T00:10:00") and runs[0]["kind"] == "match"
+    assert [run["payload_hash"] for run in by_hash.json()["runs"]] == ["list-1"] * 6
+    assert bad.status_code == 400
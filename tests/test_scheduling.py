@@ -0,0 +1,155 @@
+# tests/test_scheduling.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from arq.connections import ArqRedis
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.api.routes import get_redis
+from backend.app.core import queue as queue_mod
+from backend.app.core.metrics import QUEUE_WAIT_SECONDS
+from backend.app.core.queue import (
+    OVERSIZED_MIN_CHARS,
+    QUEUES,
+    enqueue_batch_run,
+    enqueue_run,
+    enqueue_runs_bulk,
+    route_queue,
+)
+from backend.app.core.scheduling import FairGate
+from backend.app.main import app
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.models import Run, RunStatus
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+async def _queued(redis: ArqRedis) -> dict[str, list[str]]:
+    return {
+        name: sorted(j.kwargs["run_id"] for j in await redis.queued_jobs(queue_name=q))
+        for name, q in QUEUES.items()
+    }
+
+
+@pytest.mark.anyio
+async def test_runs_are_routed_by_size_and_priority():
+    redis = ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis().connection_pool)
+    try:
+        await enqueue_run(redis, "small", chars=2_000)
+        await enqueue_run(redis, "large", chars=500_000)
+        await enqueue_run(redis, "small-bulk", chars=2_000, priority="bulk")
+        await enqueue_run(redis, "large-urgent", chars=500_000, priority="interactive")
+        # no priority jumps the oversized queue
+        await enqueue_batch_run(redis, "huge", chars=OVERSIZED_MIN_CHARS, priority="interactive")
+        await enqueue_runs_bulk(
+            redis, ["b1", "b2"], {"b1": route_queue(10, "bulk"), "b2": route_queue(10)}
+        )
+        assert await _queued(redis) == {
+            "interactive": ["b2", "large-urgent", "small"],
+            "bulk": ["b1", "large", "small-bulk"],
+            "oversized": ["huge"],
+        }
+
+        app.dependency_overrides[get_redis] = lambda: redis
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            body = {"resume_text": "python", "jd_text": "python", "params": {"priority": "asap"}}
+            assert (await ac.post("/runs", json=body)).status_code == 422
+            r = await ac.post(
+                "/runs?mode=async", json={**body, "params": {"priority": "bulk", "tag": "route"}}
+            )
+            stats = {q["queue"]: q for q in (await ac.get("/queues")).json()}
+        assert r.status_code == 202
+        assert r.json()["run_id"] in (await _queued(redis))["bulk"]
+        assert [stats[q]["depth"] for q in QUEUES] == [3, 4, 1]
+        assert stats["oversized"]["oldest_wait_s"] >= 0
+    finally:
+        app.dependency_overrides.pop(get_redis, None)
+        await redis.aclose()
+
+
+@pytest.mark.anyio
+async def test_fair_gate_splits_slots_by_weight_without_starving():
+    gate = FairGate(1, {"interactive": 6, "bulk": 3, "oversized": 1})
+    order: list[str] = []
+
+    async def job(queue: str) -> None:
+        async with gate.slot(queue):
+            order.append(queue)
+            await asyncio.sleep(0)
+
+    await gate.acquire("bulk")  # hold the only slot while everyone queues up
+    tasks = [
+        asyncio.create_task(job(q)) for q in ("oversized", "bulk", "interactive") for _ in range(40)
+    ]
+    await asyncio.sleep(0)
+    gate.release()
+    await asyncio.gather(*tasks)
+
+    first = order[:20]
+    assert (first.count("interactive"), first.count("bulk"), first.count("oversized")) == (12, 6, 2)
+    assert "oversized" in order[:10]  # a backlog elsewhere does not starve it
+    assert gate.busy == 0
+
+
+@pytest.mark.anyio
+async def test_fair_gate_cancelled_waiter_does_not_leak_a_slot():
+    gate = FairGate(1, {"interactive": 1, "bulk": 1})
+    await gate.acquire("interactive")
+    waiter = asyncio.create_task(gate.acquire("bulk"))
+    await asyncio.sleep(0)
+    assert gate.waiting("bulk") == 1
+    waiter.cancel()
+    gate.release()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert gate.busy == 0 and gate.waiting("bulk") == 0
+    async with gate.slot("bulk"):
+        assert gate.busy == 1
+    with pytest.raises(KeyError):
+        await gate.acquire("unknown")
+
+
+async def _no_info(redis, log):
+    pass
+
+
+@pytest.mark.anyio
+async def test_run_workers_drains_every_queue(monkeypatch):
+    redis = ArqRedis(connection_pool=fakeredis.aioredis.FakeRedis().connection_pool)
+
+    async def _pool(settings):
+        return redis
+
+    monkeypatch.setattr(queue_mod, "create_pool", _pool)
+    monkeypatch.setattr(queue_mod, "create_compute_pool", lambda: ThreadPoolExecutor(2))
+    monkeypatch.setattr(queue_mod.StatusPublisher, "from_url", lambda url: None)
+    monkeypatch.setattr(queue_mod, "WORKER_METRICS_PORT", 0)
+    monkeypatch.setattr("arq.worker.log_redis_info", _no_info)  # fakeredis has no INFO
+    ensure_dirs()
+    with get_session() as s:
+        runs = [
+            Run(payload_hash=f"sched-{i}", resume_text="python sql", jd_text="python")
+            for i in range(3)
+        ]
+        s.add_all(runs)
+        s.commit()
+        ids = [r.id for r in runs]
+    for run_id, priority in zip(ids, ("interactive", "bulk", "bulk"), strict=True):
+        await enqueue_run(redis, run_id, priority=priority)
+    await redis.zadd(QUEUES["oversized"], {"nothing": 0})  # a stale entry is skipped
+    waited = QUEUE_WAIT_SECONDS.count("bulk")
+
+    runner = asyncio.create_task(queue_mod.run_workers())
+    try:
+        for _ in range(100):
+            with get_session() as s:
+                if all(s.get(Run, i).status == RunStatus.succeeded for i in ids):
+                    break
+            await asyncio.sleep(0.1)
+        else:
+            pytest.fail("runs did not finish")
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+    assert QUEUE_WAIT_SECONDS.count("bulk") == waited + 2
@@ -0,0 +1,105 @@
+# tests/test_uploads.py
+import random
+import re
+import uuid
+
+import numpy as np
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.api.routes import _run_hash
+from backend.app.core.embeddings import ENCODER
+from backend.app.core.graph import LEXICON
+from backend.app.core.textstream import normalize, windows
+from backend.app.core.uploads import RunUpload
+from backend.app.main import app
+from backend.app.models.schemas import RunRequest
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.models import Run
+
+
+def _legacy_norm(t: str) -> str:
+    t = t.replace("\r\n", "\n")
+    t = re.sub(r"[\x00-\x08\x0B-\x1F\x7F]", " ", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def _split(text: str, rnd: random.Random) -> list[str]:
+    cuts = sorted(rnd.sample(range(len(text) + 1), min(len(text) + 1, rnd.randint(0, 6))))
+    return [text[i:j] for i, j in zip([0, *cuts], [*cuts, len(text)], strict=True)]
+
+
+def test_chunked_stages_match_whole_text():
+    rnd = random.Random(0)
+    alphabet = "Py thon deep learning k8s é Σ".split() + [" ", "\r\n", "\t", "\x00", "\x7f"]
+    for _ in range(500):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 40)))
+        assert "".join(normalize(_split(text, rnd))) == _legacy_norm(text)
+        pieces = list(windows(_split(text, rnd), size=rnd.randint(1, 8)))
+        assert "".join(pieces) == text
+        assert LEXICON.extract_chunks(pieces) == LEXICON.extract(text)
+        assert np.array_equal(ENCODER.encode_chunks(pieces), ENCODER.encode(text))
+
+
+def _multipart(fields: list[tuple[str, bytes]], boundary: str = "b0undary") -> bytes:
+    out = b""
+    for name, value in fields:
+        disposition = f'form-data; name="{name}"; filename="{name}.txt"'
+        out += f"--{boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        out += value + b"\r\n"
+    return out + f"--{boundary}--\r\n".encode()
+
+
+@pytest.mark.parametrize("jd_first", [False, True])
+def test_streamed_hash_matches_json_hash(jd_first):
+    resume, jd = "  \r\n Python é FastAPI \t\r\n", "\nSQL   and Σ AWS \n\n"
+    fields = [("resume", resume.encode()), ("jd", jd.encode()), ("params", b'{"b": 1, "a": 2}')]
+    if jd_first:
+        fields.reverse()
+    body = _multipart(fields)
+    upload = RunUpload("multipart/form-data; boundary=b0undary", max_chars=1_000)
+    try:
+        for i in range(0, len(body), 3):  # split mid-boundary and mid-character
+            upload.write(body[i : i + 3])
+        digest = upload.finish()
+        assert upload.docs["resume"].read() == resume
+    finally:
+        upload.discard()
+    req = RunRequest(resume_text=resume, jd_text=jd, params={"a": 2, "b": 1})
+    assert digest == _run_hash(req)
+
+
+@pytest.mark.anyio
+async def test_upload_endpoint_dedupes_with_json_and_rejects_bad_input(monkeypatch):
+    import backend.app.api.routes as routes_mod
+
+    ensure_dirs()
+    enqueued = []
+
+    async def _record_enqueue(redis, run_id, **kwargs):
+        enqueued.append(run_id)
+
+    monkeypatch.setattr(routes_mod, "enqueue_run", _record_enqueue)
+    resume = f"Python Docker {uuid.uuid4()}\r\n"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        files = {"resume": ("cv.txt", resume.encode()), "jd": ("jd.txt", b"Python AWS")}
+        r = await ac.post("/runs/upload", files=files, data={"params": '{"top_k": 3}'})
+        assert r.status_code == 202
+        run_id = r.json()["run_id"]
+        with get_session() as s:
+            run = s.get(Run, run_id)
+            assert (run.resume_text, run.params) == (resume, {"top_k": 3})
+
+        payload = {"resume_text": resume, "jd_text": "Python AWS", "params": {"top_k": 3}}
+        again = await ac.post("/runs", json=payload)
+        assert again.json()["run_id"] == run_id
+        assert enqueued == [run_id]
+
+        bad = await ac.post("/runs/upload", files={"resume": ("cv.txt", b"\xff\xfe")})
+        assert bad.status_code == 422
+        missing = await ac.post("/runs/upload", files={"resume": ("cv.txt", b"x")})
+        assert missing.status_code == 422
+        assert (await ac.post("/runs/upload", json=payload)).status_code == 415
+        monkeypatch.setattr(routes_mod, "MAX_LEN", 5)
+        too_big = await ac.post("/runs/upload", files=files)
+        assert too_big.status_code == 413
@@ -0,0 +1,118 @@
+# tests/test_worker.py
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+import backend.app.core.queue as queue_mod
+from backend.app.core.queue import (
+    ComputePool,
+    _init_compute_process,
+    _run_job_async,
+    job_timeout_for,
+    orphaned_after,
+)
+from backend.app.storage.artifacts import list_artifacts_for_run
+from backend.app.storage.db import ensure_dirs, get_session
+from backend.app.storage.models import Run, RunStatus
+
+
+def _new_run(resume: str, jd: str) -> str:
+    ensure_dirs()
+    with get_session() as s:
+        run = Run(
+            payload_hash=f"worker-{resume}", status=RunStatus.queued, resume_text=resume, jd_text=jd
+        )
+        s.add(run)
+        s.commit()
+        return run.id
+
+
+def _load(run_id: str) -> tuple[Run, list[str]]:
+    with get_session() as s:
+        run = s.get(Run, run_id)
+        assert run is not None
+        return run, [a.name for a in list_artifacts_for_run(s, run_id)]
+
+
+def test_job_timeout_scales_with_payload():
+    assert job_timeout_for(0) == queue_mod.JOB_TIMEOUT_BASE_S
+    assert job_timeout_for(4_000_000) > job_timeout_for(1_000)
+    assert job_timeout_for(10**12) == queue_mod.JOB_TIMEOUT_MAX_S
+
+
+@pytest.mark.anyio
+async def test_match_job_computes_in_process_pool():
+    run_id = _new_run("Python, FastAPI and Docker on AWS", "Python developer with AWS")
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_compute_process) as pool:
+        await _run_job_async({"compute_pool": pool}, run_id)
+    run, names = _load(run_id)
+    assert run.status == RunStatus.succeeded
+    assert run.started_at is not None and run.finished_at is not None
+    assert sorted(names) == ["graph_trace.jsonl", "scorecard.json", "scorecard.md"]
+
+
+@pytest.mark.anyio
+async def test_match_job_times_out(monkeypatch):
+    monkeypatch.setattr(queue_mod, "job_timeout_for", lambda n: 0.05)
+    monkeypatch.setattr(queue_mod, "compute_match", lambda *args: time.sleep(1))
+    run_id = _new_run("slow resume", "slow jd")
+    ctx = {"compute_pool": ThreadPoolExecutor(max_workers=1)}
+    await _run_job_async(ctx, run_id)
+    run, names = _load(run_id)
+    assert run.status == RunStatus.failed
+    assert run.error is not None and "timed out" in run.error
+    assert names == []
+    ctx["compute_pool"].shutdown(wait=False)
+
+
+class _DeadPool(ThreadPoolExecutor):
+    """Behaves like a ProcessPoolExecutor after one of its children was killed."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+
+@pytest.mark.anyio
+async def test_a_dead_compute_process_only_fails_its_own_job():
+    made: list[ThreadPoolExecutor] = []
+
+    def factory(processes):
+        made.append(_DeadPool(processes) if not made else ThreadPoolExecutor(processes))
+        return made[-1]
+
+    worker_ctx = {"compute_pool": ComputePool(1, factory=factory)}
+    first = _new_run("resume whose child dies", "Python developer")
+    second = _new_run("Python and Docker", "Python developer")
+    # ARQ runs every job with its own copy: ctx = {**self.ctx, **job_ctx}
+    await _run_job_async({**worker_ctx, "job_try": 1}, first)
+    await _run_job_async({**worker_ctx, "job_try": 1}, second)
+
+    run, _ = _load(first)
+    assert run.status == RunStatus.failed and "compute process died" in (run.error or "")
+    assert _load(second)[0].status == RunStatus.succeeded
+    assert len(made) == 2 and made[0]._shutdown  # replaced once, the dead pool shut down
+    worker_ctx["compute_pool"].shutdown()
+
+
+@pytest.mark.anyio
+async def test_job_takes_over_only_orphaned_running_runs():
+    ctx = {"compute_pool": ThreadPoolExecutor(max_workers=1)}
+    resume, jd = "Python on AWS, orphaned", "Python developer"
+    ages = {"recent": 60, "orphaned": orphaned_after(len(resume) + len(jd)) + 1}
+    ids = {}
+    for name, age in ages.items():
+        ids[name] = _new_run(f"{resume} {name}", jd)
+        with get_session() as s:
+            run = s.get(Run, ids[name])
+            run.status = RunStatus.running  # e.g. inline in an API process that died
+            run.started_at = datetime.now(UTC) - timedelta(seconds=age)
+            s.commit()
+        await _run_job_async(ctx, ids[name])
+    assert _load(ids["recent"])[0].status == RunStatus.running  # still owned by someone
+    assert _load(ids["orphaned"])[0].status == RunStatus.succeeded
+    ctx["compute_pool"].shutdown(wait=False)